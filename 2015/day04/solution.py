@@ -1,33 +1,28 @@
-import hashlib
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.md5mine import mine  # noqa: E402
+
+
+def find_nonce(secret: str, zeros: int) -> int:
+    """Наименьшее n >= 1, при котором md5(secret + n) начинается с zeros нулей."""
+    n, _ = next(mine(secret, zeros, start=1))
+    return n
 
 
 def solve_part1(data: str) -> str:
-    secret = data.strip()
-    n = 1
-    prefix = "00000"
-    while True:
-        s = f"{secret}{n}".encode("utf-8")
-        h = hashlib.md5(s).hexdigest()
-        if h.startswith(prefix):
-            return str(n)
-        n += 1
+    return str(find_nonce(data.strip(), 5))
 
 
 def solve_part2(data: str) -> str:
-    secret = data.strip()
-    n = 1
-    prefix = "000000"
-    while True:
-        s = f"{secret}{n}".encode("utf-8")
-        h = hashlib.md5(s).hexdigest()
-        if h.startswith(prefix):
-            return str(n)
-        n += 1
+    return str(find_nonce(data.strip(), 6))
 
 
 if __name__ == "__main__":
-    from pathlib import Path
-
     here = Path(__file__).resolve().parent
     input_path = here / "input.txt"
     if input_path.exists():
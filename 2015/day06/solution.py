@@ -1,3 +1,16 @@
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен: без него работает развёртка на списках
+    np = None
+
+Instruction = Tuple[str, int, int, int, int]
+
+# Больше стольких (сжатых) ячеек сетку не заводим — считаем развёрткой
+DENSE_MAX_CELLS = 4_000_000
+
+
 def parse_instruction(line: str):
     """
     Разбираем строку команды.
@@ -30,38 +43,236 @@ def parse_instruction(line: str):
     return cmd, x1, y1, x2, y2
 
 
-def solve_part1(data: str) -> str:
-    # 1000x1000 лампочек, False = выключена, True = включена
-    size = 1000
-    grid = [[False] * size for _ in range(size)]
-
+def parse_instructions(data: str) -> List[Instruction]:
+    instructions = []
     for line in data.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-
         parsed = parse_instruction(line)
-        if parsed is None:
-            continue
+        if parsed is not None:
+            instructions.append(parsed)
+    return instructions
+
+
+# ---------- сжатие координат ----------
+
+def _compress(values: Sequence[int]) -> Tuple[List[int], dict]:
+    """Отсортированные границы и индекс границы в этом списке."""
+    bounds = sorted(set(values))
+    return bounds, {v: i for i, v in enumerate(bounds)}
+
+
+def _compressed_size(instructions: Sequence[Instruction]) -> int:
+    xs = {x for _, x1, _, x2, _ in instructions for x in (x1, x2 + 1)}
+    ys = {y for _, _, y1, _, y2 in instructions for y in (y1, y2 + 1)}
+    return (len(xs) - 1) * (len(ys) - 1)
+
 
-        cmd, x1, y1, x2, y2 = parsed
+# ---------- плотная сетка на NumPy ----------
 
-        # Перебираем прямоугольник включительно
-        for x in range(x1, x2 + 1):
-            row = grid[x]
+def count_dense(instructions: Sequence[Instruction], brightness: bool) -> int:
+    """
+    Вся сетка в NumPy, каждая команда — одна операция над срезом.
+
+    Строки и столбцы, которые ни одна граница прямоугольника не разделяет,
+    ведут себя одинаково, поэтому сетка строится по сжатым координатам,
+    а ячейка при подсчёте весит свою площадь (для входа AoC это примерно
+    600 x 600 вместо 1000 x 1000).
+    """
+    if not instructions:
+        return 0
+    xs, x_index = _compress([x for _, x1, _, x2, _ in instructions for x in (x1, x2 + 1)])
+    ys, y_index = _compress([y for _, _, y1, _, y2 in instructions for y in (y1, y2 + 1)])
+    area = np.outer(np.diff(np.array(xs, dtype=np.int64)), np.diff(np.array(ys, dtype=np.int64)))
+    shape = (len(xs) - 1, len(ys) - 1)
+    rects = [
+        (cmd, x_index[x1], x_index[x2 + 1], y_index[y1], y_index[y2 + 1])
+        for cmd, x1, y1, x2, y2 in instructions
+    ]
+
+    if brightness:
+        # яркость не больше 2 * число команд — обычно хватает int32
+        dtype = np.int32 if 2 * len(instructions) < 2**31 else np.int64
+        grid = np.zeros(shape, dtype=dtype)
+        for cmd, a, b, c, d in rects:
+            cell = grid[a:b, c:d]
             if cmd == "on":
-                for y in range(y1, y2 + 1):
-                    row[y] = True
+                cell += 1
             elif cmd == "off":
-                for y in range(y1, y2 + 1):
-                    row[y] = False
-            elif cmd == "toggle":
-                for y in range(y1, y2 + 1):
-                    row[y] = not row[y]
+                np.subtract(cell, 1, out=cell, where=cell > 0)
+            else:
+                cell += 2
+        return int((grid * area).sum())
+
+    grid = np.zeros(shape, dtype=bool)
+    for cmd, a, b, c, d in rects:
+        if cmd == "on":
+            grid[a:b, c:d] = True
+        elif cmd == "off":
+            grid[a:b, c:d] = False
+        else:
+            cell = grid[a:b, c:d]
+            np.logical_not(cell, out=cell)
+    return int(area[grid].sum())
+
+
+# ---------- развёртка по сжатым координатам ----------
+#
+# Каждая команда — функция от состояния лампочки, и их композиция снова
+# функция того же вида, поэтому для ячейки достаточно пары чисел:
+#   * вкл/выкл: f(v) = (v & keep) ^ flip — (keep, flip);
+#   * яркость: после команд с приращениями d1, d2, ... (off = -1, но не ниже
+#     нуля) яркость равна total - low, где total — сумма приращений, а low —
+#     минимум её префиксных сумм (считая пустой префикс 0) — (total, low).
+# Строка полосы хранится как две такие строки по сжатым y.
 
-    # Считаем, сколько лампочек включено
-    total_on = sum(1 for x in range(size) for y in range(size) if grid[x][y])
-    return str(total_on)
+# Столько байт отдаём под дерево композиций в развёртке
+SWEEP_MEMORY = 64 * 1024 * 1024
+
+
+def _identity(size: int, brightness: bool):
+    if np is not None:
+        if brightness:
+            # |total| и |low| не больше 2 * число команд
+            return np.zeros(size, dtype=np.int32), np.zeros(size, dtype=np.int32)
+        return np.ones(size, dtype=np.uint8), np.zeros(size, dtype=np.uint8)
+    return ([0] * size if brightness else [1] * size), [0] * size
+
+
+def _compose(first, second, brightness: bool):
+    """Пара строк функций "сначала first, потом second"."""
+    (a1, b1), (a2, b2) = first, second
+    if np is not None:
+        if brightness:
+            return a1 + a2, np.minimum(b1, a1 + b2)
+        return a1 & a2, (b1 & a2) ^ b2
+    if brightness:
+        return (
+            [x + y for x, y in zip(a1, a2)],
+            [min(low, total + other) for low, total, other in zip(b1, a1, b2)],
+        )
+    return [x & y for x, y in zip(a1, a2)], [(f & k) ^ g for f, k, g in zip(b1, a2, b2)]
+
+
+def _apply(row, cmd: str, a: int, b: int, brightness: bool) -> None:
+    """Дописывает команду в конец композиции row на ячейках a..b-1."""
+    first, second = row
+    if np is not None:
+        if brightness:
+            total, low = first[a:b], second[a:b]
+            total += {"on": 1, "off": -1, "toggle": 2}[cmd]
+            if cmd == "off":
+                np.minimum(low, total, out=low)
+        elif cmd == "toggle":
+            flip = second[a:b]
+            flip ^= 1
+        else:
+            first[a:b] = 0
+            second[a:b] = cmd == "on"
+        return
+
+    if brightness:
+        step = {"on": 1, "off": -1, "toggle": 2}[cmd]
+        first[a:b] = [t + step for t in first[a:b]]
+        if cmd == "off":
+            second[a:b] = [min(low, t) for low, t in zip(second[a:b], first[a:b])]
+    elif cmd == "toggle":
+        second[a:b] = [1 - f for f in second[a:b]]
+    else:
+        first[a:b] = [0] * (b - a)
+        second[a:b] = [int(cmd == "on")] * (b - a)
+
+
+def _row_sum(row, widths, brightness: bool) -> int:
+    """Сколько горит (какова яркость) в строке, если начать с нуля."""
+    first, second = row
+    if np is not None:
+        values = first.astype(np.int64) - second if brightness else second
+        return int(values @ widths)
+    if brightness:
+        return sum((t - low) * w for t, low, w in zip(first, second, widths))
+    return sum(w for f, w in zip(second, widths) if f)
+
+
+def count_sweep(instructions: Sequence[Instruction], brightness: bool) -> int:
+    """
+    Координаты сжимаются до границ прямоугольников, и плоскость
+    проходится вертикальными полосами между соседними границами x.
+    Внутри полосы все столбцы одинаковы, поэтому достаточно одной строки
+    по сжатым y; сумма по ней умножается на ширину полосы.
+
+    Строка полосы — композиция по порядку всех команд, которые её
+    покрывают. Команды разбиты по порядку на блоки, и над блоками
+    построено дерево отрезков: лист — композиция активных команд блока,
+    узел — композиция детей, корень — строка полосы. На границе полосы
+    пересчитываются только блоки появившихся и исчезнувших команд и их
+    предки, а не все активные команды заново.
+
+    Память — O(число команд) плюс дерево в пределах SWEEP_MEMORY, так что
+    подходит и для огромных координат. Строки — массивы NumPy, если он
+    есть, иначе списки.
+    """
+    if not instructions:
+        return 0
+    ys, y_index = _compress([y for _, _, y1, _, y2 in instructions for y in (y1, y2 + 1)])
+    size = len(ys) - 1
+    widths: Sequence[int] = [b - a for a, b in zip(ys, ys[1:])]
+    if np is not None:
+        widths = np.array(widths, dtype=np.int64)
+    # команда -> (cmd, начало и конец в сжатых y)
+    spans = [(cmd, y_index[y1], y_index[y2 + 1]) for cmd, _, y1, _, y2 in instructions]
+
+    # Число листов — степень двойки, чтобы дерево (2 * leaves строк по
+    # 2 * size чисел) уместилось в SWEEP_MEMORY
+    leaves = 1
+    while leaves < len(instructions) and 4 * leaves * size * 8 * 2 <= SWEEP_MEMORY:
+        leaves *= 2
+    block = -(-len(instructions) // leaves)
+    tree = [_identity(size, brightness) for _ in range(2 * leaves)]
+
+    # события по x: в какой полосе команда появляется и исчезает
+    events = {}
+    for k, (_, x1, _, x2, _) in enumerate(instructions):
+        events.setdefault(x1, ([], []))[0].append(k)
+        events.setdefault(x2 + 1, ([], []))[1].append(k)
+    xs = sorted(events)
+
+    active = [False] * len(instructions)
+    total = 0
+    for x, next_x in zip(xs, xs[1:]):
+        added, removed = events[x]
+        for k in removed:
+            active[k] = False
+        for k in added:
+            active[k] = True
+
+        dirty = set()
+        for leaf in {k // block for k in added + removed}:
+            row = _identity(size, brightness)
+            for k in range(leaf * block, min(leaf * block + block, len(instructions))):
+                if active[k]:
+                    _apply(row, *spans[k], brightness)
+            tree[leaves + leaf] = row
+            if leaves > 1:
+                dirty.add((leaves + leaf) // 2)
+        while dirty:
+            # узлы одного уровня: после пересчёта поднимаемся к родителям
+            for node in dirty:
+                tree[node] = _compose(tree[2 * node], tree[2 * node + 1], brightness)
+            dirty = {node // 2 for node in dirty if node > 1}
+
+        total += (next_x - x) * _row_sum(tree[1], widths, brightness)
+    return total
+
+
+def count_lights(instructions: Sequence[Instruction], brightness: bool) -> int:
+    """Сетка NumPy, если NumPy есть и сжатая сетка помещается, иначе развёртка."""
+    if np is not None and instructions and _compressed_size(instructions) <= DENSE_MAX_CELLS:
+        return count_dense(instructions, brightness)
+    return count_sweep(instructions, brightness)
+
+
+def solve_part1(data: str) -> str:
+    # False = выключена, True = включена; считаем включённые
+    return str(count_lights(parse_instructions(data), brightness=False))
 
 
 def solve_part2(data: str) -> str:
@@ -69,35 +280,7 @@ def solve_part2(data: str) -> str:
     # "turn on"  -> brightness += 1
     # "turn off" -> brightness -= 1 (но не ниже 0)
     # "toggle"   -> brightness += 2
-    size = 1000
-    grid = [[0] * size for _ in range(size)]
-
-    for line in data.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-
-        parsed = parse_instruction(line)
-        if parsed is None:
-            continue
-
-        cmd, x1, y1, x2, y2 = parsed
-
-        for x in range(x1, x2 + 1):
-            row = grid[x]
-            if cmd == "on":
-                for y in range(y1, y2 + 1):
-                    row[y] += 1
-            elif cmd == "off":
-                for y in range(y1, y2 + 1):
-                    if row[y] > 0:
-                        row[y] -= 1
-            elif cmd == "toggle":
-                for y in range(y1, y2 + 1):
-                    row[y] += 2
-
-    total_brightness = sum(grid[x][y] for x in range(size) for y in range(size))
-    return str(total_brightness)
+    return str(count_lights(parse_instructions(data), brightness=True))
 
 
 if __name__ == "__main__":
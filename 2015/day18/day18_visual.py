@@ -1,70 +1,32 @@
+import sys
 import tkinter as tk
 from pathlib import Path
-from typing import List
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.cellular import Automaton, BitGrid, life_rule  # noqa: E402
 
-CELL_SIZE = 6  # размер клетки в пикселях (для 100x100 получится 600x600)
 
+CELL_SIZE = 6  # размер клетки в пикселях (для 100x100 получится 600x600)
 
-def parse_grid(text: str) -> List[List[bool]]:
-    grid = []
-    for line in text.strip().splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        row = [c == "#" for c in line]
-        grid.append(row)
-    return grid
-
-
-def count_on_neighbors(grid: List[List[bool]], x: int, y: int) -> int:
-    h = len(grid)
-    w = len(grid[0])
-    cnt = 0
-    for dx in (-1, 0, 1):
-        for dy in (-1, 0, 1):
-            if dx == 0 and dy == 0:
-                continue
-            nx = x + dx
-            ny = y + dy
-            if 0 <= nx < h and 0 <= ny < w:
-                if grid[nx][ny]:
-                    cnt += 1
-    return cnt
-
-
-def step_grid(grid: List[List[bool]], stuck_corners: bool = False) -> List[List[bool]]:
-    h = len(grid)
-    w = len(grid[0])
-    new_grid = [[False] * w for _ in range(h)]
-
-    for i in range(h):
-        for j in range(w):
-            neighbors = count_on_neighbors(grid, i, j)
-            if grid[i][j]:
-                new_grid[i][j] = neighbors in (2, 3)
-            else:
-                new_grid[i][j] = neighbors == 3
-
-    if stuck_corners:
-        new_grid[0][0] = True
-        new_grid[0][w - 1] = True
-        new_grid[h - 1][0] = True
-        new_grid[h - 1][w - 1] = True
-
-    return new_grid
+LIGHTS_RULE = life_rule(birth={3}, survive={2, 3})
 
 
 class LightsApp(tk.Tk):
-    def __init__(self, grid: List[List[bool]]):
+    def __init__(self, grid: BitGrid, board: int):
         super().__init__()
         self.title("AoC 2015 Day 18 — Lights Visualizer")
 
-        self.original_grid = [row[:] for row in grid]
-        self.grid_data = [row[:] for row in grid]
+        # поле — битовая доска (см. aoclib/cellular.py)
+        self.field = grid
+        self.original_board = board
+        self.board = board
+        self.life = Automaton(grid, LIGHTS_RULE)
 
-        self.h = len(self.grid_data)
-        self.w = len(self.grid_data[0])
+        self.h = grid.height
+        self.w = grid.width
 
         # состояние
         self.step_count = 0
@@ -131,13 +93,14 @@ class LightsApp(tk.Tk):
 
     def _apply_stuck_corners_if_needed(self, reset: bool = False):
         if not self.stuck_corners_var.get():
+            self.life.stuck = 0
             return
-        h = self.h
-        w = self.w
-        self.grid_data[0][0] = True
-        self.grid_data[0][w - 1] = True
-        self.grid_data[h - 1][0] = True
-        self.grid_data[h - 1][w - 1] = True
+        self.life.stuck = self.field.corners()
+        self.board |= self.life.stuck
+
+    def _advance(self, steps: int):
+        (self.board,) = self.life.run((self.board,), steps)
+        self.step_count += steps
 
     def _draw_grid(self):
         self.canvas.delete("all")
@@ -147,11 +110,11 @@ class LightsApp(tk.Tk):
                 y1 = i * CELL_SIZE
                 x2 = x1 + CELL_SIZE
                 y2 = y1 + CELL_SIZE
-                color = "lime" if self.grid_data[i][j] else "gray10"
+                color = "lime" if self.field.is_set(self.board, j, i) else "gray10"
                 self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="black")
 
     def _count_on(self) -> int:
-        return sum(cell for row in self.grid_data for cell in row)
+        return self.field.population(self.board)
 
     def _update_status(self):
         on_count = self._count_on()
@@ -173,8 +136,7 @@ class LightsApp(tk.Tk):
 
     def on_step(self):
         # один шаг
-        self.grid_data = step_grid(self.grid_data, stuck_corners=self.stuck_corners_var.get())
-        self.step_count += 1
+        self._advance(1)
         self._draw_grid()
         self._update_status()
 
@@ -185,15 +147,13 @@ class LightsApp(tk.Tk):
             n = 0
         if n <= 0:
             return
-        for _ in range(n):
-            self.grid_data = step_grid(self.grid_data, stuck_corners=self.stuck_corners_var.get())
-            self.step_count += 1
+        self._advance(n)
         self._draw_grid()
         self._update_status()
 
     def on_reset(self):
         self._stop_play()
-        self.grid_data = [row[:] for row in self.original_grid]
+        self.board = self.original_board
         self.step_count = 0
         self._apply_stuck_corners_if_needed(reset=True)
         self._draw_grid()
@@ -241,8 +201,7 @@ class LightsApp(tk.Tk):
     def _play_step(self):
         if not self.is_playing:
             return
-        self.grid_data = step_grid(self.grid_data, stuck_corners=self.stuck_corners_var.get())
-        self.step_count += 1
+        self._advance(1)
         self._draw_grid()
         self._update_status()
         self._schedule_next_frame()
@@ -256,9 +215,9 @@ def main():
         raise SystemExit(f"input.txt не найден рядом со скриптом: {input_path}")
 
     raw = input_path.read_text(encoding="utf-8")
-    grid = parse_grid(raw)
+    grid, (board,) = BitGrid.parse(raw, "#")
 
-    app = LightsApp(grid)
+    app = LightsApp(grid, board)
     app.mainloop()
 
 
@@ -1,83 +1,39 @@
-from typing import List
+import sys
+from pathlib import Path
+from typing import Tuple
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
 
-def parse_grid(data: str) -> List[List[bool]]:
-    grid = []
-    for line in data.strip().splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        row = [c == "#" for c in line]
-        grid.append(row)
-    return grid
+from aoclib.cellular import Automaton, BitGrid, life_rule  # noqa: E402
 
+STEPS = 100
 
-def count_on_neighbors(grid: List[List[bool]], x: int, y: int) -> int:
-    h = len(grid)
-    w = len(grid[0])
-    cnt = 0
-    for dx in (-1, 0, 1):
-        for dy in (-1, 0, 1):
-            if dx == 0 and dy == 0:
-                continue
-            nx = x + dx
-            ny = y + dy
-            if 0 <= nx < h and 0 <= ny < w:
-                if grid[nx][ny]:
-                    cnt += 1
-    return cnt
+# B3/S23 — классическая "Жизнь"
+LIGHTS_RULE = life_rule(birth={3}, survive={2, 3})
 
 
-def step(grid: List[List[bool]], stuck_corners: bool = False) -> List[List[bool]]:
-    h = len(grid)
-    w = len(grid[0])
-    new_grid = [[False] * w for _ in range(h)]
+def make_automaton(data: str, stuck_corners: bool = False) -> Tuple[Automaton, int]:
+    """Поле как битовая доска; при stuck_corners углы включены и залипли."""
+    grid, (board,) = BitGrid.parse(data, "#")
+    stuck = grid.corners() if stuck_corners else 0
+    return Automaton(grid, LIGHTS_RULE, stuck=stuck), board | stuck
 
-    for i in range(h):
-        for j in range(w):
-            neighbors = count_on_neighbors(grid, i, j)
-            if grid[i][j]:
-                new_grid[i][j] = neighbors in (2, 3)
-            else:
-                new_grid[i][j] = neighbors == 3
 
-    if stuck_corners:
-        # углы всегда включены
-        new_grid[0][0] = True
-        new_grid[0][w - 1] = True
-        new_grid[h - 1][0] = True
-        new_grid[h - 1][w - 1] = True
-
-    return new_grid
+def count_lights(data: str, stuck_corners: bool) -> int:
+    life, board = make_automaton(data, stuck_corners)
+    (board,) = life.run((board,), STEPS)
+    return life.grid.population(board)
 
 
 def solve_part1(data: str) -> str:
-    grid = parse_grid(data)
-    steps = 100
-    for _ in range(steps):
-        grid = step(grid, stuck_corners=False)
-    # считаем включённые
-    total_on = sum(cell for row in grid for cell in row)
-    return str(total_on)
+    return str(count_lights(data, stuck_corners=False))
 
 
 def solve_part2(data: str) -> str:
-    grid = parse_grid(data)
-    h = len(grid)
-    w = len(grid[0])
-
-    # изначально фиксируем углы включёнными
-    grid[0][0] = True
-    grid[0][w - 1] = True
-    grid[h - 1][0] = True
-    grid[h - 1][w - 1] = True
-
-    steps = 100
-    for _ in range(steps):
-        grid = step(grid, stuck_corners=True)
-
-    total_on = sum(cell for row in grid for cell in row)
-    return str(total_on)
+    # углы всегда включены
+    return str(count_lights(data, stuck_corners=True))
 
 
 if __name__ == "__main__":
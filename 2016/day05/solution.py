@@ -7,8 +7,14 @@
 #
 # В файле input.txt — одна строка: door ID.
 
+import sys
 from pathlib import Path
-import hashlib
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.md5mine import mine  # noqa: E402
 
 
 def _get_door_id(data: str) -> str:
@@ -32,14 +38,12 @@ def solve_part1(data: str) -> str:
     door_id = _get_door_id(data)
 
     password_chars = []
-    i = 0
 
-    while len(password_chars) < 8:
-        to_hash = f"{door_id}{i}".encode("utf-8")
-        h = hashlib.md5(to_hash).hexdigest()
-        if h.startswith("00000"):
-            password_chars.append(h[5])
-        i += 1
+    # mine() отдаёт хэши строго по возрастанию индекса
+    for _, digest in mine(door_id, 5):
+        password_chars.append(digest.hex()[5])
+        if len(password_chars) == 8:
+            break
 
     return "".join(password_chars)
 
@@ -57,20 +61,17 @@ def solve_part2(data: str) -> str:
 
     password = ["_"] * 8   # временно заполняем плейсхолдерами
     filled = 0
-    i = 0
-
-    while filled < 8:
-        to_hash = f"{door_id}{i}".encode("utf-8")
-        h = hashlib.md5(to_hash).hexdigest()
-
-        if h.startswith("00000"):
-            pos_char = h[5]
-            if pos_char.isdigit():
-                pos = int(pos_char)
-                if 0 <= pos <= 7 and password[pos] == "_":
-                    password[pos] = h[6]
-                    filled += 1
-        i += 1
+
+    for _, digest in mine(door_id, 5):
+        h = digest.hex()
+        pos_char = h[5]
+        if pos_char.isdigit():
+            pos = int(pos_char)
+            if 0 <= pos <= 7 and password[pos] == "_":
+                password[pos] = h[6]
+                filled += 1
+                if filled == 8:
+                    break
 
     return "".join(password)
 
@@ -7,8 +7,20 @@
 #
 # В файле input.txt — одно целое число: favorite number.
 
+import sys
 from pathlib import Path
-from collections import deque
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.pathfind import bfs  # noqa: E402
+
+START = (1, 1)
+GOAL = (31, 39)
+MAX_STEPS = 50
+# Координаты 0..100 с запасом: BFS сам отрежет недостижимое
+MAZE_SIZE = 101
 
 
 def _get_favorite(data: str) -> int:
@@ -34,14 +46,21 @@ def _is_open(x: int, y: int, favorite: int) -> bool:
     return ones % 2 == 0  # чётное -> open
 
 
-def _neighbors(x: int, y: int):
+def _neighbours(favorite: int):
     """
-    4-соседей (вверх/вниз/влево/вправо).
+    Соседи клетки cell = y * MAZE_SIZE + x по 4 направлениям.
+    Лабиринт не строится заранее: стены считаются по формуле только
+    для клеток, до которых дошёл BFS.
     """
-    yield x + 1, y
-    yield x - 1, y
-    yield x, y + 1
-    yield x, y - 1
+    def neighbours(cell: int):
+        y, x = divmod(cell, MAZE_SIZE)
+        result = []
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < MAZE_SIZE and 0 <= ny < MAZE_SIZE and _is_open(nx, ny, favorite):
+                result.append(ny * MAZE_SIZE + nx)
+        return result
+
+    return neighbours
 
 
 def solve_part1(data: str) -> int:
@@ -51,35 +70,12 @@ def solve_part1(data: str) -> int:
     Если цели недостижима (что маловероятно для AoC), вернём -1.
     """
     favorite = _get_favorite(data)
-    start = (1, 1)
-    goal = (31, 39)
-
-    queue = deque()
-    queue.append((start[0], start[1], 0))  # x, y, steps
-    visited = set()
-    visited.add(start)
-
-    # разумное ограничение по "полю" для безопасности (но BFS сам отрежет)
-    # можно не ограничивать вообще, но сделаем ограничение по x,y
-    max_coord = 100
-
-    while queue:
-        x, y, steps = queue.popleft()
-
-        if (x, y) == goal:
-            return steps
-
-        for nx, ny in _neighbors(x, y):
-            if not (0 <= nx <= max_coord and 0 <= ny <= max_coord):
-                continue
-            if (nx, ny) in visited:
-                continue
-            if not _is_open(nx, ny, favorite):
-                continue
-            visited.add((nx, ny))
-            queue.append((nx, ny, steps + 1))
-
-    return -1
+    goal = GOAL[1] * MAZE_SIZE + GOAL[0]
+    dist, found = bfs(
+        _neighbours(favorite), [START[1] * MAZE_SIZE + START[0]],
+        size=MAZE_SIZE * MAZE_SIZE, goal=lambda cell: cell == goal,
+    )
+    return dist[found] if found is not None else -1
 
 
 def solve_part2(data: str) -> int:
@@ -89,35 +85,9 @@ def solve_part2(data: str) -> int:
     (включая стартовую) из (1,1).
     """
     favorite = _get_favorite(data)
-    start = (1, 1)
-
-    max_steps = 50
-    queue = deque()
-    queue.append((start[0], start[1], 0))
-    visited = set()
-    visited.add(start)
-
-    max_coord = 100  # с запасом
-
-    while queue:
-        x, y, steps = queue.popleft()
-
-        if steps == max_steps:
-            # дальше из этой позиции двигаться нельзя по условию
-            continue
-
-        for nx, ny in _neighbors(x, y):
-            if not (0 <= nx <= max_coord and 0 <= ny <= max_coord):
-                continue
-            if (nx, ny) in visited:
-                continue
-            if not _is_open(nx, ny, favorite):
-                continue
-            visited.add((nx, ny))
-            queue.append((nx, ny, steps + 1))
-
-    # количество различных клеток, которые мы посетили
-    return len(visited)
+    dist, _ = bfs(_neighbours(favorite), [START[1] * MAZE_SIZE + START[0]], limit=MAX_STEPS)
+    # без size расстояния — словарь только посещённых клеток
+    return len(dist)
 
 
 def main():
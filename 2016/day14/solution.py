@@ -7,9 +7,26 @@
 #
 # В файле input.txt — одна строка: salt.
 
+import sys
+import re
+from collections import deque
 from pathlib import Path
-import hashlib
-from functools import lru_cache
+from typing import Deque, FrozenSet, Iterator, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.md5mine import hex_stream  # noqa: E402
+
+LOOKAHEAD = 1000  # пятёрка ищется в следующих 1000 хэшах
+KEYS_NEEDED = 64
+
+_TRIPLET = re.compile(r"(.)\1\1")
+_QUINTUPLE = re.compile(r"(.)\1{4}")
+
+# (символ первой тройки или None, символы всех пятёрок)
+HashInfo = Tuple[Optional[str], FrozenSet[str]]
 
 
 def _get_salt(data: str) -> str:
@@ -23,38 +40,27 @@ def _get_salt(data: str) -> str:
     raise ValueError("Salt not found in input")
 
 
-def _md5_hex(s: str) -> str:
-    return hashlib.md5(s.encode("utf-8")).hexdigest()
-
-
-def _stretched_hash(s: str, count: int) -> str:
-    """
-    md5-растяжка: count раз подряд.
-    count=1 -> обычный md5.
-    """
-    h = s
-    for _ in range(count):
-        h = _md5_hex(h)
-    return h
-
-
-def _find_triplet(h: str):
+def _find_triplet(h: str) -> Optional[str]:
     """
     Находит первый символ, который встречается три раза подряд.
     Возвращает этот символ или None.
     """
-    for i in range(len(h) - 2):
-        if h[i] == h[i + 1] == h[i + 2]:
-            return h[i]
-    return None
+    m = _TRIPLET.search(h)
+    return m.group(1) if m else None
 
 
-def _has_quintuple(h: str, ch: str) -> bool:
+def _hash_infos(salt: str, stretch_rounds: int) -> Iterator[HashInfo]:
     """
-    Проверяет, есть ли в хэше пятёрка из символа ch.
+    Поток сведений о хэшах 0, 1, 2, ...: тройки и пятёрки выделяются
+    сразу, как только хэш посчитан, сами хэши дальше не хранятся.
+    Растянутые хэши считаются пачками в пуле процессов (aoclib.md5mine).
     """
-    target = ch * 5
-    return target in h
+    chunk = 1_000 if stretch_rounds > 1 else 25_000
+    for h in hex_stream(salt, rounds=stretch_rounds - 1, chunk=chunk):
+        triplet = _find_triplet(h)
+        # пятёрка всегда содержит тройку, так что без тройки искать нечего
+        quintuples = frozenset(_QUINTUPLE.findall(h)) if triplet else frozenset()
+        yield triplet, quintuples
 
 
 def _find_64th_key_index(salt: str, stretch_rounds: int) -> int:
@@ -63,34 +69,39 @@ def _find_64th_key_index(salt: str, stretch_rounds: int) -> int:
     stretch_rounds:
       - 1    для обычного md5 (part1)
       - 2017 для растянутого md5 (part2: 1 базовый + 2016 доп. раз)
+
+    Скользящее окно: в памяти только текущий хэш и следующие 1000,
+    а для окна ведётся счётчик пятёрок по каждому символу — проверка
+    ключа стоит O(1).
     """
+    infos = _hash_infos(salt, stretch_rounds)
+    window: Deque[HashInfo] = deque()
+    quintuple_counts = dict.fromkeys("0123456789abcdef", 0)
 
-    @lru_cache(maxsize=None)
-    def get_hash(i: int) -> str:
-        base = f"{salt}{i}"
-        if stretch_rounds == 1:
-            return _md5_hex(base)
-        else:
-            # сначала обычный md5, затем stretch_rounds-1 раз по цепочке
-            h = _md5_hex(base)
-            for _ in range(stretch_rounds - 1):
-                h = _md5_hex(h)
-            return h
+    current = next(infos)
+    for _ in range(LOOKAHEAD):
+        info = next(infos)
+        window.append(info)
+        for ch in info[1]:
+            quintuple_counts[ch] += 1
 
     keys_found = 0
     i = 0
-
     while True:
-        h = get_hash(i)
-        ch = _find_triplet(h)
-        if ch is not None:
-            # ищем quintuple этого же символа в следующих 1000 хэшей
-            for j in range(i + 1, i + 1001):
-                if _has_quintuple(get_hash(j), ch):
-                    keys_found += 1
-                    if keys_found == 64:
-                        return i
-                    break
+        triplet = current[0]
+        if triplet is not None and quintuple_counts[triplet]:
+            keys_found += 1
+            if keys_found == KEYS_NEEDED:
+                return i
+
+        # сдвигаем окно на один хэш вперёд
+        info = next(infos)
+        window.append(info)
+        for ch in info[1]:
+            quintuple_counts[ch] += 1
+        current = window.popleft()
+        for ch in current[1]:
+            quintuple_counts[ch] -= 1
         i += 1
 
 
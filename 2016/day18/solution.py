@@ -7,8 +7,19 @@
 #
 # В файле input.txt — одна строка: начальный ряд из '.' и '^'.
 
+import sys
 from pathlib import Path
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.cellular import elementary_step, popcount  # noqa: E402
+
+# Плитка — ловушка, если ровно одна из соседних сверху (левая/правая)
+# была ловушкой: это элементарный автомат с правилом 90
+TRAP_RULE = 90
+
 
 def _get_first_row(data: str) -> str:
     """
@@ -25,40 +36,20 @@ def _count_safe_tiles(first_row: str, total_rows: int) -> int:
     """
     Считает общее количество безопасных плиток за total_rows строк,
     начиная с first_row (которая уже входит в количество).
-    """
-    row = first_row
-    width = len(row)
-
-    # считаем безопасные в первой строке
-    safe_count = row.count(".")
 
-    for _ in range(1, total_rows):
-        prev = row
-        new_row_chars = []
-
-        for i in range(width):
-            left = prev[i - 1] if i > 0 else "."
-            center = prev[i]
-            right = prev[i + 1] if i < width - 1 else "."
-
-            l_trap = (left == "^")
-            c_trap = (center == "^")
-            r_trap = (right == "^")
-
-            # правила ловушек из условия
-            is_trap = (
-                (l_trap and c_trap and not r_trap) or  # ^^.
-                (c_trap and r_trap and not l_trap) or  # .^^
-                (l_trap and not c_trap and not r_trap) or  # ^..
-                (r_trap and not l_trap and not c_trap)     # ..^
-            )
-
-            new_row_chars.append("^" if is_trap else ".")
+    Ряд хранится одним int (бит i — ловушка в позиции i), следующий ряд
+    получается парой сдвигов и XOR для всех плиток сразу.
+    """
+    width = len(first_row)
+    row = sum(1 << i for i, ch in enumerate(first_row) if ch == "^")
+    step = elementary_step(TRAP_RULE, width)
 
-        row = "".join(new_row_chars)
-        safe_count += row.count(".")
+    traps = 0
+    for _ in range(total_rows):
+        traps += popcount(row)
+        row = step(row)
 
-    return safe_count
+    return width * total_rows - traps
 
 
 def solve_part1(data: str) -> int:
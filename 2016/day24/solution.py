@@ -14,54 +14,28 @@
 # #4.......3#
 # ###########
 
-from pathlib import Path
-from collections import deque
+import sys
 from itertools import permutations
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.pathfind import INF, FlatGrid, grid_bfs  # noqa: E402
 
 
 def _parse_map(data: str):
     """
     Парсим карту:
-      - grid: список строк
-      - pois: dict[digit_char] = (x, y)
+      - grid: плоская карта FlatGrid
+      - pois: dict[digit_char] = индекс клетки
     """
-    grid = [list(line.rstrip("\n")) for line in data.splitlines() if line.strip()]
-    pois = {}
-    for y, row in enumerate(grid):
-        for x, ch in enumerate(row):
-            if ch.isdigit():
-                pois[ch] = (x, y)
+    grid = FlatGrid.parse(data)
+    pois = {ch: i for i, ch in enumerate(grid.cells) if ch.isdigit()}
     return grid, pois
 
 
-def _bfs_distances_from(grid, start):
-    """
-    BFS от одной точки.
-    start: (x, y)
-    Возвращает словарь {(x, y): расстояние}
-    """
-    width = len(grid[0])
-    height = len(grid)
-    sx, sy = start
-    dist = { (sx, sy): 0 }
-    q = deque([(sx, sy)])
-
-    while q:
-        x, y = q.popleft()
-        d = dist[(x, y)]
-        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            nx, ny = x + dx, y + dy
-            if not (0 <= nx < width and 0 <= ny < height):
-                continue
-            if grid[ny][nx] == '#':
-                continue
-            if (nx, ny) in dist:
-                continue
-            dist[(nx, ny)] = d + 1
-            q.append((nx, ny))
-    return dist
-
-
 def _build_distance_matrix(grid, pois):
     """
     Строим матрицу расстояний между всеми цифрами.
@@ -74,13 +48,11 @@ def _build_distance_matrix(grid, pois):
 
     # для каждой точки делаем BFS и берём расстояния до остальных
     for a in labels:
-        dists = _bfs_distances_from(grid, pois[a])
+        dists = grid_bfs(grid, [pois[a]])
         for b in labels:
-            if a == b:
+            if a == b or dists[pois[b]] == INF:
                 continue
-            ax, ay = pois[a]
-            bx, by = pois[b]
-            dist_map[(a, b)] = dists[(bx, by)]
+            dist_map[(a, b)] = dists[pois[b]]
     return labels, dist_map
 
 
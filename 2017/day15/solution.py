@@ -1,5 +1,10 @@
 from pathlib import Path
-from typing import Tuple
+from typing import Iterator, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен: без него работают циклы на int
+    np = None
 
 
 MOD = 2147483647
@@ -7,6 +12,84 @@ FACTOR_A = 16807
 FACTOR_B = 48271
 MASK_16 = (1 << 16) - 1  # 0xFFFF
 
+PAIRS_PART1 = 40_000_000
+PAIRS_PART2 = 5_000_000
+MULTIPLE_A = 4
+MULTIPLE_B = 8
+
+BLOCK = 1 << 20  # значений генератора за один векторный шаг
+
+
+def _powers(factor: int, count: int):
+    """
+    factor^1 .. factor^count по модулю MOD (uint64), удвоением:
+    P[n:2n] = P[0:n] * factor^n — log2(count) векторных шагов.
+    """
+    powers = np.empty(count, dtype=np.uint64)
+    powers[0] = factor
+    n = 1
+    while n < count:
+        m = min(n, count - n)
+        jump = np.uint64(pow(factor, n, MOD))
+        powers[n:n + m] = powers[:m] * jump % np.uint64(MOD)
+        n += m
+    return powers
+
+
+def _low16_blocks(start: int, factor: int, multiple: int = 1) -> Iterator:
+    """
+    Бесконечный поток блоков младших 16 бит значений генератора.
+
+    Блок из BLOCK значений получается "прыжком вперёд": x * factor^k mod MOD
+    для k = 1..BLOCK сразу (x, factor^k < 2^31, произведение влезает в uint64).
+    При multiple > 1 блок сжимается до значений, кратных multiple.
+    """
+    powers = _powers(factor, BLOCK)
+    mod = np.uint64(MOD)
+    block = np.empty(BLOCK, dtype=np.uint64)
+    x = np.uint64(start)
+    while True:
+        np.multiply(powers, x, out=block)
+        np.remainder(block, mod, out=block)
+        x = block[-1]
+        if multiple > 1:
+            values = block[block % np.uint64(multiple) == 0]
+        else:
+            values = block
+        yield (values & np.uint64(MASK_16)).astype(np.uint16)
+
+
+def _take_low16(start: int, factor: int, multiple: int, count: int):
+    """Младшие 16 бит первых count (отфильтрованных) значений генератора."""
+    parts = []
+    have = 0
+    for values in _low16_blocks(start, factor, multiple):
+        parts.append(values[:count - have])
+        have += len(parts[-1])
+        if have == count:
+            return np.concatenate(parts)
+    raise AssertionError("поток генератора бесконечен")
+
+
+def _count_matches_numpy(
+    start_a: int, start_b: int, pairs: int, multiple_a: int = 1, multiple_b: int = 1
+) -> int:
+    if multiple_a == multiple_b == 1:
+        # Потоки идут с одной скоростью — сравниваем блок с блоком, не храня их
+        matches = 0
+        done = 0
+        blocks_a = _low16_blocks(start_a, FACTOR_A)
+        blocks_b = _low16_blocks(start_b, FACTOR_B)
+        for a, b in zip(blocks_a, blocks_b):
+            n = min(len(a), pairs - done)
+            matches += int(np.count_nonzero(a[:n] == b[:n]))
+            done += n
+            if done == pairs:
+                return matches
+    a = _take_low16(start_a, FACTOR_A, multiple_a, pairs)
+    b = _take_low16(start_b, FACTOR_B, multiple_b, pairs)
+    return int(np.count_nonzero(a == b))
+
 
 def _parse_input(data: str) -> Tuple[int, int]:
     """
@@ -42,12 +125,14 @@ def solve_part1(data: str) -> int:
     40_000_000 пар значений A и B, считаем совпадения нижних 16 бит.
     """
     start_a, start_b = _parse_input(data)
+    if np is not None:
+        return _count_matches_numpy(start_a, start_b, PAIRS_PART1)
 
     a = start_a
     b = start_b
     matches = 0
 
-    for _ in range(40_000_000):
+    for _ in range(PAIRS_PART1):
         a = (a * FACTOR_A) % MOD
         b = (b * FACTOR_B) % MOD
 
@@ -65,23 +150,27 @@ def solve_part2(data: str) -> int:
     Считаем совпадения нижних 16 бит на первых 5_000_000 парах.
     """
     start_a, start_b = _parse_input(data)
+    if np is not None:
+        return _count_matches_numpy(
+            start_a, start_b, PAIRS_PART2, MULTIPLE_A, MULTIPLE_B
+        )
 
     a = start_a
     b = start_b
     matches = 0
     pairs = 0
 
-    while pairs < 5_000_000:
+    while pairs < PAIRS_PART2:
         # Генерируем A до кратного 4
         while True:
             a = (a * FACTOR_A) % MOD
-            if a % 4 == 0:
+            if a % MULTIPLE_A == 0:
                 break
 
         # Генерируем B до кратного 8
         while True:
             b = (b * FACTOR_B) % MOD
-            if b % 8 == 0:
+            if b % MULTIPLE_B == 0:
                 break
 
         if (a & MASK_16) == (b & MASK_16):
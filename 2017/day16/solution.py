@@ -1,6 +1,13 @@
+import sys
 from pathlib import Path
 from typing import List
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.cycles import fast_forward  # noqa: E402
+
 
 def _parse_moves(data: str) -> List[str]:
     """
@@ -69,37 +76,35 @@ def solve_part1(data: str) -> str:
     return "".join(result)
 
 
+def _compile_dance(programs: str, moves: List[str]):
+    """
+    Танец как пара перестановок: spin/exchange переставляют позиции,
+    partner — имена, и эти две части коммутируют. Возвращает функцию,
+    которая делает целый проход танца за O(len(programs)).
+    """
+    positional = [m for m in moves if m[0] != "p"]
+    partners = [m for m in moves if m[0] == "p"]
+
+    # откуда берётся программа на каждой позиции (танец по индексам)
+    source = [ord(ch) for ch in _dance_once([chr(i) for i in range(len(programs))], positional)]
+    # во что превращается каждое имя (танец только из partner)
+    renamed = dict(zip(programs, _dance_once(list(programs), partners)))
+
+    def dance(order: str) -> str:
+        return "".join(renamed[order[i]] for i in source)
+
+    return dance
+
+
 def solve_part2(data: str) -> str:
     """
     Day 16, Part 2:
     Повторяем тот же танец 1_000_000_000 раз,
-    используя обнаружение цикла.
+    используя обнаружение цикла (строка порядка — сама себе ключ).
     """
     moves = _parse_moves(data)
     start = "abcdefghijklmnop"
-
-    seen: List[str] = [start]
-    current = start
-
-    while True:
-        current = "".join(_dance_once(list(current), moves))
-        if current in seen:
-            # Нашли цикл
-            cycle_start = seen.index(current)
-            cycle_len = len(seen) - cycle_start
-
-            total = 1_000_000_000
-            # Поскольку до cycle_start все уникальные, а дальше цикл:
-            # нам нужна позиция внутри цикла.
-            if total < len(seen):
-                return seen[total]
-
-            # Сдвигаемся от начала цикла
-            offset = (total - cycle_start) % cycle_len
-            answer = seen[cycle_start + offset]
-            return answer
-        else:
-            seen.append(current)
+    return fast_forward(start, _compile_dance(start, moves), 1_000_000_000)
 
 
 if __name__ == "__main__":
@@ -47,23 +47,43 @@ def solve_part2(data: str) -> int:
       - если вставка идёт в позицию 1 -> обновляем ответ.
     """
     step = _parse_step(data)
+    return value_after_zero(step, 50_000_000)
 
+
+def value_after_zero(step: int, inserts: int) -> int:
+    """
+    Значение сразу после 0 после inserts вставок — без самого буфера.
+
+    Пока позиция не "заворачивает" через конец буфера, каждая вставка
+    просто сдвигает её на step + 1 (размер растёт на 1 вместе с ней),
+    поэтому все вставки до ближайшего заворота проходятся одним прыжком:
+    их число k — наименьшее, при котором pos + k*(step+1) > size + k - 1.
+    Проверять вставку после 0 нужно только на заворотах — а их порядка
+    step * ln(inserts), а не inserts.
+    """
     pos = 0
     size = 1  # в буфере изначально только [0]
-    value_after_zero = 0  # запасной, если вдруг ни разу не вставим после 0
-
-    for value in range(1, 50_000_000 + 1):
-        pos = (pos + step) % size
-        insert_pos = pos + 1
-
-        if insert_pos == 1:
+    answer = 0  # запасной, если вдруг ни разу не вставим после 0
+    value = 1
+
+    while value <= inserts:
+        # Заворот наступает, когда pos + step >= size
+        skip = (size - 1 - pos) // step if step else 0  # вставок подряд без заворота
+        if skip > 0:
+            skip = min(skip, inserts - value + 1)
+            pos += skip * (step + 1)
+            size += skip
+            value += skip
+            continue
+
+        pos = (pos + step) % size + 1
+        if pos == 1:
             # Новое значение встаёт сразу после 0 (который в позиции 0)
-            value_after_zero = value
-
-        pos = insert_pos
+            answer = value
         size += 1
+        value += 1
 
-    return value_after_zero
+    return answer
 
 
 if __name__ == "__main__":
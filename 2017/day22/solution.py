@@ -1,9 +1,27 @@
+import sys
 from pathlib import Path
-from typing import Dict, Tuple, Set
+from typing import Tuple, Set
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.cellular import Turmite  # noqa: E402
 
 
 Coord = Tuple[int, int]
 
+# Повороты для Turmite: 0 — прямо, 1 — направо, 2 — назад, 3 — налево
+STRAIGHT, RIGHT, REVERSE, LEFT = range(4)
+
+# Part 1: 0 = clean, 1 = infected
+SIMPLE_TURNS = (LEFT, RIGHT)
+SIMPLE_NEXT = (1, 0)
+
+# Part 2: 0 = clean, 1 = weakened, 2 = infected, 3 = flagged
+EVOLVED_TURNS = (LEFT, STRAIGHT, RIGHT, REVERSE)
+EVOLVED_NEXT = (1, 2, 3, 0)
+
 
 def _parse_input(data: str) -> Set[Coord]:
     """
@@ -35,35 +53,6 @@ def _parse_input(data: str) -> Set[Coord]:
     return infected
 
 
-def _turn_left(dx: int, dy: int) -> Tuple[int, int]:
-    """
-    Поворот налево:
-    (dx, dy) -> (dy, -dx)
-
-    Пример:
-      вверх (0, -1) -> налево (-1, 0)
-    """
-    return dy, -dx
-
-
-def _turn_right(dx: int, dy: int) -> Tuple[int, int]:
-    """
-    Поворот направо:
-    (dx, dy) -> (-dy, dx)
-
-    Пример:
-      вверх (0, -1) -> направо (1, 0)
-    """
-    return -dy, dx
-
-
-def _reverse(dx: int, dy: int) -> Tuple[int, int]:
-    """
-    Разворот на 180°.
-    """
-    return -dx, -dy
-
-
 def solve_part1(data: str) -> int:
     """
     Day 22, Part 1:
@@ -72,27 +61,8 @@ def solve_part1(data: str) -> int:
     - считаем, сколько раз узел стал infected
     """
     infected = _parse_input(data)
-
-    x, y = 0, 0
-    dx, dy = 0, -1  # смотрим вверх
-    infections = 0
-
-    for _ in range(10_000):
-        if (x, y) in infected:
-            # infected: поворот направо, теперь clean
-            dx, dy = _turn_right(dx, dy)
-            infected.remove((x, y))
-        else:
-            # clean: поворот налево, заражаем
-            dx, dy = _turn_left(dx, dy)
-            infected.add((x, y))
-            infections += 1
-
-        # шаг вперёд
-        x += dx
-        y += dy
-
-    return infections
+    carrier = Turmite(SIMPLE_TURNS, SIMPLE_NEXT, {coord: 1 for coord in infected})
+    return carrier.run(10_000, watch=1)
 
 
 def solve_part2(data: str) -> int:
@@ -108,40 +78,8 @@ def solve_part2(data: str) -> int:
     """
     # Начальное состояние: '#' -> infected (2), остальные clean (0)
     initial_infected = _parse_input(data)
-    states: Dict[Coord, int] = {coord: 2 for coord in initial_infected}
-
-    x, y = 0, 0
-    dx, dy = 0, -1  # вверх
-    infections = 0
-
-    for _ in range(10_000_000):
-        state = states.get((x, y), 0)  # по умолчанию clean
-
-        if state == 0:
-            # clean: поворот налево, -> weakened
-            dx, dy = _turn_left(dx, dy)
-            states[(x, y)] = 1
-        elif state == 1:
-            # weakened: прямо, -> infected
-            states[(x, y)] = 2
-            infections += 1
-        elif state == 2:
-            # infected: поворот направо, -> flagged
-            dx, dy = _turn_right(dx, dy)
-            states[(x, y)] = 3
-        elif state == 3:
-            # flagged: разворот, -> clean
-            dx, dy = _reverse(dx, dy)
-            if (x, y) in states:
-                del states[(x, y)]
-        else:
-            raise RuntimeError(f"Неизвестное состояние узла: {state}")
-
-        # шаг вперёд
-        x += dx
-        y += dy
-
-    return infections
+    carrier = Turmite(EVOLVED_TURNS, EVOLVED_NEXT, {coord: 2 for coord in initial_infected})
+    return carrier.run(10_000_000, watch=2)
 
 
 if __name__ == "__main__":
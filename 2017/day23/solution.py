@@ -1,88 +1,34 @@
+import sys
 from pathlib import Path
-from typing import List, Tuple, Dict, Optional
+from typing import Tuple
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
 
-Instruction = Tuple[str, str, Optional[str]]  # (op, X, Y_or_None)
+from aoclib.regvm import BREAK, Program, RegisterMachine, coprocessor  # noqa: E402
 
 
-def _parse_program(data: str) -> List[Instruction]:
-    """
-    Разбираем input.txt в список инструкций:
-    (op, x, y_or_None)
-    """
-    program: List[Instruction] = []
-    for line in data.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        parts = line.split()
-        op = parts[0]
-        x = parts[1]
-        y = parts[2] if len(parts) > 2 else None
-        program.append((op, x, y))
-    if not program:
-        raise ValueError("Пустой input для Day 23")
-    return program
-
-
-def _get_value(token: str, regs: Dict[str, int]) -> int:
-    """
-    Получить значение операнда: либо число, либо значение регистра.
-    """
-    try:
-        return int(token)
-    except ValueError:
-        return regs.get(token, 0)
-
-
-# ---------- Part 1: прямой интерпретатор ----------
+# ---------- Part 1: прямой запуск с точками останова ----------
 
 def solve_part1(data: str) -> int:
     """
     Day 23, Part 1:
-    Запускаем программу (a..h = 0), считаем количество вызовов 'mul'.
+    Запускаем программу (a..h = 0), считаем количество вызовов 'mul':
+    на каждой инструкции mul стоит точка останова.
     """
-    program = _parse_program(data)
-    regs: Dict[str, int] = {}
-    ip = 0
+    program = coprocessor(data, optimize=False)
+    mul_ips = [ip for ip, (op, _, _) in enumerate(program.source) if op == "mul"]
+    vm = RegisterMachine(program)
     mul_count = 0
-
-    while 0 <= ip < len(program):
-        op, x, y = program[ip]
-
-        if op == "set":
-            assert y is not None
-            regs[x] = _get_value(y, regs)
-            ip += 1
-
-        elif op == "sub":
-            assert y is not None
-            regs[x] = regs.get(x, 0) - _get_value(y, regs)
-            ip += 1
-
-        elif op == "mul":
-            assert y is not None
-            regs[x] = regs.get(x, 0) * _get_value(y, regs)
-            mul_count += 1
-            ip += 1
-
-        elif op == "jnz":
-            assert y is not None
-            cond = _get_value(x, regs)
-            if cond != 0:
-                ip += _get_value(y, regs)
-            else:
-                ip += 1
-
-        else:
-            raise ValueError(f"Неизвестная инструкция: {op!r}")
-
+    while vm.run(breakpoints=mul_ips) == BREAK:
+        mul_count += 1
     return mul_count
 
 
 # ---------- Part 2: аккуратная раскрутка через короткую симуляцию ----------
 
-def _init_bc_with_a1(program: List[Instruction]) -> Tuple[int, int]:
+def _init_bc_with_a1(program: Program) -> Tuple[int, int]:
     """
     Запускаем программу с a = 1, но только на коротком префиксе,
     пока не будет выполнена первая инструкция вида 'sub c -N'.
@@ -90,58 +36,18 @@ def _init_bc_with_a1(program: List[Instruction]) -> Tuple[int, int]:
 
     Возвращаем (b_start, c).
     """
-    regs: Dict[str, int] = {"a": 1}
-    ip = 0
-
-    visited_sub_c = False
-    steps = 0
-    max_steps = 10_000  # с большим запасом: реально нужно меньше сотни
-
-    while 0 <= ip < len(program):
-        if steps > max_steps:
-            raise RuntimeError("Слишком много шагов при инициализации b/c; формат программы, похоже, другой.")
-        steps += 1
-
-        op, x, y = program[ip]
-
-        if op == "set":
-            assert y is not None
-            regs[x] = _get_value(y, regs)
-            ip += 1
-
-        elif op == "sub":
-            assert y is not None
-            regs[x] = regs.get(x, 0) - _get_value(y, regs)
-            # ловим именно 'sub c -N'
-            if x == "c" and y.startswith("-"):
-                visited_sub_c = True
-                ip += 1
-                break  # после этого c и b установлены как нужно
-            else:
-                ip += 1
-
-        elif op == "mul":
-            assert y is not None
-            regs[x] = regs.get(x, 0) * _get_value(y, regs)
-            ip += 1
-
-        elif op == "jnz":
-            assert y is not None
-            cond = _get_value(x, regs)
-            if cond != 0:
-                ip += _get_value(y, regs)
-            else:
-                ip += 1
-
-        else:
-            raise ValueError(f"Неизвестная инструкция: {op!r}")
-
-    if not visited_sub_c:
-        raise RuntimeError("Не нашли инициализирующую 'sub c -N' при a=1 — формат программы другой?")
-
-    b_start = regs.get("b", 0)
-    c = regs.get("c", 0)
-    return b_start, c
+    sub_c = [
+        ip for ip, (op, x, y) in enumerate(program.source)
+        if op == "sub" and x == "c" and y.startswith("-")
+    ]
+    if not sub_c:
+        raise RuntimeError("Не нашли инициализирующую 'sub c -N' — формат программы другой?")
+
+    vm = RegisterMachine(program, {"a": 1})
+    # с большим запасом: реально нужно меньше сотни шагов
+    if vm.run(max_steps=10_000, breakpoints=[sub_c[0] + 1]) != BREAK:
+        raise RuntimeError("Слишком много шагов при инициализации b/c; формат программы, похоже, другой.")
+    return vm["b"], vm["c"]
 
 
 def _is_prime(n: int) -> bool:
@@ -169,7 +75,7 @@ def solve_part2(data: str) -> int:
     Мы честно вытаскиваем b_start и c короткой симуляцией, а дальше
     считаем составные числа напрямую.
     """
-    program = _parse_program(data)
+    program = coprocessor(data)
     b_start, c = _init_bc_with_a1(program)
 
     h = 0
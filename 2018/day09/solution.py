@@ -1,6 +1,16 @@
 from collections import deque
 from pathlib import Path
-from typing import Tuple
+from typing import Deque, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен: без него вся игра идёт на deque
+    np = None
+
+SPECIAL = 23       # каждый 23-й мрамор — особый ход
+BACK = 7           # особый ход забирает мрамор в 7 шагах против часовой
+NORMAL = SPECIAL - 1
+WARMUP_SPECIALS = 2  # столько особых ходов играем на deque до блочного режима
 
 
 def parse_input(data: str) -> Tuple[int, int]:
@@ -19,23 +29,18 @@ def parse_input(data: str) -> Tuple[int, int]:
     return players, last_marble
 
 
-def play_game(players: int, last_marble: int) -> int:
+def _play_deque(
+    players: int, first: int, last: int, circle: Deque[int], scores: List[int]
+) -> None:
     """
-    Эмуляция игры.
-    Используем deque для эффективных операций вставки/удаления по кругу.
+    Ходы first..last на deque (текущий мрамор — на правом конце).
     """
-    if players <= 0 or last_marble <= 0:
-        return 0
-
-    scores = [0] * players
-    circle = deque([0])  # текущий мрамор считается "на конце" deque
-
-    for marble in range(1, last_marble + 1):
+    for marble in range(first, last + 1):
         player = (marble - 1) % players
 
-        if marble % 23 == 0:
+        if marble % SPECIAL == 0:
             # Особый ход: отматываем на 7 CCW, забираем мрамор
-            circle.rotate(7)
+            circle.rotate(BACK)
             removed = circle.pop()
             scores[player] += marble + removed
             # Новый текущий — мрамор справа от удалённого
@@ -45,6 +50,88 @@ def play_game(players: int, last_marble: int) -> int:
             circle.rotate(-1)
             circle.append(marble)
 
+
+def _play_blocks(
+    players: int, first: int, last: int, circle: Deque[int], scores: List[int]
+) -> None:
+    """
+    Блочный режим: ход first — первый обычный после особого, дальше
+    целые блоки по 23 мрамора (22 вставки + особый ход).
+
+    Круг читаем как очередь по часовой стрелке от мрамора после текущего,
+    текущий — последний. Тогда блок делает одно и то же:
+      * снимает с головы 22 мрамора t0..t21 и чередует их с новыми
+        m0..m21: t0 m0 t1 m1 ... t21 m21;
+      * особый ход забирает t18, текущим становится m18,
+        а t19 m19 t20 m20 t21 m21 уходят в голову очереди
+        (это t0..t5 следующего блока);
+      * в хвост уходит t0 m0 ... t17 m17 m18 — 37 мраморов.
+    Голова очереди отстаёт от хвоста на весь круг, поэтому все блоки,
+    чьи 16 мраморов из головы уже записаны, считаются разом массивами —
+    их число растёт вместе с кругом.
+    """
+    blocks = (last - first - NORMAL) // SPECIAL + 1 if last >= first + NORMAL else 0
+    queue = list(circle)
+    pending = np.array(queue[:6], dtype=np.int64)  # t0..t5 ближайшего блока
+    buf = np.empty(len(queue) - 6 + 37 * blocks, dtype=np.int64)
+    buf[:len(queue) - 6] = queue[6:]
+    head, tail = 0, len(queue) - 6
+
+    totals = np.zeros(players, dtype=np.int64)
+    offsets = np.arange(NORMAL, dtype=np.int64)
+    done = 0
+    while done < blocks:
+        n = min((tail - head) // 16, blocks - done)
+        taken = buf[head:head + 16 * n].reshape(n, 16)
+        head += 16 * n
+        bases = first + SPECIAL * (done + np.arange(n, dtype=np.int64))
+        new = bases[:, None] + offsets  # m0..m21 каждого блока
+
+        # t0..t5 блока j — хвост блока j-1 (или pending для первого)
+        t = np.empty((n, NORMAL), dtype=np.int64)
+        t[0, :6] = pending
+        t[1:, 0:6:2] = taken[:-1, 13:16]
+        t[1:, 1:6:2] = new[:-1, 19:22]
+        t[:, 6:] = taken
+        pending = np.empty(6, dtype=np.int64)
+        pending[0::2] = taken[-1, 13:16]
+        pending[1::2] = new[-1, 19:22]
+
+        produced = np.empty((n, 37), dtype=np.int64)
+        produced[:, 0:36:2] = t[:, :18]
+        produced[:, 1:36:2] = new[:, :18]
+        produced[:, 36] = new[:, 18]
+        buf[tail:tail + 37 * n] = produced.ravel()
+        tail += 37 * n
+
+        specials = bases + NORMAL
+        gains = specials + t[:, 18]
+        np.add.at(totals, (specials - 1) % players, gains)
+        done += n
+
+    for player, total in enumerate(totals.tolist()):
+        scores[player] += total
+
+
+def play_game(players: int, last_marble: int) -> int:
+    """
+    Эмуляция игры.
+    Начало — на deque, дальше (если есть NumPy) — блоками по 23 мрамора,
+    посчитанными сразу для многих блоков (см. _play_blocks).
+    """
+    if players <= 0 or last_marble <= 0:
+        return 0
+
+    scores = [0] * players
+    circle = deque([0])  # текущий мрамор считается "на конце" deque
+
+    warmup = SPECIAL * WARMUP_SPECIALS
+    if np is None or last_marble <= warmup:
+        _play_deque(players, 1, last_marble, circle, scores)
+        return max(scores)
+
+    _play_deque(players, 1, warmup, circle, scores)
+    _play_blocks(players, warmup + 1, last_marble, circle, scores)
     return max(scores)
 
 
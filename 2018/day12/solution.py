@@ -1,6 +1,13 @@
+import sys
 from pathlib import Path
 from typing import Set, Tuple
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.cycles import fast_forward  # noqa: E402
+
 
 def parse_input(data: str) -> Tuple[Set[int], Set[str]]:
     """
@@ -38,44 +45,61 @@ def parse_input(data: str) -> Tuple[Set[int], Set[str]]:
     return state, rules_hash
 
 
-def step(state: Set[int], rules_hash: Set[str]) -> Set[int]:
+# Ряд горшков — (offset, pattern): pattern начинается и кончается '#',
+# его i-й символ — горшок номер offset + i. Узор без offset служит ключом
+# для поиска периода: через пару сотен поколений он перестаёт меняться
+# и только едет вдоль ряда.
+Row = Tuple[int, str]
+
+
+def to_row(state: Set[int]) -> Row:
+    if not state:
+        return 0, ""
+    lo, hi = min(state), max(state)
+    return lo, "".join("#" if i in state else "." for i in range(lo, hi + 1))
+
+
+def step(row: Row, rules_hash: Set[str]) -> Row:
     """
     Делаем один шаг эволюции.
     Для каждого потенциального горшка смотрим окно из 5 позиций
     и проверяем, есть ли оно в rules_hash.
     """
-    if not state:
-        return set()
-
-    new_state: Set[int] = set()
-    min_i = min(state)
-    max_i = max(state)
+    offset, pattern = row
+    if not pattern:
+        return row
 
     # С запасом по 2 горшка в каждую сторону
-    for i in range(min_i - 2, max_i + 3):
-        pattern = []
-        for pos in range(i - 2, i + 3):
-            pattern.append("#" if pos in state else ".")
-        pattern_str = "".join(pattern)
-        if pattern_str in rules_hash:
-            new_state.add(i)
+    padded = "...." + pattern + "...."
+    new = "".join(
+        "#" if padded[i:i + 5] in rules_hash else "." for i in range(len(padded) - 4)
+    )
+    first = new.find("#")
+    if first < 0:
+        return offset, ""
+    return offset - 2 + first, new[first:new.rfind("#") + 1]
+
 
-    return new_state
+def pots_sum(row: Row) -> int:
+    offset, pattern = row
+    return sum(offset + i for i, ch in enumerate(pattern) if ch == "#")
 
 
-def pots_sum(state: Set[int]) -> int:
-    return sum(state)
+def drift(row: Row, earlier: Row, cycles: int) -> Row:
+    """Узор повторился со сдвигом: за каждый период он уезжает на одно и то же."""
+    return row[0] + cycles * (row[0] - earlier[0]), row[1]
 
 
 def solve_part1(data: str) -> str:
     # Решение части 1. data — содержимое input.txt.
     state, rules_hash = parse_input(data)
+    row = to_row(state)
     generations = 20
 
     for _ in range(generations):
-        state = step(state, rules_hash)
+        row = step(row, rules_hash)
 
-    return str(pots_sum(state))
+    return str(pots_sum(row))
 
 
 def solve_part2(data: str) -> str:
@@ -83,12 +107,9 @@ def solve_part2(data: str) -> str:
     Решение части 2. Нужно 50_000_000_000 поколений.
 
     На практике рисунок быстро стабилизируется: форма остаётся той же,
-    а сумма индексов растёт линейно (каждое поколение прибавляется одно и то же).
-    Мы:
-    - идём по поколениям
-    - отслеживаем разницу сумм (delta)
-    - как только delta несколько десятков/сотен поколений подряд одинаковая,
-      считаем, что достигнута линейная фаза и экстраполируем.
+    а сдвигается вдоль ряда на одно и то же число горшков за поколение
+    (в общем случае — за период). Ищем повтор формы и перематываем
+    сразу на нужное поколение, дописывая накопленный сдвиг.
     """
     TARGET = 50_000_000_000
     state, rules_hash = parse_input(data)
@@ -96,35 +117,14 @@ def solve_part2(data: str) -> str:
     if not state:
         return "0"
 
-    prev_sum = pots_sum(state)
-    prev_delta = None
-    same_delta_count = 0
-
-    # Верхний предел для "ручной" симуляции — с большим запасом
-    MAX_STEPS = 5000
-
-    for gen in range(1, MAX_STEPS + 1):
-        state = step(state, rules_hash)
-        curr_sum = pots_sum(state)
-        delta = curr_sum - prev_sum
-
-        if delta == prev_delta:
-            same_delta_count += 1
-        else:
-            same_delta_count = 1
-            prev_delta = delta
-
-        # Если дельта держится достаточно долго — считаем, что стабилизировалось
-        if same_delta_count >= 100:
-            remaining = TARGET - gen
-            final_sum = curr_sum + remaining * delta
-            return str(final_sum)
-
-        prev_sum = curr_sum
-
-    # На случай, если не увидели стабилизацию (маловероятно для AoC-входов),
-    # просто возвращаем сумму после MAX_STEPS.
-    return str(prev_sum)
+    row = fast_forward(
+        to_row(state),
+        lambda r: step(r, rules_hash),
+        TARGET,
+        key=lambda r: r[1],
+        extrapolate=drift,
+    )
+    return str(pots_sum(row))
 
 
 if __name__ == "__main__":
@@ -1,45 +1,17 @@
-from pathlib import Path
-from typing import List, Tuple, Dict, Callable
 import re
+import sys
+from pathlib import Path
+from typing import Dict
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
 
-# =========================
-#   Определения операций
-# =========================
-
-def addr(r, a, b, c): r[c] = r[a] + r[b]
-def addi(r, a, b, c): r[c] = r[a] + b
-
-def mulr(r, a, b, c): r[c] = r[a] * r[b]
-def muli(r, a, b, c): r[c] = r[a] * b
-
-def banr(r, a, b, c): r[c] = r[a] & r[b]
-def bani(r, a, b, c): r[c] = r[a] & b
-
-def borr(r, a, b, c): r[c] = r[a] | r[b]
-def bori(r, a, b, c): r[c] = r[a] | b
-
-def setr(r, a, b, c): r[c] = r[a]
-def seti(r, a, b, c): r[c] = a
-
-def gtir(r, a, b, c): r[c] = 1 if a     > r[b] else 0
-def gtri(r, a, b, c): r[c] = 1 if r[a] > b     else 0
-def gtrr(r, a, b, c): r[c] = 1 if r[a] > r[b] else 0
-
-def eqir(r, a, b, c): r[c] = 1 if a     == r[b] else 0
-def eqri(r, a, b, c): r[c] = 1 if r[a] == b     else 0
-def eqrr(r, a, b, c): r[c] = 1 if r[a] == r[b] else 0
+from aoclib.regvm import ELFCODE_OPS, RegisterMachine, elfcode  # noqa: E402
 
 
-OPS: Dict[str, Callable] = {
-    "addr": addr, "addi": addi,
-    "mulr": mulr, "muli": muli,
-    "banr": banr, "bani": bani,
-    "borr": borr, "bori": bori,
-    "setr": setr, "seti": seti,
-    "gtir": gtir, "gtri": gtri, "gtrr": gtrr,
-    "eqir": eqir, "eqri": eqri, "eqrr": eqrr,
-}
+# Операции — общие для всех elfcode-дней (aoclib.regvm)
+OPS = ELFCODE_OPS
 
 
 # =========================
@@ -149,11 +121,10 @@ def find_opcode_mapping(samples):
 
 
 def run_program(program, mapping):
-    regs = [0, 0, 0, 0]
-    for opcode, a, b, c in program:
-        name = mapping[opcode]
-        OPS[name](regs, a, b, c)
-    return regs[0]
+    prog = [(mapping[opcode], a, b, c) for opcode, a, b, c in program]
+    vm = RegisterMachine(elfcode(None, prog))
+    vm.run()
+    return vm.regs[0]
 
 
 def solve_part2(data: str) -> str:
@@ -1,171 +1,90 @@
 from __future__ import annotations
 
+import sys
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import Callable, Tuple
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
 
-def parse_input(data: str) -> List[List[str]]:
+from aoclib.cellular import Automaton, BitGrid, Counts, popcount  # noqa: E402
+from aoclib.cycles import fast_forward  # noqa: E402
+
+# Состояние поля — пара битовых досок (деревья, лесопилки);
+# открытые клетки — всё остальное внутри поля.
+State = Tuple[int, int]
+SYMBOLS = "|#"
+
+
+def parse_input(data: str) -> Tuple[BitGrid, State]:
     """
-    Превращаем input.txt в сетку символов '.', '|' и '#'.
+    Превращаем input.txt в поле BitGrid и доски '|' и '#'.
     Пустые строки игнорируем.
     """
-    grid: List[List[str]] = []
-    for line in data.splitlines():
-        line = line.rstrip("\n")
-        if not line:
-            continue
-        grid.append(list(line))
-    return grid
+    return BitGrid.parse(data, SYMBOLS)
 
 
-def count_adjacent(grid: List[List[str]], y: int, x: int) -> Tuple[int, int, int]:
-    """
-    Подсчитываем, сколько вокруг клетки (y,x) символов '.', '|', '#'
-    среди 8 соседей.
-    """
-    h = len(grid)
-    w = len(grid[0]) if h > 0 else 0
-
-    dots = trees = yards = 0
-    for dy in (-1, 0, 1):
-        for dx in (-1, 0, 1):
-            if dy == 0 and dx == 0:
-                continue
-            ny = y + dy
-            nx = x + dx
-            if 0 <= ny < h and 0 <= nx < w:
-                ch = grid[ny][nx]
-                if ch == ".":
-                    dots += 1
-                elif ch == "|":
-                    trees += 1
-                elif ch == "#":
-                    yards += 1
-    return dots, trees, yards
-
-
-def step(grid: List[List[str]]) -> List[List[str]]:
+def lumber_rule(state: State, count: Callable[[int], Counts]) -> State:
     """
-    Делаем один "тик" автомата.
+    Один "тик" для всех клеток сразу:
+      * '.' -> '|', если вокруг >= 3 деревьев;
+      * '|' -> '#', если вокруг >= 3 лесопилок;
+      * '#' остаётся, если рядом есть и лесопилка, и дерево, иначе '.'.
     """
-    h = len(grid)
-    w = len(grid[0]) if h > 0 else 0
-
-    new_grid: List[List[str]] = [row[:] for row in grid]
-
-    for y in range(h):
-        for x in range(w):
-            ch = grid[y][x]
-            _, trees, yards = count_adjacent(grid, y, x)
-
-            if ch == ".":
-                # An open acre will become filled with trees if three or more
-                # adjacent acres contained trees. Otherwise, nothing happens.
-                if trees >= 3:
-                    new_grid[y][x] = "|"
-            elif ch == "|":
-                # An acre filled with trees will become a lumberyard if
-                # three or more adjacent acres were lumberyards.
-                if yards >= 3:
-                    new_grid[y][x] = "#"
-            elif ch == "#":
-                # A lumberyard will remain a lumberyard if it was adjacent to
-                # at least one other lumberyard and at least one acre of trees.
-                # Otherwise, it becomes open.
-                if not (yards >= 1 and trees >= 1):
-                    new_grid[y][x] = "."
-
-    return new_grid
-
-
-def resource_value(grid: List[List[str]]) -> int:
+    trees, yards = state
+    around_trees = count(trees)
+    around_yards = count(yards)
+    open_ = ~(trees | yards)
+
+    many_yards = around_yards.ge(3)
+    new_trees = (open_ & around_trees.ge(3)) | (trees & ~many_yards)
+    new_yards = (trees & many_yards) | (yards & around_yards.ge(1) & around_trees.ge(1))
+    return new_trees, new_yards
+
+
+def resource_value(state: State) -> int:
     """
     Вычисляет "resource value" = (#деревьев) * (#лесопилок).
     """
-    trees = sum(row.count("|") for row in grid)
-    yards = sum(row.count("#") for row in grid)
-    return trees * yards
+    trees, yards = state
+    return popcount(trees) * popcount(yards)
 
 
-def simulate_minutes(grid: List[List[str]], minutes: int) -> List[List[str]]:
+def simulate_minutes(forest: Automaton, state: State, minutes: int) -> State:
     """
     Наивная симуляция "minutes" шагов без цикла (для Part 1 / небольших T).
     """
-    current = grid
-    for _ in range(minutes):
-        current = step(current)
-    return current
+    return forest.run(state, minutes)
 
 
-def simulate_with_cycle(grid: List[List[str]], target_minute: int) -> List[List[str]]:
+def simulate_with_cycle(forest: Automaton, state: State, target_minute: int) -> State:
     """
-    Симуляция с детекцией цикла для больших T (Part 2).
-    Идея:
-      - сохраняем строковое представление состояния -> номер минуты
-      - когда состояние повторилось, вычисляем длину цикла
-      - перескакиваем вперёд по модулю длины цикла
+    Симуляция с детекцией цикла для больших T (Part 2): состояние — уже
+    компактная пара битовых досок, она же служит ключом для поиска периода.
     """
-    seen: Dict[str, int] = {}         # state_str -> minute
-    states: List[str] = []            # список состояний по минутам
-    grids: List[List[List[str]]] = [] # реальные сетки для восстановления
-
-    current = grid
-    minute = 0
-
-    while minute < target_minute:
-        state_str = "\n".join("".join(row) for row in current)
-
-        if state_str in seen:
-            # цикл найден
-            first = seen[state_str]
-            cycle_len = minute - first
-
-            # сколько минут осталось пройти
-            remaining = target_minute - minute
-            # на какой итоговой минуте в рамках цикла мы окажемся
-            offset = remaining % cycle_len
-            final_minute = minute + offset
-
-            # если offset == 0, значит итоговое состояние такое же, как сейчас
-            if offset == 0:
-                return current
-
-            # иначе можем восстановить состояние через states/grids
-            # states[first] соответствует минуте first, мы уже хранили grid для каждого minute
-            idx = first + offset
-            return grids[idx]
-
-        # ещё не видели это состояние — запоминаем
-        seen[state_str] = minute
-        states.append(state_str)
-        grids.append(current)
-
-        # делаем шаг
-        current = step(current)
-        minute += 1
-
-    return current
+    return fast_forward(state, forest.step, target_minute)
 
 
 def solve_part1(data: str) -> str:
     # Решение части 1. data — содержимое input.txt.
-    grid = parse_input(data)
-    if not grid:
+    if not data.strip():
         return "0"
+    grid, state = parse_input(data)
 
-    final = simulate_minutes(grid, 10)
+    final = simulate_minutes(Automaton(grid, lumber_rule), state, 10)
     value = resource_value(final)
     return str(value)
 
 
 def solve_part2(data: str) -> str:
     # Решение части 2. data — содержимое input.txt.
-    grid = parse_input(data)
-    if not grid:
+    if not data.strip():
         return "0"
+    grid, state = parse_input(data)
 
     TARGET = 1_000_000_000
-    final = simulate_with_cycle(grid, TARGET)
+    final = simulate_with_cycle(Automaton(grid, lumber_rule), state, TARGET)
     value = resource_value(final)
     return str(value)
 
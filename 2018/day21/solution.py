@@ -1,71 +1,60 @@
 from __future__ import annotations
 
+import sys
 from pathlib import Path
+from typing import Iterator
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
 
-def generate_sequence():
-    """
-    Генерируем последовательность значений r5, которые сравниваются с r0
-    в инструкции eqrr 5 0 3 для входа AoC 2018 Day 21.
+from aoclib.regvm import (  # noqa: E402
+    BREAK, DEFAULT_COMPILE_AFTER, RegisterMachine, elfcode, parse_elfcode,
+)
 
-    Алгоритм извлечён из кода:
-        r1 = r5 | 65536
-        r5 = 4591209
-        while True:
-            r5 = (((r5 + (r1 & 255)) & 0xFFFFFF) * 65899) & 0xFFFFFF
-            if r1 < 256:
-                break
-            r1 //= 256
 
-    Возвращаем первое значение (для Part 1) и последнее уникальное
-    перед повтором (для Part 2).
+def compared_values(data: str) -> Iterator[int]:
     """
-    seen = set()
-    first_value = None
-    last_unique = None
-
-    r5 = 0  # начальное состояние (как после seti 0 6 5)
-
-    while True:
-        r1 = r5 | 65536
-        r5 = 4591209
-
-        while True:
-            r3 = r1 & 255
-            r5 += r3
-            r5 &= 0xFFFFFF
-            r5 *= 65899
-            r5 &= 0xFFFFFF
-
-            if r1 < 256:
-                break
-            r1 //= 256
-
-        # в этот момент в оригинальной программе выполняется eqrr 5 0 3
+    Последовательность значений, которые программа сравнивает с r0
+    (инструкция eqrr X 0 Y или eqrr 0 X Y).
 
-        if first_value is None:
-            first_value = r5
-
-        if r5 in seen:
-            # нашли цикл — последнее уникальное значение и есть ответ Part 2
-            break
-
-        seen.add(r5)
-        last_unique = r5
+    Программа исполняется на общей регистровой машине с точкой останова
+    на этом сравнении; r0 = -1 не совпадает ни с одним значением, так что
+    программа не завершается сама. Цикл "деления на 256 перебором"
+    машина выполняет одной суперинструкцией (DIVLOOP).
+    """
+    ip_reg, prog = parse_elfcode(data)
+    compares = [
+        (ip, a if b == 0 else b)
+        for ip, (op, a, b, c) in enumerate(prog)
+        if op == "eqrr" and 0 in (a, b) and (a, b) != (0, 0)
+    ]
+    if not compares:
+        raise ValueError("Не нашли сравнение с r0 (eqrr ... 0 ...)")
+    check_ip, watched = compares[0]
 
-    return first_value, last_unique
+    vm = RegisterMachine(elfcode(ip_reg, prog), [-1], DEFAULT_COMPILE_AFTER)
+    while vm.run(breakpoints=[check_ip]) == BREAK:
+        yield vm.regs[watched]
 
 
 def solve_part1(data: str) -> str:
-    # data не используем, алгоритм однозначно задан программой из input.txt
-    first, _ = generate_sequence()
-    return str(first if first is not None else 0)
+    # Первое сравниваемое значение — минимальное число шагов до остановки
+    for value in compared_values(data):
+        return str(value)
+    return "0"
 
 
 def solve_part2(data: str) -> str:
-    # data не используем, алгоритм однозначно задан программой из input.txt
-    _, last = generate_sequence()
-    return str(last if last is not None else 0)
+    # Последнее уникальное значение перед повтором — максимум шагов
+    seen = set()
+    last_unique = 0
+    for value in compared_values(data):
+        if value in seen:
+            break
+        seen.add(value)
+        last_unique = value
+    return str(last_unique)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import sys
 from pathlib import Path
-import heapq
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.pathfind import astar  # noqa: E402
 
 
 # --------------------------------------------------------------------
@@ -64,12 +70,12 @@ def compute_maps(depth: int, tx: int, ty: int):
 # 0 = rocky  → allowed: torch, climb
 # 1 = wet    → allowed: climb, none
 # 2 = narrow → allowed: torch, none
+#
+# Инструменты пронумерованы так, что в регионе типа t запрещён ровно
+# инструмент с номером t: NONE в rocky, TORCH в wet, CLIMB в narrow.
 
-TOOLS = {
-    0: ("torch", "climb"),
-    1: ("climb", "none"),
-    2: ("torch", "none"),
-}
+NONE, TORCH, CLIMB = range(3)
+SWITCH_COST = 7
 
 
 # --------------------------------------------------------------------
@@ -88,49 +94,51 @@ def solve_part1(data: str) -> str:
 
 
 # --------------------------------------------------------------------
-#  PART 2 = DIJKSTRA (x, y, tool)
+#  PART 2 = A* по состояниям cell * 3 + tool
 # --------------------------------------------------------------------
 
 def solve_part2(data: str) -> str:
     depth, tx, ty = parse(data)
     region = compute_maps(depth, tx, ty)
 
-    # Dijkstra priority queue
-    pq = []
-    heapq.heappush(pq, (0, 0, 0, "torch"))  # cost, x, y, tool
-
-    visited = {}  # (x, y, tool) -> best_cost
-
-    while pq:
-        cost, x, y, tool = heapq.heappop(pq)
-
-        if (x, y, tool) in visited and visited[(x, y, tool)] <= cost:
-            continue
-        visited[(x, y, tool)] = cost
-
-        # цель: достичь (tx, ty) с инструментом torch
-        if (x, y) == (tx, ty) and tool == "torch":
-            return str(cost)
-
-        # смена инструмента
-        for new_tool in TOOLS[region[y][x]]:
-            if new_tool != tool:
-                ncost = cost + 7
-                if visited.get((x, y, new_tool), 10**15) > ncost:
-                    heapq.heappush(pq, (ncost, x, y, new_tool))
-
-        # движение
-        for dx, dy in ((1,0),(-1,0),(0,1),(0,-1)):
-            nx, ny = x + dx, y + dy
-            if nx < 0 or ny < 0 or ny >= len(region) or nx >= len(region[0]):
-                continue
-            # можно идти, если tool разрешён в соседней клетке
-            if tool in TOOLS[region[ny][nx]]:
-                ncost = cost + 1
-                if visited.get((nx, ny, tool), 10**15) > ncost:
-                    heapq.heappush(pq, (ncost, nx, ny, tool))
-
-    return "ERROR"  # не должно произойти
+    # Плоская карта с рамкой: тип -1 — за краем, туда нельзя ни с чем
+    stride = len(region[0]) + 2
+    flat = [-1] * stride
+    for row in region:
+        flat.append(-1)
+        flat.extend(row)
+        flat.append(-1)
+    flat.extend([-1] * stride)
+    steps = (1, -1, stride, -stride)
+
+    start = (stride + 1) * 3 + TORCH
+    target = ((ty + 1) * stride + tx + 1) * 3 + TORCH
+
+    def edges(state):
+        cell, tool = divmod(state, 3)
+        kind = flat[cell]
+        # смена на второй разрешённый здесь инструмент
+        result = [(state - tool + 3 - kind - tool, SWITCH_COST)]
+        # движение, если инструмент разрешён в соседней клетке
+        for step in steps:
+            nxt = flat[cell + step]
+            if nxt >= 0 and nxt != tool:
+                result.append((state + step * 3, 1))
+        return result
+
+    def heuristic(state):
+        cell, tool = divmod(state, 3)
+        y, x = divmod(cell, stride)
+        h = abs(x - 1 - tx) + abs(y - 1 - ty)
+        return h if tool == TORCH else h + SWITCH_COST
+
+    dist, found = astar(
+        edges, [start], heuristic, goal=lambda state: state == target,
+        size=len(flat) * 3, max_weight=SWITCH_COST,
+    )
+    if found is None:
+        return "ERROR"  # не должно произойти
+    return str(dist[found])
 
 
 # --------------------------------------------------------------------
@@ -1,49 +1,24 @@
 from __future__ import annotations
 
+import sys
+from pathlib import Path
 from typing import List
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
 
-def parse_program(data: str) -> List[int]:
-    """
-    Разбор программы Intcode.
-    Как правило, числа разделены запятыми, но на всякий случай
-    уберём переводы строк.
-    """
-    cleaned = data.replace("\n", ",")
-    return [int(x) for x in cleaned.split(",") if x.strip()]
+from aoclib.intcode import Intcode, parse_program  # noqa: E402
 
 
 def run_intcode(memory: List[int]) -> List[int]:
     """
-    Запуск Intcode-программы (опкоды 1, 2, 99).
-    Работает только в позиционном режиме (как в Day 2).
+    Запуск Intcode-программы на общей машине aoclib.intcode.
     Возвращает изменённую память.
     """
-    ip = 0  # instruction pointer
-
-    while True:
-        opcode = memory[ip]
-
-        if opcode == 99:
-            break
-        elif opcode in (1, 2):
-            a_pos = memory[ip + 1]
-            b_pos = memory[ip + 2]
-            out_pos = memory[ip + 3]
-
-            a_val = memory[a_pos]
-            b_val = memory[b_pos]
-
-            if opcode == 1:
-                memory[out_pos] = a_val + b_val
-            else:  # opcode == 2
-                memory[out_pos] = a_val * b_val
-
-            ip += 4
-        else:
-            raise ValueError(f"Неизвестный opcode {opcode} на позиции {ip}")
-
-    return memory
+    comp = Intcode(memory)
+    comp.run()
+    return comp.mem
 
 
 def solve_part1(data: str) -> str:
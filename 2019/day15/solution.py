@@ -1,113 +1,14 @@
 from __future__ import annotations
-from typing import List, Tuple, Dict, Optional
 import collections
+import sys
+from pathlib import Path
+from typing import List, Tuple, Dict
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
 
-# ================== Intcode-computer ==================
-
-def parse_program(data: str) -> List[int]:
-    cleaned = data.replace("\n", ",")
-    return [int(x) for x in cleaned.split(",") if x.strip()]
-
-
-class Intcode:
-    def __init__(self, mem: List[int]):
-        self.mem = mem[:] + [0] * 10_000  # фиксируем длинную память
-        self.ip = 0
-        self.rb = 0
-        self.halted = False
-
-    def clone(self) -> "Intcode":
-        c = Intcode(self.mem[:])
-        c.ip = self.ip
-        c.rb = self.rb
-        c.halted = self.halted
-        return c
-
-    def run(self, inp: Optional[int] = None) -> Optional[int]:
-        """
-        Запустить до вывода или остановки.
-        inp — команда движения (или None, если не требуется).
-        Возвращает:
-           output (0,1,2) или None, если halted.
-        """
-        while True:
-            op = self.mem[self.ip] % 100
-            mode1 = (self.mem[self.ip] // 100) % 10
-            mode2 = (self.mem[self.ip] // 1000) % 10
-            mode3 = (self.mem[self.ip] // 10_000) % 10
-
-            def get(idx, mode):
-                v = self.mem[self.ip + idx]
-                if mode == 0:
-                    return self.mem[v]
-                if mode == 1:
-                    return v
-                if mode == 2:
-                    return self.mem[self.rb + v]
-                raise ValueError("bad mode")
-
-            def addr(idx, mode):
-                v = self.mem[self.ip + idx]
-                if mode == 0:
-                    return v
-                if mode == 2:
-                    return self.rb + v
-                raise ValueError("bad addr mode")
-
-            if op == 99:
-                self.halted = True
-                return None
-
-            elif op in (1, 2):
-                a = get(1, mode1)
-                b = get(2, mode2)
-                out = addr(3, mode3)
-                self.mem[out] = a + b if op == 1 else a * b
-                self.ip += 4
-
-            elif op == 3:
-                if inp is None:
-                    raise RuntimeError("input expected but not provided")
-                out = addr(1, mode1)
-                self.mem[out] = inp
-                self.ip += 2
-                inp = None  # input consumed
-
-            elif op == 4:
-                a = get(1, mode1)
-                self.ip += 2
-                return a
-
-            elif op in (5, 6):
-                a = get(1, mode1)
-                b = get(2, mode2)
-                if (op == 5 and a != 0) or (op == 6 and a == 0):
-                    self.ip = b
-                else:
-                    self.ip += 3
-
-            elif op == 7:
-                a = get(1, mode1)
-                b = get(2, mode2)
-                out = addr(3, mode3)
-                self.mem[out] = 1 if a < b else 0
-                self.ip += 4
-
-            elif op == 8:
-                a = get(1, mode1)
-                b = get(2, mode2)
-                out = addr(3, mode3)
-                self.mem[out] = 1 if a == b else 0
-                self.ip += 4
-
-            elif op == 9:
-                a = get(1, mode1)
-                self.rb += a
-                self.ip += 2
-
-            else:
-                raise RuntimeError(f"Unknown opcode {op}")
+from aoclib.intcode import Intcode, parse_program  # noqa: E402
 
 
 # ================== Movement helpers ==================
@@ -151,8 +52,10 @@ def explore_map(program: List[int]) -> Tuple[Dict[Tuple[int,int], int], Tuple[in
             if (nx, ny) in world:  # уже исследована
                 continue
 
-            new_state = state.clone()
-            out = new_state.run(cmd)
+            # ветка машины на каждое направление (copy-on-write, см. Intcode.fork)
+            new_state = state.fork()
+            new_state.add_input(cmd)
+            out = new_state.run_until_output()
 
             if out == 0:  # стена
                 world[(nx, ny)] = 0
@@ -230,7 +133,6 @@ def solve_part2(data: str) -> str:
 # ================== template ==================
 
 if __name__ == "__main__":
-    from pathlib import Path
     here = Path(__file__).resolve().parent
     input_path = here / "input.txt"
     if input_path.exists():
@@ -1,113 +1,13 @@
 from __future__ import annotations
+import sys
+from pathlib import Path
 from typing import List, Tuple, Dict, Optional
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
 
-# ================== Intcode ==================
-
-def parse_program(data: str) -> List[int]:
-    cleaned = data.replace("\n", ",")
-    return [int(x) for x in cleaned.split(",") if x.strip()]
-
-
-class Intcode:
-    def __init__(self, program: List[int]):
-        # Делаем большую "бесконечную" память
-        self.mem = program[:] + [0] * 20000
-        self.ip = 0
-        self.rb = 0
-        self.halted = False
-        self.inputs: List[int] = []
-
-    def add_input(self, v: int) -> None:
-        self.inputs.append(v)
-
-    def run(self) -> List[int]:
-        """
-        Запуск до полного завершения.
-        Возвращает список всех выводов (целые числа, в том числе ASCII-коды).
-        """
-        outputs: List[int] = []
-
-        while not self.halted:
-            op = self.mem[self.ip] % 100
-            m1 = (self.mem[self.ip] // 100) % 10
-            m2 = (self.mem[self.ip] // 1000) % 10
-            m3 = (self.mem[self.ip] // 10000) % 10
-
-            def get(i: int, m: int) -> int:
-                v = self.mem[self.ip + i]
-                if m == 0:
-                    return self.mem[v]
-                elif m == 1:
-                    return v
-                elif m == 2:
-                    return self.mem[self.rb + v]
-                else:
-                    raise ValueError("bad mode")
-
-            def addr(i: int, m: int) -> int:
-                v = self.mem[self.ip + i]
-                if m == 0:
-                    return v
-                elif m == 2:
-                    return self.rb + v
-                else:
-                    raise ValueError("bad mode for address")
-
-            if op == 99:
-                self.halted = True
-                break
-
-            elif op in (1, 2):  # add / mul
-                a = get(1, m1)
-                b = get(2, m2)
-                out = addr(3, m3)
-                self.mem[out] = a + b if op == 1 else a * b
-                self.ip += 4
-
-            elif op == 3:  # input
-                if not self.inputs:
-                    raise RuntimeError("input expected")
-                out = addr(1, m1)
-                self.mem[out] = self.inputs.pop(0)
-                self.ip += 2
-
-            elif op == 4:  # output
-                a = get(1, m1)
-                outputs.append(a)
-                self.ip += 2
-
-            elif op in (5, 6):  # jumps
-                a = get(1, m1)
-                b = get(2, m2)
-                if (op == 5 and a != 0) or (op == 6 and a == 0):
-                    self.ip = b
-                else:
-                    self.ip += 3
-
-            elif op == 7:  # less than
-                a = get(1, m1)
-                b = get(2, m2)
-                out = addr(3, m3)
-                self.mem[out] = 1 if a < b else 0
-                self.ip += 4
-
-            elif op == 8:  # equals
-                a = get(1, m1)
-                b = get(2, m2)
-                out = addr(3, m3)
-                self.mem[out] = 1 if a == b else 0
-                self.ip += 4
-
-            elif op == 9:  # adjust relative base
-                a = get(1, m1)
-                self.rb += a
-                self.ip += 2
-
-            else:
-                raise RuntimeError(f"Unknown opcode {op}")
-
-        return outputs
+from aoclib.intcode import Intcode, parse_program  # noqa: E402
 
 
 # ================== Общие вспомогательные функции ==================
@@ -313,8 +213,8 @@ def compress_route(route: List[str]) -> Tuple[str, str, str, str]:
 def solve_part1(data: str) -> str:
     program = parse_program(data)
     comp = Intcode(program)
-    outputs = comp.run()
-    grid = build_grid(outputs)
+    comp.run()
+    grid = build_grid(comp.take_outputs())
     answer = find_intersections(grid)
     return str(answer)
 
@@ -324,8 +224,8 @@ def solve_part2(data: str) -> str:
 
     # 1) Сначала строим карту (как в part1), чтобы получить маршрут
     comp_map = Intcode(program)
-    outputs = comp_map.run()
-    grid = build_grid(outputs)
+    comp_map.run()
+    grid = build_grid(comp_map.take_outputs())
 
     # 2) Строим полный маршрут L/R + шаги
     route = build_route(grid)
@@ -340,19 +240,16 @@ def solve_part2(data: str) -> str:
 
     # Кидаем строки по очереди + 'n' (видеопоток не нужен)
     full_input = main_str + a_str + b_str + c_str + "n\n"
-    for ch in full_input:
-        comp.add_input(ord(ch))
+    comp.add_ascii(full_input)
 
-    outputs2 = comp.run()
+    comp.run()
     # Последнее значение — ответ
-    return str(outputs2[-1])
+    return str(comp.outputs[-1])
 
 
 # ================== Шаблон запуска ==================
 
 if __name__ == "__main__":
-    from pathlib import Path
-
     here = Path(__file__).resolve().parent
     input_path = here / "input.txt"
     if input_path.exists():
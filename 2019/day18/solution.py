@@ -1,97 +1,114 @@
 from __future__ import annotations
-from typing import List, Tuple, Dict, Deque
-from collections import deque
-import heapq
+
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.pathfind import FlatGrid, dijkstra  # noqa: E402
+
+# Точки (старты роботов и ключи) нумеруются 0..31, по 5 бит на робота
+POINT_BITS = 5
+POINT_MASK = (1 << POINT_BITS) - 1
+
+
+def key_graph(grid: FlatGrid, sources: List[int]):
+    """
+    Граф "точка -> ближайшие ключи". Точки — сначала старты, затем ключи
+    по алфавиту. Для каждой точки BFS по карте находит ключи, до которых
+    можно дойти, не проходя через другой ключ (проход через ключ — это
+    два ребра подряд, и Дейкстра сама их сложит), вместе с маской дверей
+    на пути.
+
+    Возвращает (graph, key_bits, all_keys):
+      graph[p] = [(q, dist, doors_mask)], key_bits[p] — бит ключа точки
+      (0 у стартов), all_keys — маска всех ключей.
+    """
+    cells = grid.cells
+    passable = grid.open
+    steps = grid.steps
+    keys = sorted((ch, i) for i, ch in enumerate(cells) if "a" <= ch <= "z")
+    key_to_bit = {ch: 1 << n for n, (ch, _) in enumerate(keys)}
+    points = list(sources) + [i for _, i in keys]
+    point_of = {cell: p for p, cell in enumerate(points)}
+    key_bits = [0] * len(sources) + [key_to_bit[ch] for ch, _ in keys]
+
+    graph: List[List[Tuple[int, int, int]]] = []
+    for src in points:
+        edges = []
+        doors = {src: 0}  # клетка -> маска дверей на пути к ней
+        frontier = [src]
+        d = 0
+        while frontier:
+            d += 1
+            nxt = []
+            for cell in frontier:
+                mask = doors[cell]
+                for step in steps:
+                    v = cell + step
+                    if not passable[v] or v in doors:
+                        continue
+                    ch = cells[v]
+                    if "A" <= ch <= "Z":
+                        ndm = mask | key_to_bit.get(ch.lower(), 0)
+                    else:
+                        ndm = mask
+                    doors[v] = ndm
+                    if "a" <= ch <= "z":
+                        edges.append((point_of[v], d, ndm))
+                    else:
+                        nxt.append(v)
+            frontier = nxt
+        graph.append(edges)
+
+    all_keys = 0
+    for bit in key_bits:
+        all_keys |= bit
+    return graph, key_bits, all_keys
+
+
+def collect_keys(grid: FlatGrid, starts: List[int]) -> int:
+    """
+    Дейкстра по состояниям "позиции всех роботов + собранные ключи",
+    упакованным в одно число: mask << (5 * robots) | pos[0] | pos[1] << 5 | ...
+    """
+    graph, key_bits, all_keys = key_graph(grid, starts)
+    robots = len(starts)
+    shift = POINT_BITS * robots
+
+    def edges(state):
+        mask = state >> shift
+        positions = state & ~(-1 << shift)
+        result = []
+        for r in range(robots):
+            offset = POINT_BITS * r
+            here = positions >> offset & POINT_MASK
+            others = positions & ~(POINT_MASK << offset)
+            for nxt, dist, doors in graph[here]:
+                # Чтобы пройти, должны иметь ключи от всех дверей
+                if doors & ~mask:
+                    continue
+                nm = mask | key_bits[nxt]
+                result.append((nm << shift | others | nxt << offset, dist))
+        return result
+
+    start = 0
+    for r in range(robots):
+        start |= r << (POINT_BITS * r)
+    dist, found = dijkstra(edges, [start], goal=lambda state: state >> shift == all_keys)
+    return dist[found] if found is not None else 0
 
 
 def solve_part1(data: str) -> str:
-    grid = [list(line) for line in data.splitlines() if line.strip()]
-    h = len(grid)
-    w = len(grid[0])
-
-    # Находим старт и ключи
-    keys = {}
-    start = None
-    for y in range(h):
-        for x in range(w):
-            if grid[y][x] == '@':
-                start = (x, y)
-            if 'a' <= grid[y][x] <= 'z':
-                keys[grid[y][x]] = (x, y)
-
-    all_keys = ''.join(sorted(keys))
-    key_to_bit = {k: i for i, k in enumerate(all_keys)}
-    target_mask = (1 << len(all_keys)) - 1
-
-    # BFS между всеми важными точками
-    points = {'@': start}
-    points.update(keys)
-
-    # precomputed graph: name -> list[(target_key, dist, required_doors_mask)]
-    graph = {k: [] for k in points}
-
-    def bfs_from(label: str):
-        (sx, sy) = points[label]
-        dq = deque()
-        dq.append((sx, sy, 0, 0))  # x,y,dist, doors_mask
-        seen = {(sx, sy)}
-
-        while dq:
-            x, y, d, doors_mask = dq.popleft()
-
-            for dx, dy in ((1,0),(-1,0),(0,1),(0,-1)):
-                nx, ny = x+dx, y+dy
-                if not (0 <= nx < w and 0 <= ny < h):
-                    continue
-                if (nx, ny) in seen:
-                    continue
-                c = grid[ny][nx]
-                if c == '#':
-                    continue
-                ndm = doors_mask
-                if 'A' <= c <= 'Z':
-                    ndm |= 1 << key_to_bit[c.lower()]
-                seen.add((nx, ny))
-                if 'a' <= c <= 'z' and c != label:
-                    # нашли ключ
-                    graph[label].append((c, d+1, ndm))
-                dq.append((nx, ny, d+1, ndm))
-
-    for lbl in points:
-        bfs_from(lbl)
-
-    # Dijkstra: (dist, current_label, keys_mask)
-    pq = [(0, '@', 0)]
-    dist = {( '@', 0 ): 0}
-
-    while pq:
-        cur_d, cur_lbl, cur_mask = heapq.heappop(pq)
-        if cur_mask == target_mask:
-            return str(cur_d)
-        if dist.get((cur_lbl, cur_mask), 10**15) < cur_d:
-            continue
-
-        for nxt_lbl, ndist, doors_mask in graph[cur_lbl]:
-            # Чтобы пройти - должны иметь ключи от всех дверей
-            if (doors_mask & ~cur_mask) != 0:
-                continue
-            nm = cur_mask | (1 << key_to_bit[nxt_lbl])
-            nd = cur_d + ndist
-            if dist.get((nxt_lbl, nm), 10**15) > nd:
-                dist[(nxt_lbl, nm)] = nd
-                heapq.heappush(pq, (nd, nxt_lbl, nm))
-
-    return "0"
+    grid = FlatGrid.parse(data)
+    return str(collect_keys(grid, [grid.find("@")]))
 
 
 def solve_part2(data: str) -> str:
-    grid = [list(line) for line in data.splitlines() if line.strip()]
-    h = len(grid)
-    w = len(grid[0])
-
-    # Находим старт(ы) и ключи
-    starts = []
-    keys = {}
+    rows = [list(line) for line in data.splitlines() if line.strip()]
 
     # Модифицируем карту по правилам Part 2:
     # Заменяем '@' на:
@@ -99,97 +116,20 @@ def solve_part2(data: str) -> str:
     #   ###
     #   @#@
     # С четырьмя стартами
-    for y in range(h):
-        for x in range(w):
-            if grid[y][x] == '@':
-                sx, sy = x, y
-                grid[sy][sx] = '#'
-                for dx, dy in [(-1,0),(1,0),(0,-1),(0,1)]:
-                    grid[sy+dy][sx+dx] = '#'
-                starts = [
-                    (sx-1, sy-1),
-                    (sx+1, sy-1),
-                    (sx-1, sy+1),
-                    (sx+1, sy+1),
-                ]
-    # Собираем ключи
-    for y in range(h):
-        for x in range(w):
-            c = grid[y][x]
-            if 'a' <= c <= 'z':
-                keys[c] = (x,y)
-
-    all_keys = ''.join(sorted(keys))
-    key_to_bit = {k: i for i, k in enumerate(all_keys)}
-    target_mask = (1 << len(all_keys)) - 1
-
-    # Точки: 4 старта + ключи
-    points = {f'@{i}': pos for i,pos in enumerate(starts)}
-    points.update(keys)
-
-    graph = {k: [] for k in points}
-
-    # BFS для каждой точки
-    def bfs_from(label: str):
-        (sx, sy) = points[label]
-        dq = deque()
-        dq.append((sx, sy, 0, 0))
-        seen = {(sx, sy)}
-        while dq:
-            x,y,d,doors_mask = dq.popleft()
-            for dx,dy in ((1,0),(-1,0),(0,1),(0,-1)):
-                nx,ny = x+dx,y+dy
-                if not (0<=nx<w and 0<=ny<h): continue
-                if (nx,ny) in seen: continue
-                c = grid[ny][nx]
-                if c=='#': continue
-                ndm=doors_mask
-                if 'A'<=c<='Z':
-                    ndm |= 1<< key_to_bit[c.lower()]
-                seen.add((nx,ny))
-                if 'a'<=c<='z' and c!=label:
-                    graph[label].append((c, d+1, ndm))
-                dq.append((nx,ny,d+1,ndm))
-
-    for lbl in points:
-        bfs_from(lbl)
-
-    # Dijkstra: state = (positions_of_4, mask)
-    # positions_of_4 = tuple of 4 current labels (@0..@3 or keys)
-    start_state = (('@0','@1','@2','@3'), 0)
-    pq = [(0, start_state)]
-    dist = {start_state: 0}
-
-    while pq:
-        cur_d, (pos_tuple, cur_mask) = heapq.heappop(pq)
-        if cur_mask == target_mask:
-            return str(cur_d)
-        if dist.get((pos_tuple,cur_mask), 10**15) < cur_d:
-            continue
-
-        # выбираем одного из 4 роботов
-        for i in range(4):
-            cur_lbl = pos_tuple[i]
-            for nxt_lbl, ndist, doors_mask in graph[cur_lbl]:
-                if (doors_mask & ~cur_mask)!=0:
-                    continue
-                nm = cur_mask | (1<< key_to_bit[nxt_lbl])
-                new_positions = list(pos_tuple)
-                new_positions[i] = nxt_lbl
-                new_positions = tuple(new_positions)
-                nd = cur_d + ndist
-                if dist.get((new_positions,nm),10**15) > nd:
-                    dist[(new_positions,nm)] = nd
-                    heapq.heappush(pq, (nd, (new_positions,nm)))
+    sy = next(y for y, row in enumerate(rows) if "@" in row)
+    sx = rows[sy].index("@")
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            rows[sy + dy][sx + dx] = "#" if dx == 0 or dy == 0 else "@"
 
-    return "0"
+    grid = FlatGrid(["".join(row) for row in rows])
+    starts = [grid.index(sy + dy, sx + dx) for dy in (-1, 1) for dx in (-1, 1)]
+    return str(collect_keys(grid, starts))
 
 
 # ================== TEMPLATE ==================
 
 if __name__ == "__main__":
-    from pathlib import Path
-
     here = Path(__file__).resolve().parent
     input_path = here / "input.txt"
     if input_path.exists():
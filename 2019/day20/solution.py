@@ -1,7 +1,16 @@
 from __future__ import annotations
-from collections import deque, defaultdict
+
+import sys
+from collections import defaultdict
+from pathlib import Path
 from typing import Tuple, List, Dict
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.pathfind import INF, FlatGrid, bfs, dijkstra, grid_bfs  # noqa: E402
+
 
 def parse_map(data: str) -> Tuple[List[str], Dict[str, List[Tuple[int,int]]]]:
     grid = data.splitlines()
@@ -46,117 +55,100 @@ def parse_map(data: str) -> Tuple[List[str], Dict[str, List[Tuple[int,int]]]]:
     return grid, portals
 
 
-def solve_part1(data: str) -> str:
+def portal_graph(data: str):
+    """
+    Сжатый граф лабиринта: вершины — клетки у порталов (включая AA и ZZ).
+    walks[p] = [(q, шагов по карте)], jump[p] = (парная вершина, смена уровня):
+    +1 у внутреннего портала (спуск глубже), -1 у внешнего.
+    """
     grid, portals = parse_map(data)
     h = len(grid)
     w = len(grid[0])
-
-    start = portals["AA"][0]
-    end = portals["ZZ"][0]
-
-    # Создаём карту переходов портал -> портал
-    portal_edges = {}
+    flat = FlatGrid(grid, open_chars=".")
+
+    def is_outer(x, y):
+        return x < 3 or y < 3 or x > w-4 or y > h-4
+
+    nodes = []
+    names = []
+    for name, pts in sorted(portals.items()):
+        for x, y in pts:
+            nodes.append(flat.index(y, x))
+            names.append(name)
+    node_of = {cell: n for n, cell in enumerate(nodes)}
+
+    walks = []
+    for cell in nodes:
+        dist = grid_bfs(flat, [cell])
+        walks.append([(n, dist[other]) for n, other in enumerate(nodes)
+                      if other != cell and dist[other] != INF])
+
+    jump = [None] * len(nodes)
     for name, pts in portals.items():
         if len(pts) == 2:
-            portal_edges[pts[0]] = pts[1]
-            portal_edges[pts[1]] = pts[0]
-
-    # BFS по 2D-лабиринту
-    dq = deque()
-    dq.append((*start, 0))  # x, y, dist
-    seen = {start}
-
-    while dq:
-        x, y, d = dq.popleft()
-        if (x, y) == end:
-            return str(d)
-
-        for dx, dy in [(1,0),(-1,0),(0,1),(0,-1)]:
-            nx, ny = x+dx, y+dy
-            if 0 <= nx < w and 0 <= ny < h and grid[ny][nx] == '.' and (nx,ny) not in seen:
-                seen.add((nx,ny))
-                dq.append((nx,ny,d+1))
-
-        # переход через портал
-        if (x,y) in portal_edges:
-            nx, ny = portal_edges[(x,y)]
-            if (nx,ny) not in seen:
-                seen.add((nx,ny))
-                dq.append((nx,ny,d+1))
+            a, b = (node_of[flat.index(y, x)] for x, y in pts)
+            x1, y1 = pts[0]
+            if is_outer(x1, y1):
+                jump[a], jump[b] = (b, -1), (a, +1)
+            else:
+                jump[a], jump[b] = (b, +1), (a, -1)
 
-    return "0"
+    start = node_of[flat.index(portals["AA"][0][1], portals["AA"][0][0])]
+    end = node_of[flat.index(portals["ZZ"][0][1], portals["ZZ"][0][0])]
+    return walks, jump, start, end
 
 
-def solve_part2(data: str) -> str:
+def solve_part1(data: str) -> str:
     grid, portals = parse_map(data)
-    h = len(grid)
-    w = len(grid[0])
+    flat = FlatGrid(grid, open_chars=".")
+    passable = flat.open
+    steps = flat.steps
 
-    start = portals["AA"][0]
-    end = portals["ZZ"][0]
+    start = flat.index(portals["AA"][0][1], portals["AA"][0][0])
+    end = flat.index(portals["ZZ"][0][1], portals["ZZ"][0][0])
 
-    # Определяем, внутренний или внешний портал
+    # Создаём карту переходов портал -> портал
     portal_edges = {}
-    portal_type = {}  # pos -> +1 (inner) или -1 (outer)
-
     for name, pts in portals.items():
         if len(pts) == 2:
-            (x1, y1), (x2, y2) = pts
+            a, b = (flat.index(y, x) for x, y in pts)
+            portal_edges[a] = b
+            portal_edges[b] = a
 
-            # Определяем inner/outer по расположению
-            def is_outer(x, y):
-                return x < 3 or y < 3 or x > w-4 or y > h-4
+    # BFS по плоской карте, портал — ещё один сосед клетки
+    def neighbours(cell):
+        result = [cell + step for step in steps if passable[cell + step]]
+        if cell in portal_edges:
+            result.append(portal_edges[cell])
+        return result
 
-            if is_outer(x1,y1):
-                portal_type[(x1,y1)] = -1
-                portal_type[(x2,y2)] = +1
-            else:
-                portal_type[(x1,y1)] = +1
-                portal_type[(x2,y2)] = -1
-
-            portal_edges[(x1,y1)] = (x2,y2)
-            portal_edges[(x2,y2)] = (x1,y1)
-
-    # BFS: состояние (x, y, level)
-    dq = deque()
-    dq.append((*start, 0, 0))  # x,y,level,dist
-    seen = {(*start, 0)}
-
-    while dq:
-        x, y, lvl, d = dq.popleft()
-
-        # достижение ZZ возможно ТОЛЬКО на уровне 0
-        if lvl == 0 and (x, y) == end:
-            return str(d)
-
-        # обычные шаги
-        for dx, dy in [(1,0),(-1,0),(0,1),(0,-1)]:
-            nx, ny = x+dx, y+dy
-            if 0 <= nx < w and 0 <= ny < h and grid[ny][nx] == '.':
-                state = (nx, ny, lvl)
-                if state not in seen:
-                    seen.add(state)
-                    dq.append((nx, ny, lvl, d+1))
-
-        # переход через портал
-        if (x,y) in portal_edges:
-            ndir = portal_type[(x,y)]
-            nlvl = lvl + ndir
-            if nlvl >= 0:  # нельзя ниже нуля
-                nx, ny = portal_edges[(x,y)]
-                state = (nx, ny, nlvl)
-                if state not in seen:
-                    seen.add(state)
-                    dq.append((nx, ny, nlvl, d+1))
-
-    return "0"
+    dist, found = bfs(neighbours, [start], size=len(flat), goal=lambda cell: cell == end)
+    return str(dist[found]) if found is not None else "0"
+
+
+def solve_part2(data: str) -> str:
+    walks, jump, start, end = portal_graph(data)
+    n = len(walks)
+
+    # Состояние — level * n + вершина; уровни не ограничены, поэтому словарь
+    def edges(state):
+        level, node = divmod(state, n)
+        base = state - node
+        result = [(base + other, d) for other, d in walks[node]]
+        if jump[node] is not None:
+            other, delta = jump[node]
+            if level + delta >= 0:  # нельзя выше нуля
+                result.append((base + delta * n + other, 1))
+        return result
+
+    # достижение ZZ возможно ТОЛЬКО на уровне 0
+    dist, found = dijkstra(edges, [start], goal=lambda state: state == end)
+    return str(dist[found]) if found is not None else "0"
 
 
 # ================== TEMPLATE ==================
 
 if __name__ == "__main__":
-    from pathlib import Path
-
     here = Path(__file__).resolve().parent
     input_path = here / "input.txt"
     if input_path.exists():
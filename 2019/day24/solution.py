@@ -1,196 +1,94 @@
 from __future__ import annotations
-from typing import List, Dict
+
+import sys
+from pathlib import Path
+from typing import Dict
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.cellular import (  # noqa: E402
+    VON_NEUMANN,
+    Automaton,
+    BitGrid,
+    RecursiveLife,
+    life_rule,
+    popcount,
+)
+
+SIZE = 5
+
+# Жук выживает только с одним соседом, появляется — с одним или двумя
+BIRTH = {1, 2}
+SURVIVE = {1}
+
+GRID = BitGrid(SIZE, SIZE)
+ERIS = Automaton(GRID, life_rule(BIRTH, SURVIVE), VON_NEUMANN)
+PLUTONIAN = RecursiveLife(SIZE, BIRTH, SURVIVE)
+
+
+def parse_board(data: str) -> int:
+    """Поле 5x5 как битовая доска (см. aoclib/cellular.py)."""
+    _, (board,) = BitGrid.parse(data, "#")
+    return board
 
 
 # ==========================
 #   PART 1
 # ==========================
 
-def rating(grid: List[str]) -> int:
+def rating(board: int) -> int:
     """Считаем biodiversity rating."""
     r = 0
     p = 1
-    for y in range(5):
-        for x in range(5):
-            if grid[y][x] == '#':
+    for y in range(SIZE):
+        for x in range(SIZE):
+            if GRID.is_set(board, x, y):
                 r += p
             p <<= 1
     return r
 
 
-def neighbors_part1(grid: List[str], x: int, y: int) -> int:
-    """Счёт соседей-жуков для части 1."""
-    cnt = 0
-    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < 5 and 0 <= ny < 5 and grid[ny][nx] == '#':
-            cnt += 1
-    return cnt
-
-
-def step_part1(grid: List[str]) -> List[str]:
+def step_part1(board: int) -> int:
     """Один шаг клеточного автомата."""
-    new = []
-    for y in range(5):
-        row = []
-        for x in range(5):
-            c = grid[y][x]
-            n = neighbors_part1(grid, x, y)
-            if c == '#' and n != 1:
-                row.append('.')
-            elif c == '.' and (n == 1 or n == 2):
-                row.append('#')
-            else:
-                row.append(c)
-        new.append(''.join(row))
-    return new
+    (board,) = ERIS.step((board,))
+    return board
 
 
 def solve_part1(data: str) -> str:
-    grid = [line.strip() for line in data.splitlines() if line.strip()]
+    board = parse_board(data)
+    # доска однозначно задаёт раскладку, так что рейтинг считаем только в конце
     seen = set()
-    while True:
-        r = rating(grid)
-        if r in seen:
-            return str(r)
-        seen.add(r)
-        grid = step_part1(grid)
+    while board not in seen:
+        seen.add(board)
+        board = step_part1(board)
+    return str(rating(board))
 
 
 # ==========================
 #   PART 2  (recursive)
 # ==========================
 
-def empty_level() -> List[str]:
-    """Пустой уровень 5x5, с центральной ячейкой как '?'."""
-    return [".....", ".....", "..?..", ".....", "....."]
-
-
-def count_neighbors(levels: Dict[int, List[str]], z: int, x: int, y: int) -> int:
+def step_part2(levels: Dict[int, int]) -> Dict[int, int]:
     """
-    Соседи на рекурсивных уровнях согласно правилам AoC:
-    - (2,2) не существует — переход в уровень z+1
-    - внешние края — обращаются к уровню z-1
+    Один шаг рекурсивного автомата; levels — {глубина: доска},
+    z+1 — уровень внутри центральной клетки уровня z.
     """
-    cnt = 0
-    cur = levels.get(z, empty_level())
-
-    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-        nx, ny = x + dx, y + dy
-
-        # Вход во внутренний уровень (через центр)
-        if nx == 2 and ny == 2:
-            inner = levels.get(z + 1)
-            if not inner:
-                continue
-            # Мы двигаемся в сторону центра, значит в inner берём либо всю строку, либо весь столбец
-            if x == 1 and y == 2:
-                # слева от центра -> весь левый столбец inner
-                for iy in range(5):
-                    if inner[iy][0] == '#':
-                        cnt += 1
-            elif x == 3 and y == 2:
-                # справа от центра -> правый столбец inner
-                for iy in range(5):
-                    if inner[iy][4] == '#':
-                        cnt += 1
-            elif x == 2 and y == 1:
-                # сверху от центра -> верхняя строка inner
-                for ix in range(5):
-                    if inner[0][ix] == '#':
-                        cnt += 1
-            elif x == 2 and y == 3:
-                # снизу от центра -> нижняя строка inner
-                for ix in range(5):
-                    if inner[4][ix] == '#':
-                        cnt += 1
-
-        # Выход во внешний уровень
-        elif nx < 0:
-            outer = levels.get(z - 1)
-            if outer and outer[2][1] == '#':
-                cnt += 1
-        elif nx > 4:
-            outer = levels.get(z - 1)
-            if outer and outer[2][3] == '#':
-                cnt += 1
-        elif ny < 0:
-            outer = levels.get(z - 1)
-            if outer and outer[1][2] == '#':
-                cnt += 1
-        elif ny > 4:
-            outer = levels.get(z - 1)
-            if outer and outer[3][2] == '#':
-                cnt += 1
-
-        # Обычный сосед в том же уровне
-        else:
-            if cur[ny][nx] == '#':
-                cnt += 1
-
-    return cnt
-
-
-def step_part2(levels: Dict[int, List[str]]) -> Dict[int, List[str]]:
-    """Один шаг рекурсивного автомата."""
-    new_levels: Dict[int, List[str]] = {}
-
-    if not levels:
-        return {}
-
-    zs = list(levels.keys())
-    lo = min(zs) - 1
-    hi = max(zs) + 1
-
-    for z in range(lo, hi + 1):
-        cur = levels.get(z, empty_level())
-        new_level_rows: List[str] = []
-
-        for y in range(5):
-            row_chars: List[str] = []
-            for x in range(5):
-                if x == 2 and y == 2:
-                    row_chars.append('?')
-                    continue
-
-                c = cur[y][x]
-                n = count_neighbors(levels, z, x, y)
-
-                if c == '#' and n != 1:
-                    row_chars.append('.')
-                elif c == '.' and (n == 1 or n == 2):
-                    row_chars.append('#')
-                else:
-                    row_chars.append(c)
-
-            new_level_rows.append(''.join(row_chars))
-
-        # Записываем уровень только если там есть хотя бы один жук
-        if any('#' in row for row in new_level_rows):
-            new_levels[z] = new_level_rows
-
-    return new_levels
+    return PLUTONIAN.step(levels)
 
 
 def solve_part2(data: str) -> str:
-    # читаем начальную сетку
-    raw_grid = [line.strip() for line in data.splitlines() if line.strip()]
-    grid0 = [list(row) for row in raw_grid]
-    # центр превращаем в '?'
-    grid0[2][2] = '?'
-    grid0 = ["".join(row) for row in grid0]
+    # центральной клетки нет — на её месте вложенный уровень
+    board = parse_board(data) & PLUTONIAN.mask
 
-    levels: Dict[int, List[str]] = {0: grid0}
+    levels: Dict[int, int] = {0: board}
 
     # симулируем 200 минут
-    for _ in range(200):
-        levels = step_part2(levels)
+    levels = PLUTONIAN.run(levels, 200)
 
     # считаем жуков на всех уровнях
-    total_bugs = 0
-    for lvl in levels.values():
-        for row in lvl:
-            total_bugs += row.count('#')
+    total_bugs = sum(popcount(lvl) for lvl in levels.values())
 
     return str(total_bugs)
 
@@ -200,8 +98,6 @@ def solve_part2(data: str) -> str:
 # ==========================
 
 if __name__ == "__main__":
-    from pathlib import Path
-
     here = Path(__file__).resolve().parent
     input_path = here / "input.txt"
 
@@ -17,100 +17,14 @@ def solve_part2(data: str) -> str:
 
 # ----------- Интерактивная игра (запускать напрямую!) -----------
 
-from collections import deque
-
-def parse_program(text: str):
-    return [int(x) for x in text.replace("\n", ",").split(",") if x.strip()]
-
-
-class Intcode:
-    def __init__(self, code):
-        self.mem = {i: v for i, v in enumerate(code)}
-        self.ip = 0
-        self.rb = 0
-        self.inp = deque()
-        self.out = []
-        self.halted = False
-
-    def _get(self, i):
-        return self.mem.get(i, 0)
-
-    def _set(self, i, v):
-        self.mem[i] = v
-
-    def _addr(self, off, mode):
-        val = self._get(self.ip + off)
-        if mode == 0:
-            return val
-        elif mode == 2:
-            return self.rb + val
-        else:
-            raise ValueError("invalid address mode")
-
-    def _param(self, off, mode):
-        val = self._get(self.ip + off)
-        if mode == 0:
-            return self._get(val)
-        elif mode == 1:
-            return val
-        elif mode == 2:
-            return self._get(self.rb + val)
-        else:
-            raise ValueError("bad param mode")
-
-    def run_until_input(self):
-        while True:
-            op = self._get(self.ip)
-            opcode = op % 100
-            m1 = (op // 100) % 10
-            m2 = (op // 1000) % 10
-            m3 = (op // 10000) % 10
-
-            if opcode == 99:
-                self.halted = True
-                return
-
-            if opcode in (1, 2, 7, 8):
-                a = self._param(1, m1)
-                b = self._param(2, m2)
-                dst = self._addr(3, m3)
-                if opcode == 1:
-                    self._set(dst, a + b)
-                elif opcode == 2:
-                    self._set(dst, a * b)
-                elif opcode == 7:
-                    self._set(dst, 1 if a < b else 0)
-                elif opcode == 8:
-                    self._set(dst, 1 if a == b else 0)
-                self.ip += 4
-
-            elif opcode in (5, 6):
-                a = self._param(1, m1)
-                b = self._param(2, m2)
-                if (opcode == 5 and a != 0) or (opcode == 6 and a == 0):
-                    self.ip = b
-                else:
-                    self.ip += 3
-
-            elif opcode == 3:
-                if not self.inp:
-                    return  # ждём инпут пользователя
-                dst = self._addr(1, m1)
-                self._set(dst, self.inp.popleft())
-                self.ip += 2
-
-            elif opcode == 4:
-                a = self._param(1, m1)
-                self.out.append(a)
-                self.ip += 2
-
-            elif opcode == 9:
-                a = self._param(1, m1)
-                self.rb += a
-                self.ip += 2
-
-            else:
-                raise RuntimeError("bad opcode " + str(opcode))
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.intcode import Intcode, parse_program  # noqa: E402
 
 
 def print_ascii(out):
@@ -119,8 +33,6 @@ def print_ascii(out):
 
 
 if __name__ == "__main__":
-    from pathlib import Path
-
     path = Path(__file__).resolve().parent / ("input.txt")
     if not path.exists():
         print("input.txt отсутствует")
@@ -131,18 +43,14 @@ if __name__ == "__main__":
 
     # первая порция вывода
     comp.run_until_input()
-    print_ascii(comp.out)
-    comp.out.clear()
+    print_ascii(comp.take_outputs())
 
     while not comp.halted:
         cmd = input("\nCommand> ")
         if cmd.strip().lower() in ("exit", "quit"):
             break
 
-        for ch in cmd:
-            comp.inp.append(ord(ch))
-        comp.inp.append(ord("\n"))
+        comp.add_ascii(cmd + "\n")
 
         comp.run_until_input()
-        print_ascii(comp.out)
-        comp.out.clear()
+        print_ascii(comp.take_outputs())
@@ -1,110 +1,17 @@
 from __future__ import annotations
 
-from collections import deque
-from pathlib import Path
 import itertools
 import re
+import sys
+from collections import deque
+from pathlib import Path
 from typing import Dict, List, Tuple, Set, Optional
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
 
-# =========================
-#   Intcode-машина (твоя)
-# =========================
-
-class Intcode:
-    def __init__(self, code):
-        self.mem = {i: v for i, v in enumerate(code)}
-        self.ip = 0
-        self.rb = 0
-        self.inp = deque()
-        self.out: List[int] = []
-        self.halted = False
-
-    def _get(self, i):
-        return self.mem.get(i, 0)
-
-    def _set(self, i, v):
-        self.mem[i] = v
-
-    def _addr(self, off, mode):
-        val = self._get(self.ip + off)
-        if mode == 0:
-            return val
-        elif mode == 2:
-            return self.rb + val
-        else:
-            raise ValueError("invalid address mode")
-
-    def _param(self, off, mode):
-        val = self._get(self.ip + off)
-        if mode == 0:
-            return self._get(val)
-        elif mode == 1:
-            return val
-        elif mode == 2:
-            return self._get(self.rb + val)
-        else:
-            raise ValueError("bad param mode")
-
-    def run_until_input(self):
-        """
-        Крутит программу до тех пор, пока:
-        - не закончится (opcode 99), или
-        - не понадобится ввод (opcode 3 при пустом inp).
-        """
-        while True:
-            op = self._get(self.ip)
-            opcode = op % 100
-            m1 = (op // 100) % 10
-            m2 = (op // 1000) % 10
-            m3 = (op // 10000) % 10
-
-            if opcode == 99:
-                self.halted = True
-                return
-
-            if opcode in (1, 2, 7, 8):
-                a = self._param(1, m1)
-                b = self._param(2, m2)
-                dst = self._addr(3, m3)
-                if opcode == 1:
-                    self._set(dst, a + b)
-                elif opcode == 2:
-                    self._set(dst, a * b)
-                elif opcode == 7:
-                    self._set(dst, 1 if a < b else 0)
-                elif opcode == 8:
-                    self._set(dst, 1 if a == b else 0)
-                self.ip += 4
-
-            elif opcode in (5, 6):
-                a = self._param(1, m1)
-                b = self._param(2, m2)
-                if (opcode == 5 and a != 0) or (opcode == 6 and a == 0):
-                    self.ip = b
-                else:
-                    self.ip += 3
-
-            elif opcode == 3:
-                # Нужен ввод
-                if not self.inp:
-                    return
-                dst = self._addr(1, m1)
-                self._set(dst, self.inp.popleft())
-                self.ip += 2
-
-            elif opcode == 4:
-                a = self._param(1, m1)
-                self.out.append(a)
-                self.ip += 2
-
-            elif opcode == 9:
-                a = self._param(1, m1)
-                self.rb += a
-                self.ip += 2
-
-            else:
-                raise RuntimeError("bad opcode " + str(opcode))
+from aoclib.intcode import Intcode, parse_program  # noqa: E402
 
 
 # =========================
@@ -128,11 +35,8 @@ OPPOSITE = {
 
 
 def flush_output(comp: Intcode) -> str:
-    """Считать и очистить всё, что накопилось в comp.out, вернуть как строку."""
-    chars: List[str] = []
-    while comp.out:
-        chars.append(chr(comp.out.pop(0)))
-    return "".join(chars)
+    """Считать и очистить всё, что накопилось в comp.outputs, вернуть как строку."""
+    return "".join(map(chr, comp.take_outputs()))
 
 
 def read_room(comp: Intcode) -> str:
@@ -143,9 +47,8 @@ def read_room(comp: Intcode) -> str:
 
 def send_command(comp: Intcode, cmd: str) -> str:
     """Отправить одну команду и вернуть текст, появившийся после неё."""
-    for ch in cmd + "\n":
-        comp.inp.append(ord(ch))
-        comp.run_until_input()
+    comp.add_ascii(cmd + "\n")
+    comp.run_until_input()
     return flush_output(comp)
 
 
@@ -192,7 +95,7 @@ def parse_room(text: str):
 
 
 # =========================
-#   Обход карты (DFS)
+#   Обход карты (BFS с ветвлением машины)
 # =========================
 
 def explore_map(program: List[int]):
@@ -200,6 +103,10 @@ def explore_map(program: List[int]):
     Запускает дроида, полностью обходит карту, строит граф комнат и
     собирает список предметов (не забирая их).
 
+    Вместо одного дроида, который ходит туда-обратно, на каждую дверь
+    ответвляется копия машины (Intcode.fork): в очереди BFS лежит
+    дроид, уже стоящий в своей комнате, и возвращаться назад не нужно.
+
     Возвращает:
       graph: room -> list[(direction, neighbor_room)]
       items_by_room: room -> list[safe_item]
@@ -207,7 +114,7 @@ def explore_map(program: List[int]):
       checkpoint_room: str
       pressure_room: str
     """
-    comp = Intcode(program[:])
+    comp = Intcode(program)
 
     # стартовая комната
     text = read_room(comp)
@@ -217,43 +124,38 @@ def explore_map(program: List[int]):
 
     graph: Dict[str, List[Tuple[str, str]]] = {}
     items_by_room: Dict[str, List[str]] = {}
-    visited: Set[str] = set()
     checkpoint_room: Optional[str] = None
     pressure_room: Optional[str] = None
 
-    def dfs(curr_name: str, curr_doors: List[str], curr_items: List[str]):
-        nonlocal checkpoint_room, pressure_room
-
-        if curr_name in visited:
-            return
-        visited.add(curr_name)
+    visited: Set[str] = {room_name}
+    queue = deque([(room_name, doors, items, comp)])
 
-        safe_items = [it for it in curr_items if it not in FORBIDDEN_ITEMS]
-        items_by_room[curr_name] = safe_items
+    while queue:
+        curr_name, curr_doors, curr_items, curr_comp = queue.popleft()
 
-        if curr_name == "== Security Checkpoint ==" and checkpoint_room is None:
+        items_by_room[curr_name] = [it for it in curr_items if it not in FORBIDDEN_ITEMS]
+        if curr_name == "== Security Checkpoint ==":
             checkpoint_room = curr_name
-        if curr_name == "== Pressure-Sensitive Floor ==" and pressure_room is None:
-            pressure_room = curr_name
 
         for d in curr_doors:
-            # шаг в соседнюю комнату
-            text2 = send_command(comp, d)
-            next_name, next_doors, next_items = parse_room(text2)
+            # шаг в соседнюю комнату — на своей ветке машины
+            child = curr_comp.fork()
+            next_name, next_doors, next_items = parse_room(send_command(child, d))
             if next_name is None:
-                # что-то странное, откатываемся
-                send_command(comp, OPPOSITE[d])
                 continue
 
             graph.setdefault(curr_name, []).append((d, next_name))
             graph.setdefault(next_name, []).append((OPPOSITE[d], curr_name))
 
-            dfs(next_name, next_doors, next_items)
-
-            # возвращаемся назад
-            send_command(comp, OPPOSITE[d])
+            if next_name in visited:
+                continue
+            visited.add(next_name)
 
-    dfs(room_name, doors, items)
+            if next_name == "== Pressure-Sensitive Floor ==":
+                # плита выкидывает дроида обратно — дальше отсюда не идём
+                pressure_room = next_name
+                continue
+            queue.append((next_name, next_doors, next_items, child))
 
     if checkpoint_room is None:
         raise RuntimeError("Не найден Security Checkpoint")
@@ -363,45 +265,6 @@ def build_collection_route(
     return route, full_inv
 
 
-# =========================
-#   Запуск сценария (отдельный)
-# =========================
-
-def run_script(program: List[int], commands: List[str]) -> str:
-    """
-    Запускает инткод с нуля и проигрывает список команд,
-    возвращает весь ASCII-вывод.
-    """
-    comp = Intcode(program[:])
-    out_chars: List[str] = []
-
-    def flush():
-        while comp.out:
-            out_chars.append(chr(comp.out.pop(0)))
-
-    # стартовый вывод
-    comp.run_until_input()
-    flush()
-
-    # команды
-    for cmd in commands:
-        for ch in cmd + "\n":
-            comp.inp.append(ord(ch))
-            comp.run_until_input()
-            flush()
-            if comp.halted:
-                return "".join(out_chars)
-
-    # дочитываем хвост
-    while not comp.halted:
-        comp.run_until_input()
-        flush()
-        if not comp.inp:
-            break
-
-    return "".join(out_chars)
-
-
 # =========================
 #   Поиск пароля (брутфорс)
 # =========================
@@ -433,6 +296,14 @@ def find_password(program: List[int]) -> int:
 
     print("Направление к плите из чекпоинта:", plate_dir)
 
+    # Проходим маршрут один раз и запоминаем состояние у чекпоинта:
+    # каждая попытка стартует из этого снимка, а не проигрывает маршрут заново.
+    comp = Intcode(program)
+    read_room(comp)
+    for cmd in route:
+        send_command(comp, cmd)
+    at_checkpoint = comp.snapshot()
+
     print("\n▶ Начинаем перебор комбинаций...\n")
     total = 0
     for r in range(0, len(inventory) + 1):
@@ -443,13 +314,10 @@ def find_password(program: List[int]) -> int:
             print("🔹 Оставляем:", keep)
             print("🔸 Выбрасываем:", list(drop_set))
 
-            cmds = list(route)
+            attempt = Intcode.from_snapshot(at_checkpoint)
             for item in drop_set:
-                cmds.append(f"drop {item}")
-            cmds.append("inv")
-            cmds.append(plate_dir)
-
-            out = run_script(program, cmds)
+                send_command(attempt, f"drop {item}")
+            out = send_command(attempt, plate_dir)
             last_lines = out.strip().splitlines()[-6:]
             print("Ответ плиты / финальный вывод:")
             for L in last_lines:
@@ -469,10 +337,6 @@ def find_password(program: List[int]) -> int:
 #   Обёртки под AdventToCode
 # =========================
 
-def parse_program(text: str) -> List[int]:
-    return [int(x) for x in text.replace("\n", ",").split(",") if x.strip()]
-
-
 def solve_part1(data: str) -> str:
     data = data.strip()
     if not data:
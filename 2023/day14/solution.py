@@ -1,5 +1,12 @@
+import sys
 from pathlib import Path
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.cycles import fast_forward  # noqa: E402
+
 
 def parse(data: str):
     return [list(line) for line in data.splitlines() if line.strip()]
@@ -20,51 +27,6 @@ def tilt_north(grid):
                 write_row += 1
 
 
-def tilt_south(grid):
-    R = len(grid)
-    C = len(grid[0])
-    for col in range(C):
-        write_row = R - 1
-        for row in range(R - 1, -1, -1):
-            if grid[row][col] == "#":
-                write_row = row - 1
-            elif grid[row][col] == "O":
-                if write_row != row:
-                    grid[write_row][col] = "O"
-                    grid[row][col] = "."
-                write_row -= 1
-
-
-def tilt_west(grid):
-    R = len(grid)
-    C = len(grid[0])
-    for row in range(R):
-        write_col = 0
-        for col in range(C):
-            if grid[row][col] == "#":
-                write_col = col + 1
-            elif grid[row][col] == "O":
-                if write_col != col:
-                    grid[row][write_col] = "O"
-                    grid[row][col] = "."
-                write_col += 1
-
-
-def tilt_east(grid):
-    R = len(grid)
-    C = len(grid[0])
-    for row in range(R):
-        write_col = C - 1
-        for col in range(C - 1, -1, -1):
-            if grid[row][col] == "#":
-                write_col = col - 1
-            elif grid[row][col] == "O":
-                if write_col != col:
-                    grid[row][write_col] = "O"
-                    grid[row][col] = "."
-                write_col -= 1
-
-
 def calc_load(grid):
     R = len(grid)
     total = 0
@@ -75,15 +37,105 @@ def calc_load(grid):
     return total
 
 
-def grid_to_tuple(grid):
-    return tuple("".join(row) for row in grid)
+# ---------- Part 2: камни как счётчики по отрезкам ----------
+#
+# После наклона на север все круглые камни лежат "стопками" у верхних
+# концов отрезков между '#'. Значит, состояние после наклона целиком
+# задаётся числом камней в каждом отрезке, а следующий наклон — это
+# раскидать верхние k клеток каждого отрезка по отрезкам нового
+# направления. Работа за наклон пропорциональна числу камней, а состояние
+# после целого цикла — кортеж счётчиков по отрезкам "восток".
 
+# Наклоны цикла: (dr, dc) направления, куда катятся камни
+CYCLE_DIRS = ((-1, 0), (0, -1), (1, 0), (0, 1))  # север, запад, юг, восток
 
-def cycle(grid):
-    tilt_north(grid)
-    tilt_west(grid)
-    tilt_south(grid)
-    tilt_east(grid)
+
+def build_segments(grid, dr, dc):
+    """
+    Отрезки между '#' для наклона в сторону (dr, dc).
+    Возвращает (segments, segment_of): клетки каждого отрезка начиная
+    с того конца, куда катятся камни, и номер отрезка для каждой клетки.
+    """
+    R = len(grid)
+    C = len(grid[0])
+    segments = []
+    segment_of = {}
+    if dr:
+        lines = [[(r, c) for r in range(R)] for c in range(C)]
+    else:
+        lines = [[(r, c) for c in range(C)] for r in range(R)]
+    for line in lines:
+        if dr > 0 or dc > 0:
+            line.reverse()
+        run = []
+        for cell in line + [None]:
+            if cell is None or grid[cell[0]][cell[1]] == "#":
+                if run:
+                    for member in run:
+                        segment_of[member] = len(segments)
+                    segments.append(run)
+                run = []
+            else:
+                run.append(cell)
+    return segments, segment_of
+
+
+class SpinCycle:
+    """
+    Счётчики — обычные int, так что в отрезке может быть сколько угодно
+    камней, например в столбце выше 255 клеток:
+
+    >>> grid = parse("O\\n" * 300)
+    >>> spin = SpinCycle(grid)
+    >>> spin.load(spin.first_cycle(grid))
+    45150
+    """
+
+    def __init__(self, grid):
+        self.rows = len(grid)
+        tilts = [build_segments(grid, dr, dc) for dr, dc in CYCLE_DIRS]
+        self.north_segments = tilts[0][0]
+        # targets[i][s] — номера отрезков наклона i + 1 для клеток отрезка s
+        # наклона i, в порядке от "стопки" к свободному концу
+        self.targets = []
+        for i in range(4):
+            segments = tilts[i][0]
+            next_of = tilts[(i + 1) % 4][1]
+            self.targets.append([[next_of[cell] for cell in seg] for seg in segments])
+        self.counts = [len(t[0]) for t in tilts]
+        # После наклона на восток отрезок — часть строки
+        self.east_load = [self.rows - seg[0][0] for seg in tilts[3][0]]
+
+    def north_counts(self, grid) -> tuple:
+        return tuple(
+            sum(1 for r, c in seg if grid[r][c] == "O") for seg in self.north_segments
+        )
+
+    def _move(self, counts: tuple, i: int) -> tuple:
+        """Счётчики после наклона i -> счётчики после наклона i + 1."""
+        new = [0] * self.counts[(i + 1) % 4]
+        targets = self.targets[i]
+        for seg, k in enumerate(counts):
+            if k:
+                for t in targets[seg][:k]:
+                    new[t] += 1
+        return tuple(new)
+
+    def step(self, east: tuple) -> tuple:
+        """Целый цикл: восток -> север -> запад -> юг -> восток."""
+        counts = self._move(east, 3)
+        for i in range(3):
+            counts = self._move(counts, i)
+        return counts
+
+    def first_cycle(self, grid) -> tuple:
+        counts = self.north_counts(grid)
+        for i in range(3):
+            counts = self._move(counts, i)
+        return counts
+
+    def load(self, east: tuple) -> int:
+        return sum(k * load for k, load in zip(east, self.east_load))
 
 
 def solve_part1(data: str) -> str:
@@ -94,35 +146,12 @@ def solve_part1(data: str) -> str:
 
 def solve_part2(data: str) -> str:
     grid = parse(data)
-
-    seen = {}  # state → cycle_index
-    states = []  # список состояний по порядку
-
-    i = 0
+    spin = SpinCycle(grid)
     target = 1_000_000_000
 
-    while True:
-        k = grid_to_tuple(grid)
-        if k in seen:
-            # нашли цикл
-            cycle_start = seen[k]
-            cycle_length = i - cycle_start
-            break
-
-        seen[k] = i
-        states.append(k)
-
-        # выполняем один цикл
-        cycle(grid)
-        i += 1
-
-    # сколько осталось пройти после перехода в цикл
-    remaining = (target - cycle_start) % cycle_length
-    final_state = states[cycle_start + remaining]
-
-    # Превращаем обратно в grid и считаем нагрузку
-    grid = [list(row) for row in final_state]
-    return str(calc_load(grid))
+    # Состояние после цикла — кортеж счётчиков, он же ключ для поиска периода
+    state = fast_forward(spin.first_cycle(grid), spin.step, target - 1)
+    return str(spin.load(state))
 
 
 if __name__ == "__main__":
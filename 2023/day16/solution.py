@@ -88,25 +88,155 @@ def simulate_beam(grid, n, m, start_r, start_c, start_dir):
     return len(energized)
 
 
+# ---------- граф отрезков луча (для части 2) ----------
+#
+# Зеркала и "проход вдоль" сплиттера луч не ветвят, так что весь путь между
+# двумя раздваивающими сплиттерами — один отрезок. Вершины графа —
+# сплиттеры (раздвоившийся луч дальше не зависит от того, с какой стороны
+# он пришёл), рёбра — отрезки до следующего раздваивающего сплиттера.
+# Заряженные клетки — int-битсет по индексам r * m + c.
+
+# 0 — вверх, 1 — вправо, 2 — вниз, 3 — влево
+DR = (-1, 0, 1, 0)
+DC = (0, 1, 0, -1)
+SPLITS = {"|": (0, 2), "-": (1, 3)}
+
+
+class BeamGraph:
+    def __init__(self, grid, n, m):
+        self.grid = grid
+        self.n = n
+        self.m = m
+        self.node_of = {}
+        for r in range(n):
+            for c in range(m):
+                if grid[r][c] in SPLITS:
+                    self.node_of[(r, c)] = len(self.node_of)
+        self.energy = self._node_energy()
+
+    def trace(self, r, c, d):
+        """
+        Луч входит в клетку (r, c), двигаясь в направлении d.
+        Возвращает (битсет клеток до остановки, сплиттер-вершина или None).
+        """
+        grid, n, m = self.grid, self.n, self.m
+        bits = 0
+        turns = set()  # (клетка, направление) на поворотах — ловим петли из зеркал
+        while 0 <= r < n and 0 <= c < m:
+            tile = grid[r][c]
+            if tile in SPLITS and d not in SPLITS[tile]:
+                return bits, self.node_of[(r, c)]
+            bits |= 1 << (r * m + c)
+            if tile == "/" or tile == "\\":
+                if (r, c, d) in turns:
+                    break
+                turns.add((r, c, d))
+                d = d ^ 1 if tile == "/" else 3 - d
+            r += DR[d]
+            c += DC[d]
+        return bits, None
+
+    def _node_energy(self):
+        """
+        Битсет заряженных клеток для луча, раздвоившегося в каждом сплиттере.
+        Граф может содержать циклы, поэтому считаем по компонентам сильной
+        связности (Тарьян): у всех вершин компоненты ответ общий, а компоненты
+        выходят из алгоритма в обратном топологическом порядке — к моменту
+        обработки компоненты ответы всех её потомков уже готовы.
+        """
+        m = self.m
+        local = []
+        succ = []
+        for (r, c), node in self.node_of.items():
+            bits = 1 << (r * m + c)
+            nxt = []
+            for d in SPLITS[self.grid[r][c]]:
+                seg, target = self.trace(r + DR[d], c + DC[d], d)
+                bits |= seg
+                if target is not None:
+                    nxt.append(target)
+            local.append(bits)
+            succ.append(nxt)
+
+        count = len(local)
+        index = [-1] * count
+        low = [0] * count
+        on_stack = [False] * count
+        comp = [-1] * count
+        comp_energy = []
+        stack = []
+        counter = 0
+
+        for root in range(count):
+            if index[root] >= 0:
+                continue
+            work = [(root, 0)]
+            while work:
+                v, i = work.pop()
+                if i == 0:
+                    index[v] = low[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack[v] = True
+                if i < len(succ[v]):
+                    work.append((v, i + 1))
+                    w = succ[v][i]
+                    if index[w] < 0:
+                        work.append((w, 0))
+                    elif on_stack[w]:
+                        low[v] = min(low[v], index[w])
+                    continue
+                if low[v] == index[v]:
+                    members = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        comp[w] = len(comp_energy)
+                        members.append(w)
+                        if w == v:
+                            break
+                    bits = 0
+                    for w in members:
+                        bits |= local[w]
+                        for x in succ[w]:
+                            if comp[x] != comp[v]:
+                                bits |= comp_energy[comp[x]]
+                    comp_energy.append(bits)
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[v])
+
+        return [comp_energy[comp[v]] for v in range(count)]
+
+    def energized(self, r, c, d):
+        """Число заряженных клеток для луча, входящего в (r, c) в направлении d."""
+        bits, node = self.trace(r, c, d)
+        if node is not None:
+            bits |= self.energy[node]
+        return bin(bits).count("1")
+
+
 def solve_part1(data: str) -> str:
     grid, n, m = parse_input(data)
+    # Один луч — граф строить невыгодно, хватает прямой симуляции
     result = simulate_beam(grid, n, m, 0, -1, RIGHT)  # старт за пределами (0,-1) → вход в (0,0)
     return str(result)
 
 
 def solve_part2(data: str) -> str:
+    # Граф отрезков строится один раз, после чего каждый из 4 * n запусков —
+    # это один отрезок от края до первого сплиттера и одно OR битсетов
     grid, n, m = parse_input(data)
+    beams = BeamGraph(grid, n, m)
     best = 0
 
     # Запуски с левой и правой границы
     for r in range(n):
-        best = max(best, simulate_beam(grid, n, m, r, -1, RIGHT))
-        best = max(best, simulate_beam(grid, n, m, r, m, LEFT))
+        best = max(best, beams.energized(r, 0, 1), beams.energized(r, m - 1, 3))
 
     # Запуски с верхней и нижней границы
     for c in range(m):
-        best = max(best, simulate_beam(grid, n, m, -1, c, DOWN))
-        best = max(best, simulate_beam(grid, n, m, n, c, UP))
+        best = max(best, beams.energized(0, c, 2), beams.energized(n - 1, c, 0))
 
     return str(best)
 
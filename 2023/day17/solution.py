@@ -1,13 +1,11 @@
+import sys
 from pathlib import Path
-import heapq
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
 
-DIRS = [
-    (0, 1),   # 0: right
-    (1, 0),   # 1: down
-    (0, -1),  # 2: left
-    (-1, 0),  # 3: up
-]
+from aoclib.pathfind import INF, FlatGrid, dial  # noqa: E402
 
 
 def parse_grid(data: str):
@@ -30,69 +28,47 @@ def dijkstra_with_constraints(grid, rows, cols, min_turn_run, max_run, require_m
     require_min_run_on_stop:
         - нужно ли, чтобы при финише последний прямой сегмент был >= min_turn_run
           (False для part1, True для part2).
+
+    Состояние — cell * 2 + axis: клетка плоской карты и ось, вдоль которой
+    тигель только что проехал (0 — по горизонтали, 1 — по вертикали).
+    Ребро — поворот и сразу весь прямой участок длиной min_turn_run..max_run,
+    поэтому длина участка в состоянии не нужна. Без require_min_run_on_stop
+    последний участок может быть и короче — если он кончается в финише.
+    Веса не больше 9 * max_run — очередь-корзины вместо кучи.
     """
-    end_r, end_c = rows - 1, cols - 1
-
-    # dist[(r, c, dir, run)] = минимальная стоимость
-    dist = {}
-
-    heap = []
-
-    # Стартуем из (0,0), делаем первый шаг вправо и вниз (остальные движения заведомо хуже).
-    start_r, start_c = 0, 0
-    for dir_idx in (0, 1):  # right, down
-        dr, dc = DIRS[dir_idx]
-        nr, nc = start_r + dr, start_c + dc
-        if 0 <= nr < rows and 0 <= nc < cols:
-            cost = grid[nr][nc]
-            state = (nr, nc, dir_idx, 1)
-            dist[state] = cost
-            heapq.heappush(heap, (cost, nr, nc, dir_idx, 1))
-
-    INF = 10**18
-    best_answer = INF
-
-    while heap:
-        cost, r, c, dir_idx, run = heapq.heappop(heap)
-
-        # Если это состояние хуже уже найденного — пропускаем
-        if dist.get((r, c, dir_idx, run), INF) < cost:
-            continue
-
-        # Проверка финиша
-        if r == end_r and c == end_c:
-            if not require_min_run_on_stop or run >= min_turn_run:
-                best_answer = cost
-                break
-
-        for ndir in range(4):
-            # Нельзя разворачиваться на 180°
-            if ndir == (dir_idx + 2) % 4:
-                continue
-
-            dr, dc = DIRS[ndir]
-            nr, nc = r + dr, c + dc
-            if not (0 <= nr < rows and 0 <= nc < cols):
-                continue
-
-            if ndir == dir_idx:
-                # продолжаем прямо
-                if run >= max_run:
-                    continue
-                nrun = run + 1
-            else:
-                # поворачиваем, проверяем минимальную длину предыдущего сегмента
-                if run < min_turn_run:
-                    continue
-                nrun = 1
-
-            new_cost = cost + grid[nr][nc]
-            state = (nr, nc, ndir, nrun)
-            if new_cost < dist.get(state, INF):
-                dist[state] = new_cost
-                heapq.heappush(heap, (new_cost, nr, nc, ndir, nrun))
-
-    return best_answer
+    # Рамка из стены вокруг поля, клетки — цифры потерь тепла
+    flat = FlatGrid(["".join(map(str, row)) for row in grid])
+    heat = [int(ch) if ch.isdigit() else 0 for ch in flat.cells]
+    passable = flat.open
+    steps = flat.steps
+    start = flat.index(0, 0)
+    end = flat.index(rows - 1, cols - 1)
+
+    def edges(state):
+        u, axis = divmod(state, 2)
+        turned = 1 - axis
+        result = []
+        for step in (steps[turned], steps[turned + 2]):
+            v = u
+            loss = 0
+            for run in range(1, max_run + 1):
+                v += step
+                if not passable[v]:
+                    break
+                loss += heat[v]
+                if run >= min_turn_run or (v == end and not require_min_run_on_stop):
+                    result.append((v * 2 + turned, loss))
+        return result
+
+    # На старте можно поехать и вправо, и вниз
+    dist, found = dial(
+        edges,
+        (start * 2, start * 2 + 1),
+        max_weight=9 * max_run,
+        size=len(flat) * 2,
+        goal=lambda state: state >> 1 == end,
+    )
+    return dist[found] if found is not None else INF
 
 
 def solve_part1(data: str) -> str:
@@ -1,8 +1,12 @@
 from pathlib import Path
-from collections import deque
+from typing import Dict, List, Tuple
 
 DIRS = [(1,0), (-1,0), (0,1), (0,-1)]
 DIR_CH = {(1,0):"v", (-1,0):"^", (0,1):">", (0,-1):"<"}
+SLOPES = set(DIR_CH.values())
+
+# Граф перекрёстков: вершины 0..n-1, adj[v] = [(u, длина коридора)]
+Graph = List[List[Tuple[int, int]]]
 
 
 def parse(data: str):
@@ -12,55 +16,6 @@ def parse(data: str):
     return grid, R, C
 
 
-# ---------------------------------------------------------
-# PART 1 — учитываем склоны
-# ---------------------------------------------------------
-def solve_part1(data: str) -> str:
-    grid, R, C = parse(data)
-
-    # старт = первая '.' в первой строке
-    start = (0, grid[0].index('.'))
-    # финиш = первая '.' в последней строке
-    goal = (R - 1, grid[-1].index('.'))
-
-    best = 0
-    stack = [(start[0], start[1], 0, set([start]))]
-
-    while stack:
-        r, c, dist, used = stack.pop()
-
-        if (r, c) == goal:
-            if dist > best:
-                best = dist
-            continue
-
-        for dr, dc in DIRS:
-            nr, nc = r + dr, c + dc
-
-            if not (0 <= nr < R and 0 <= nc < C):
-                continue
-            ch = grid[nr][nc]
-            if ch == "#":
-                continue
-
-            # проверка уклона
-            if ch in DIR_CH.values():
-                # slope points away: must match movement direction
-                if DIR_CH[(dr, dc)] != ch:
-                    continue
-
-            if (nr, nc) in used:
-                continue
-
-            stack.append((nr, nc, dist + 1, used | {(nr, nc)}))
-
-    return str(best)
-
-
-# ---------------------------------------------------------
-# PART 2 — игнорируем склоны, строим граф перекрёстков
-# ---------------------------------------------------------
-
 def neighbors_no_slopes(grid, R, C, r, c):
     out = []
     for dr, dc in DIRS:
@@ -70,14 +25,19 @@ def neighbors_no_slopes(grid, R, C, r, c):
     return out
 
 
-def compress_graph(grid, R, C, start, goal):
+def compress_graph(grid, R, C, start, goal, slopes: bool):
     """
     Строим граф:
     - junctions = перекрёстки (≥3 соседей), плюс start/goal.
     - между ними прокладываем целые коридоры (без разветвлений).
+    - slopes=True: по склону можно идти только вниз по нему, так что
+      коридор, в котором встречается встречный склон, ребра не даёт.
+
+    Возвращает (junctions, adj): junctions — координаты вершин,
+    отсортированные по строкам (номер вершины — индекс в списке).
     """
     # 1. Найдём все важные узлы
-    junctions = set([start, goal])
+    junctions = {start, goal}
     for r in range(R):
         for c in range(C):
             if grid[r][c] == "#":
@@ -86,49 +46,52 @@ def compress_graph(grid, R, C, start, goal):
             if len(nbrs) >= 3:
                 junctions.add((r, c))
 
-    # 2. Для каждого узла строим связи
-    graph = {j: {} for j in junctions}
+    order = sorted(junctions)
+    index: Dict[Tuple[int, int], int] = {cell: i for i, cell in enumerate(order)}
+    adj: Graph = [[] for _ in order]
 
-    for jr, jc in junctions:
-        for (dr, dc) in DIRS:
-            # идём по коридору в направлении (dr,dc)
+    # 2. Для каждого узла идём по коридорам до следующего узла
+    for jr, jc in order:
+        for dr, dc in DIRS:
             r, c = jr + dr, jc + dc
             if not (0 <= r < R and 0 <= c < C) or grid[r][c] == "#":
                 continue
 
             dist = 1
             pr, pc = jr, jc
-            cr, cc = r, c
-
-            # идём пока не встретим другой узел
-            while True:
-                if (cr, cc) in junctions:
-                    graph[(jr, jc)][(cr, cc)] = dist
+            ok = True
+            while (r, c) not in index:
+                # проверка уклона: шаг в клетку (r, c) был сделан из (pr, pc)
+                ch = grid[r][c]
+                if slopes and ch in SLOPES and DIR_CH[(r - pr, c - pc)] != ch:
+                    ok = False
                     break
-
-                # проверяем, что это коридор (ровно 2 соседа)
-                nbrs = neighbors_no_slopes(grid, R, C, cr, cc)
-                if len(nbrs) != 2:
-                    # значит, это тоже junction (случайно пропущенный)
-                    junctions.add((cr, cc))
-                    graph.setdefault((cr, cc), {})
-                    graph[(jr, jc)][(cr, cc)] = dist
+                nbrs = [cell for cell in neighbors_no_slopes(grid, R, C, r, c)
+                        if cell != (pr, pc)]
+                if not nbrs:
+                    ok = False  # тупик
                     break
+                pr, pc = r, c
+                r, c = nbrs[0]
+                dist += 1
+            else:
+                ch = grid[r][c]
+                if slopes and ch in SLOPES and DIR_CH[(r - pr, c - pc)] != ch:
+                    ok = False
+            if ok:
+                adj[index[(jr, jc)]].append((index[(r, c)], dist))
 
-                # продолжаем по коридору: в соседе, который не parent
-                for nr, nc in nbrs:
-                    if (nr, nc) != (pr, pc):
-                        pr, pc = cr, cc
-                        cr, cc = nr, nc
-                        dist += 1
-                        break
+    return order, adj
 
-    return graph
 
+# ---------------------------------------------------------
+# PART 1 — учитываем склоны
+# ---------------------------------------------------------
 
-def dfs_longest(graph, start, goal):
-    best = 0
-    stack = [(start, 0, set([start]))]
+def dfs_longest(adj: Graph, start: int, goal: int) -> int:
+    """Перебор всех простых путей; посещённые вершины — битовая маска."""
+    best = -1
+    stack = [(start, 0, 1 << start)]
 
     while stack:
         node, dist, used = stack.pop()
@@ -136,9 +99,127 @@ def dfs_longest(graph, start, goal):
             best = max(best, dist)
             continue
 
-        for nxt, w in graph[node].items():
-            if nxt not in used:
-                stack.append((nxt, dist + w, used | {nxt}))
+        for nxt, w in adj[node]:
+            if not used >> nxt & 1:
+                stack.append((nxt, dist + w, used | 1 << nxt))
+
+    return best
+
+
+def solve_part1(data: str) -> str:
+    grid, R, C = parse(data)
+
+    # старт = первая '.' в первой строке
+    start = (0, grid[0].index('.'))
+    # финиш = первая '.' в последней строке
+    goal = (R - 1, grid[-1].index('.'))
+
+    # Склоны делают граф направленным (на практике — ацикличным),
+    # так что перебор по сжатому графу мгновенный
+    order, adj = compress_graph(grid, R, C, start, goal, slopes=True)
+    best = dfs_longest(adj, order.index(start), order.index(goal))
+    return str(max(best, 0))
+
+
+# ---------------------------------------------------------
+# PART 2 — игнорируем склоны: DP по "фронтиру" графа перекрёстков
+# ---------------------------------------------------------
+#
+# Перекрёстки образуют почти решётку 6x6, и полный перебор простых путей
+# в ней — это миллионы путей. Вместо него рёбра обрабатываются по одному
+# (вершины — построчно), а состояние помнит только то, что важно для
+# будущих рёбер: для каждой вершины "фронтира" (у неё есть и пройденные,
+# и ещё не рассмотренные рёбра) — как она лежит на уже выбранных кусках
+# пути. Разные частичные решения с одинаковым фронтиром дальше ведут
+# себя одинаково, поэтому из них хранится только самое длинное.
+#
+# Значение для вершины v фронтира:
+#   v        — не использована (степень 0);
+#   INNER    — внутренняя вершина пути (степень 2), рёбер больше не берёт;
+#   MAIN     — конец главного куска: того, что продолжает старт или финиш
+#              (старт и финиш сразу считаются концами одного куска,
+#              соединёнными "виртуально");
+#   u        — конец обычного куска, второй конец которого — u.
+# Соединить два конца MAIN — значит замкнуть путь старт -> финиш.
+
+INNER = -2
+MAIN = -1
+
+
+def longest_path_frontier(adj: Graph, start: int, goal: int) -> int:
+    """Длина самого длинного простого пути start -> goal в неориентированном графе."""
+    edges = sorted(
+        (max(v, u), min(v, u), w) for v in range(len(adj)) for u, w in adj[v] if v < u
+    )
+    last_use = {}
+    for i, (a, b, _) in enumerate(edges):
+        last_use[a] = last_use[b] = i
+
+    frontier: List[int] = []
+    states: Dict[Tuple[int, ...], int] = {(): 0}
+    best = -1
+
+    for i, (a, b, w) in enumerate(edges):
+        for v in (a, b):
+            if v not in frontier:
+                frontier.append(v)
+                mark = MAIN if v in (start, goal) else v
+                states = {st + (mark,): val for st, val in states.items()}
+        ia, ib = frontier.index(a), frontier.index(b)
+
+        new: Dict[Tuple[int, ...], int] = {}
+        for st, val in states.items():
+            # ребро не берём
+            if new.get(st, -1) < val:
+                new[st] = val
+
+            # ребро берём: концы должны быть свободны или быть концами кусков
+            ma, mb = st[ia], st[ib]
+            if ma == INNER or mb == INNER:
+                continue
+            total = val + w
+            if ma == MAIN and mb == MAIN:
+                # путь замкнулся; других незаконченных кусков быть не должно
+                if total > best and all(
+                    m == INNER or m == v or m == MAIN
+                    for v, m in zip(frontier, st)
+                ):
+                    best = total
+                continue
+            if ma == b:
+                continue  # концы одного куска — получился бы цикл
+
+            lst = list(st)
+            far_a = a if ma == a else ma
+            far_b = b if mb == b else mb
+            if ma != a:
+                lst[ia] = INNER
+            if mb != b:
+                lst[ib] = INNER
+            if far_a == MAIN:
+                lst[frontier.index(far_b)] = MAIN
+            elif far_b == MAIN:
+                lst[frontier.index(far_a)] = MAIN
+            else:
+                lst[frontier.index(far_a)] = far_b
+                lst[frontier.index(far_b)] = far_a
+            key = tuple(lst)
+            if new.get(key, -1) < total:
+                new[key] = total
+
+        # вершины, у которых рёбер больше не осталось, покидают фронтир:
+        # конец куска на выходе означает, что кусок уже не продолжить
+        leaving = [j for j, v in enumerate(frontier) if last_use[v] == i]
+        if leaving:
+            states = {}
+            for st, val in new.items():
+                if all(st[j] == INNER or st[j] == frontier[j] for j in leaving):
+                    key = tuple(m for j, m in enumerate(st) if j not in leaving)
+                    if states.get(key, -1) < val:
+                        states[key] = val
+            frontier = [v for j, v in enumerate(frontier) if j not in leaving]
+        else:
+            states = new
 
     return best
 
@@ -149,9 +230,9 @@ def solve_part2(data: str) -> str:
     start = (0, grid[0].index('.'))
     goal = (R - 1, grid[-1].index('.'))
 
-    graph = compress_graph(grid, R, C, start, goal)
-    best = dfs_longest(graph, start, goal)
-    return str(best)
+    order, adj = compress_graph(grid, R, C, start, goal, slopes=False)
+    best = longest_path_frontier(adj, order.index(start), order.index(goal))
+    return str(max(best, 0))
 
 
 # ---------------------------------------------------------
@@ -1,113 +1,144 @@
-from collections import defaultdict, deque
-import random
+from array import array
+from collections import deque
+from typing import Iterable, List, Optional, Tuple
 
+# По условию провода нужно перерезать ровно три
+CUT_SIZE = 3
 
-def parse_graph(data: str):
-    g = defaultdict(set)
+
+def parse_edges(data: str) -> List[Tuple[str, str]]:
+    edges = []
     for line in data.splitlines():
         if not line.strip():
             continue
         left, right = line.split(":")
         node = left.strip()
         for tgt in right.split():
-            tgt = tgt.strip()
-            g[node].add(tgt)
-            g[tgt].add(node)
-    return g
-
-
-def bfs_path(g, start, end):
-    """Находит один кратчайший путь между двумя вершинами."""
-    q = deque([start])
-    parent = {start: None}
-
-    while q:
-        cur = q.popleft()
-        if cur == end:
-            break
-        for nx in g[cur]:
-            if nx not in parent:
-                parent[nx] = cur
-                q.append(nx)
-
-    if end not in parent:
-        return []
-
-    # восстановление пути
-    path = []
-    cur = end
-    while cur is not None:
-        path.append(cur)
-        cur = parent[cur]
-    path.reverse()
-    return path
-
-
-def solve_min_cut(g):
+            edges.append((node, tgt.strip()))
+    return edges
+
+
+class WiringGraph:
     """
-    Ищем 3-реберный min-cut через частотный анализ рёбер в кратчайших путях.
-    Работает надёжно для входа Day 25.
+    Неориентированный граф: имена вершин заменены номерами 0..n-1,
+    смежность хранится в CSR-массивах. Рёбра вершины v — дуги
+    offsets[v]..offsets[v + 1] - 1: targets[a] — конец дуги,
+    twin[a] — номер встречной дуги того же ребра.
     """
-    nodes = list(g.keys())
-    edge_count = defaultdict(int)
-
-    # много случайных пар → считаем, какие рёбра встречаются чаще
-    for _ in range(4000):
-        a, b = random.sample(nodes, 2)
-        path = bfs_path(g, a, b)
-        if not path:
-            continue
-        for u, v in zip(path, path[1:]):
-            e = tuple(sorted((u, v)))
-            edge_count[e] += 1
-
-    # выбираем 3 самых часто встречающихся ребра
-    sorted_edges = sorted(edge_count.items(), key=lambda x: -x[1])
-    cut_edges = [e for e, _ in sorted_edges[:3]]
-
-    # удаляем их
-    g2 = {k: set(v) for k, v in g.items()}
-    for u, v in cut_edges:
-        g2[u].remove(v)
-        g2[v].remove(u)
-
-    # ищем размер компонент
-    seen = set()
-    comp_sizes = []
-
-    for node in g2:
-        if node in seen:
-            continue
-        q = deque([node])
-        seen.add(node)
-        size = 1
-        while q:
-            cur = q.popleft()
-            for nx in g2[cur]:
-                if nx not in seen:
-                    seen.add(nx)
-                    size += 1
-                    q.append(nx)
-        comp_sizes.append(size)
-
-    if len(comp_sizes) != 2:
-        # если рандом не попал → повторим
-        return None
 
-    return comp_sizes[0] * comp_sizes[1]
+    def __init__(self, edges: Iterable[Tuple[str, str]]) -> None:
+        index = {}
+        pairs = []
+        for a, b in edges:
+            ia = index.setdefault(a, len(index))
+            ib = index.setdefault(b, len(index))
+            if ia != ib:
+                pairs.append((ia, ib))
+        pairs = sorted({(min(a, b), max(a, b)) for a, b in pairs})  # без повторов
+
+        n = len(index)
+        self.names = list(index)
+        self.n = n
+        degree = [0] * (n + 1)
+        for a, b in pairs:
+            degree[a + 1] += 1
+            degree[b + 1] += 1
+        for v in range(n):
+            degree[v + 1] += degree[v]
+        self.offsets = array("i", degree)
+
+        fill = list(degree[:n])
+        targets = array("i", bytes(4 * 2 * len(pairs)))
+        twin = array("i", bytes(4 * 2 * len(pairs)))
+        for a, b in pairs:
+            arc_ab, arc_ba = fill[a], fill[b]
+            fill[a] += 1
+            fill[b] += 1
+            targets[arc_ab], targets[arc_ba] = b, a
+            twin[arc_ab], twin[arc_ba] = arc_ba, arc_ab
+        self.targets = targets
+        self.twin = twin
+
+    def distances(self, source: int) -> List[int]:
+        """BFS-расстояния от source (-1 — недостижимо)."""
+        offsets, targets = self.offsets, self.targets
+        dist = [-1] * self.n
+        dist[source] = 0
+        queue = deque([source])
+        while queue:
+            v = queue.popleft()
+            for a in range(offsets[v], offsets[v + 1]):
+                w = targets[a]
+                if dist[w] < 0:
+                    dist[w] = dist[v] + 1
+                    queue.append(w)
+        return dist
+
+    def max_flow(self, s: int, t: int, limit: int) -> Tuple[int, Optional[bytearray]]:
+        """
+        Эдмондс–Карп с единичными пропускными способностями рёбер.
+        Как только поток превысил limit, дальше не считаем: (limit + 1, None).
+        Иначе (поток, seen), где seen — вершины, достижимые из s в остаточной
+        сети, то есть сторона минимального s-t разреза.
+        """
+        offsets, targets, twin = self.offsets, self.targets, self.twin
+        flow = array("b", bytes(len(targets)))  # поток по дуге: -1, 0 или 1
+        for pushed in range(limit + 1):
+            seen = bytearray(self.n)
+            seen[s] = 1
+            parent_arc = [-1] * self.n
+            queue = deque([s])
+            while queue and not seen[t]:
+                v = queue.popleft()
+                for a in range(offsets[v], offsets[v + 1]):
+                    w = targets[a]
+                    if not seen[w] and flow[a] < 1:
+                        seen[w] = 1
+                        parent_arc[w] = a
+                        queue.append(w)
+            if not seen[t]:
+                return pushed, seen
+            # проталкиваем единицу потока по найденному пути
+            v = t
+            while v != s:
+                a = parent_arc[v]
+                flow[a] += 1
+                flow[twin[a]] -= 1
+                v = targets[twin[a]]
+        return limit + 1, None
+
+    def min_cut(self, limit: int) -> Optional[Tuple[int, bytearray]]:
+        """
+        Глобальный разрез размером не больше limit: исток — вершина 0, сток
+        перебирается от самых далёких вершин (они скорее всего по другую
+        сторону разреза). Каждая пара, где поток больше limit, бросается
+        после limit + 1 путей. Результат детерминирован.
+        """
+        dist = self.distances(0)
+        order = sorted(range(1, self.n), key=lambda v: -dist[v])
+        for t in order:
+            if dist[t] < 0:
+                # граф уже несвязен: разрез из нуля рёбер
+                return 0, bytearray(d >= 0 for d in dist)
+            value, side = self.max_flow(0, t, limit)
+            if side is not None:
+                return value, side
+        return None
 
 
-def solve_part1(data: str) -> str:
-    g = parse_graph(data)
+def solve_min_cut(graph: WiringGraph) -> Optional[int]:
+    """Произведение размеров двух частей после разреза из CUT_SIZE рёбер."""
+    found = graph.min_cut(CUT_SIZE)
+    if found is None:
+        return None
+    _, side = found
+    size = sum(side)
+    return size * (graph.n - size)
 
-    # повторяем поиск, пока не поймаем корректный min-cut
-    for _ in range(50):
-        res = solve_min_cut(g)
-        if res is not None:
-            return str(res)
 
-    # fallback — крайне маловероятно
-    return "failed"
+def solve_part1(data: str) -> str:
+    res = solve_min_cut(WiringGraph(parse_edges(data)))
+    return str(res) if res is not None else "failed"
 
 
 def solve_part2(data: str) -> str:
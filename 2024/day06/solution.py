@@ -1,5 +1,14 @@
 from __future__ import annotations
 
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.parallel import default_workers, map_in_pool  # noqa: E402
+
 
 def parse_map(data: str):
     grid = [list(line.rstrip("\n")) for line in data.splitlines() if line.strip()]
@@ -71,47 +80,109 @@ def walk_once(grid, sr, sc, sdir):
     return visited
 
 
-def causes_loop(grid, sr, sc, sdir, br, bc):
+# Для части 2 направления — номера по часовой стрелке (поворот направо — +1),
+# состояние охранника — одно число cell * 4 + d, где cell = r * cols + c
+CLOCKWISE = "^>v<"
+EXIT = -1
+
+
+def build_jumps(grid):
     """
-    Проверяет, приведёт ли добавление стены в (br, bc)
-    к бесконечному циклу.
+    Таблица прыжков "от стены до стены" для всех состояний cell * 4 + d:
+      stop[state] — последняя клетка, до которой охранник дойдёт по прямой
+                    (перед препятствием или у края карты);
+      nxt[state]  — состояние после поворота в stop или EXIT, если
+                    охранник уходит с карты.
     """
     rows = len(grid)
     cols = len(grid[0])
-
-    # нельзя ставить стену на старт или поверх уже существующей
-    if (br, bc) == (sr, sc):
-        return False
-    if grid[br][bc] == "#":
-        return False
-
-    # состояние: (r, c, dir)
-    seen_states = set()
-    r, c, d = sr, sc, sdir
-
+    size = rows * cols
+    stop = [0] * (size * 4)
+    nxt = [EXIT] * (size * 4)
+
+    for d, ch in enumerate(CLOCKWISE):
+        dr, dc = DIRS[ch]
+        turned = (d + 1) % 4
+        # идём навстречу направлению, чтобы сосед впереди был уже посчитан
+        r_order = range(rows - 1, -1, -1) if dr > 0 else range(rows)
+        c_order = range(cols - 1, -1, -1) if dc > 0 else range(cols)
+        for r in r_order:
+            for c in c_order:
+                cell = r * cols + c
+                state = cell * 4 + d
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < rows and 0 <= nc < cols):
+                    stop[state] = cell
+                elif grid[nr][nc] == "#":
+                    stop[state] = cell
+                    nxt[state] = cell * 4 + turned
+                else:
+                    ahead = (nr * cols + nc) * 4 + d
+                    stop[state] = stop[ahead]
+                    nxt[state] = nxt[ahead]
+    return stop, nxt
+
+
+def first_visits(grid, sr, sc, sdir):
+    """
+    Исходный маршрут по шагам. Для каждой клетки, кроме старта, —
+    (клетка, состояние перед первым входом в неё), в порядке обхода.
+    Стена в этой клетке не меняет путь до этого состояния, поэтому
+    проверку можно начинать прямо с него.
+    """
+    rows = len(grid)
+    cols = len(grid[0])
+    r, c, d = sr, sc, CLOCKWISE.index(sdir)
+    visited = {r * cols + c}
+    result = []
     while True:
-        state = (r, c, d)
-        if state in seen_states:
-            # вернулись в то же положение с тем же направлением — цикл
-            return True
-        seen_states.add(state)
-
-        dr, dc = DIRS[d]
+        dr, dc = DIRS[CLOCKWISE[d]]
         nr, nc = r + dr, c + dc
-
-        # выход за карту — цикла нет
         if not (0 <= nr < rows and 0 <= nc < cols):
-            return False
-
-        # с учётом новой стены
-        is_blocked = (nr == br and nc == bc) or (grid[nr][nc] == "#")
-        if is_blocked:
-            d = TURN_RIGHT[d]
+            return result
+        if grid[nr][nc] == "#":
+            d = (d + 1) % 4
             continue
-
+        cell = nr * cols + nc
+        if cell not in visited:
+            visited.add(cell)
+            result.append((cell, (r * cols + c) * 4 + d))
         r, c = nr, nc
 
 
+def count_loops(stop, nxt, cols, trials):
+    """
+    Сколько из trials = [(клетка новой стены, стартовое состояние)]
+    зацикливают охранника. Между поворотами охранник прыгает по таблице;
+    новая стена учитывается проверкой, не лежит ли она на текущем прямом
+    отрезке (это и есть "исправленные" строка и столбец таблицы).
+    """
+    steps = (-cols, 1, cols, -1)
+    seen = [0] * len(stop)  # номер проверки, в которой состояние уже было
+    count = 0
+    for trial, (block, state) in enumerate(trials, 1):
+        block_row, block_col = divmod(block, cols)
+        while True:
+            if seen[state] == trial:
+                # вернулись в то же положение с тем же направлением — цикл
+                count += 1
+                break
+            seen[state] = trial
+            cell, d = divmod(state, 4)
+            end = stop[state]
+            if d & 1:  # по горизонтали: стена должна быть в той же строке
+                hit = cell // cols == block_row
+            else:  # по вертикали — в том же столбце
+                hit = cell % cols == block_col
+            if hit and (cell < block <= end if d in (1, 2) else end <= block < cell):
+                state = (block - steps[d]) * 4 + (d + 1) % 4
+                continue
+            state = nxt[state]
+            if state == EXIT:
+                break
+    return count
+
+
 def solve_part1(data: str) -> str:
     # Day 6 Part 1: симулируем маршрут и считаем число уникальных посещённых клеток.
 
@@ -132,25 +203,19 @@ def solve_part2(data: str) -> str:
     if not grid or sr is None:
         return "0"
 
-    rows = len(grid)
+    # Стена, поставленная вне исходного пути, ничего не изменит — проверяем
+    # только клетки пути, каждую с момента первого входа в неё.
+    trials = first_visits(grid, sr, sc, sdir)
+    stop, nxt = build_jumps(grid)
     cols = len(grid[0])
 
-    # Оптимизация: стена, поставленная вне исходного пути, ничего не изменит.
-    # Поэтому сначала получаем множество клеток, по которым реально ходит охранник.
-    path_cells = walk_once(grid, sr, sc, sdir)
-
-    count = 0
-    for (r, c) in path_cells:
-        # старт уже отфильтруем в causes_loop
-        if causes_loop(grid, sr, sc, sdir, r, c):
-            count += 1
-
-    return str(count)
+    # Таблицы переходов уходят в каждый процесс один раз, в задачах — только проверки
+    parts = min(len(trials), 4 * default_workers())
+    chunks = [(trials[i::parts],) for i in range(parts)]
+    return str(sum(map_in_pool(count_loops, chunks, shared=(stop, nxt, cols))))
 
 
 if __name__ == "__main__":
-    from pathlib import Path
-
     here = Path(__file__).resolve().parent
     input_path = here / "input.txt"
     raw = input_path.read_text(encoding="utf-8") if input_path.exists() else ""
@@ -1,76 +1,20 @@
-def build_disk_for_part1(line: str) -> list[int]:
-    """
-    Преобразует строку карты диска в список блоков:
-    -1 = свободное место, >=0 = ID файла.
-    Используется в части 1.
-    """
-    line = line.strip()
-    disk: list[int] = []
-    is_file = True
-    file_id = 0
-
-    for ch in line:
-        length = int(ch)
-        if is_file:
-            # Блок файла с данным ID
-            for _ in range(length):
-                disk.append(file_id)
-            file_id += 1
-        else:
-            # Свободные блоки
-            for _ in range(length):
-                disk.append(-1)
-        is_file = not is_file
-
-    return disk
-
-
-def build_disk_and_files_for_part2(line: str) -> tuple[list[int], list[int], list[int]]:
-    """
-    Для части 2:
-    - строим такой же массив блоков,
-    - плюс для каждого файла запоминаем начало и длину.
-      starts[file_id], lengths[file_id]
-    """
-    line = line.strip()
-    disk: list[int] = []
-    starts: list[int] = []
-    lengths: list[int] = []
-
-    is_file = True
-    file_id = 0
-    pos = 0  # текущая позиция в диске
-
-    for ch in line:
-        length = int(ch)
-        if is_file:
-            # файл с ID = file_id, длина length
-            starts.append(pos)
-            lengths.append(length)
-            for _ in range(length):
-                disk.append(file_id)
-                pos += 1
-            file_id += 1
-        else:
-            # свободное место
-            for _ in range(length):
-                disk.append(-1)
-                pos += 1
-        is_file = not is_file
-
-    return disk, starts, lengths
-
-
-def checksum(disk: list[int]) -> int:
+import heapq
+
+MAX_SPAN = 9  # длина отрезка в карте диска — одна цифра
+
+
+def parse_disk_map(line: str) -> tuple[list[int], list[int]]:
     """
-    Считает файловую чек-сумму:
-    сумма (позиция * ID файла), свободные блоки (-1) пропускаем.
+    Разбирает строку карты диска на отрезки, не раскладывая их по блокам:
+    files[file_id] — длина файла, gaps[i] — свободное место после файла i.
     """
-    total = 0
-    for i, v in enumerate(disk):
-        if v != -1:
-            total += i * v
-    return total
+    digits = [int(ch) for ch in line.strip()]
+    return digits[0::2], digits[1::2]
+
+
+def span_sum(start: int, length: int) -> int:
+    """Сумма позиций start .. start+length-1 (арифметическая прогрессия)."""
+    return length * (2 * start + length - 1) // 2
 
 
 def solve_part1(data: str) -> str:
@@ -79,26 +23,39 @@ def solve_part1(data: str) -> str:
     if not line:
         return "0"
 
-    disk = build_disk_for_part1(line)
+    files, gaps = parse_disk_map(line)
 
-    left = 0
-    right = len(disk) - 1
-
-    # Два указателя:
-    # left — ищет первый свободный блок слева,
-    # right — ищет первый файловый блок справа.
-    while left < right:
-        while left < right and disk[left] != -1:
-            left += 1
-        while left < right and disk[right] == -1:
-            right -= 1
-        if left < right:
-            disk[left] = disk[right]
-            disk[right] = -1
-            left += 1
-            right -= 1
-
-    return str(checksum(disk))
+    # Два указателя по отрезкам, а не по блокам:
+    # i — файл слева, который остаётся на месте (его позиция — pos),
+    # j — файл справа, блоки которого (rem штук) переезжают в дыры.
+    # После уплотнения диск занят сплошь от 0, поэтому pos просто растёт.
+    total = 0
+    pos = 0
+    j = len(files) - 1
+    rem = files[j]
+
+    for i in range(len(files)):
+        if i > j:
+            break
+        n = files[i] if i < j else rem
+        total += i * span_sum(pos, n)
+        pos += n
+        if i == j:
+            break
+
+        gap = gaps[i] if i < len(gaps) else 0
+        while gap and j > i:
+            take = min(gap, rem)
+            total += j * span_sum(pos, take)
+            pos += take
+            gap -= take
+            rem -= take
+            if rem == 0:
+                # правый файл переехал целиком — берём следующий слева
+                j -= 1
+                rem = files[j]
+
+    return str(total)
 
 
 def solve_part2(data: str) -> str:
@@ -106,58 +63,70 @@ def solve_part2(data: str) -> str:
     if not line:
         return "0"
 
-    # Диск + таблица файлов (начало и длина каждого ID)
-    disk, starts, lengths = build_disk_and_files_for_part2(line)
-    total_len = len(disk)
-    num_files = len(starts)
+    files, gaps = parse_disk_map(line)
 
+    # Начала файлов и свободные отрезки.
+    # heaps[k] — начала свободных отрезков длины k (min-кучи). Файл не
+    # длиннее MAX_SPAN, так что все более длинные отрезки (соседние дыры,
+    # между которыми только файлы нулевой длины) лежат в heaps[MAX_SPAN],
+    # а их настоящая длина — в long_spans[start].
+    starts: list[int] = []
+    heaps: list[list[int]] = [[] for _ in range(MAX_SPAN + 1)]
+    long_spans: dict[int, int] = {}
+
+    def add_span(span_start: int, span_len: int) -> None:
+        if span_len > MAX_SPAN:
+            long_spans[span_start] = span_len
+        heapq.heappush(heaps[min(span_len, MAX_SPAN)], span_start)
+
+    pos = 0
+    run_start = run_len = 0  # текущий свободный отрезок
+    for file_id, length in enumerate(files):
+        starts.append(pos)
+        if length and run_len:
+            add_span(run_start, run_len)
+            run_len = 0
+        pos += length
+        gap = gaps[file_id] if file_id < len(gaps) else 0
+        if gap:
+            if not run_len:
+                run_start = pos
+            run_len += gap
+            pos += gap
+    # хвостовая дыра правее всех файлов — туда никто не переедет
+
+    total = 0
     # Обрабатываем файлы с максимального ID к нулю
-    for file_id in range(num_files - 1, -1, -1):
-        length = lengths[file_id]
+    for file_id in range(len(files) - 1, -1, -1):
+        length = files[file_id]
         if length == 0:
             # Файл нулевой длины — блоков нет, двигать нечего
             continue
-
-        current_start = starts[file_id]
-
-        # Ищем самую левую подходящую "дыру":
-        # свободный непрерывный участок длиной >= length
-        # с началом строго левее current_start.
-        best_start = None
-        i = 0
-
-        while i < current_start:
-            if disk[i] != -1:
-                i += 1
-                continue
-
-            run_start = i
-            # Собираем длину текущего свободного отрезка
-            while i < total_len and disk[i] == -1:
-                i += 1
-            run_len = i - run_start
-
-            if run_start < current_start and run_len >= length:
-                best_start = run_start
-                break
-
-        if best_start is None:
-            # Нет подходящего места — файл остаётся где был
-            continue
-
-        # Перемещаем целый файл:
-        # 1) очищаем старое место
-        for pos in range(current_start, current_start + length):
-            disk[pos] = -1
-
-        # 2) записываем файл в новое место (best_start .. best_start+length-1)
-        for pos in range(best_start, best_start + length):
-            disk[pos] = file_id
-
-        # Обновляем начало файла
-        starts[file_id] = best_start
-
-    return str(checksum(disk))
+        start = starts[file_id]
+
+        # Самая левая дыра длиной >= length — минимум по вершинам куч
+        # length..MAX_SPAN; годится, только если она левее самого файла.
+        best_len = 0
+        best_start = start
+        for k in range(length, MAX_SPAN + 1):
+            heap = heaps[k]
+            if heap and heap[0] < best_start:
+                best_start = heap[0]
+                best_len = k
+
+        if best_len:
+            # Файл переезжает; остаток дыры — отрезок покороче.
+            # Освободившееся старое место никому не нужно: все оставшиеся
+            # файлы лежат левее и двигаются только влево.
+            heapq.heappop(heaps[best_len])
+            span_len = long_spans.pop(best_start, best_len)
+            if span_len > length:
+                add_span(best_start + length, span_len - length)
+            start = best_start
+
+        total += file_id * span_sum(start, length)
+
+    return str(total)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,10 @@
 import re
-from typing import List, Tuple, Set
+from typing import List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен: без него работают циклы на списках
+    np = None
 
 # Размеры поля для реального инпута AoC 2024 Day 14
 WIDTH = 101
@@ -27,6 +32,17 @@ def parse(data: str) -> List[Tuple[int, int, int, int]]:
     return robots
 
 
+def to_arrays(robots: List[Tuple[int, int, int, int]]):
+    """
+    Рой роботов как четыре столбца x, y, vx, vy: массивы NumPy,
+    если он есть, иначе обычные списки.
+    """
+    columns = [list(col) for col in zip(*robots)] if robots else [[], [], [], []]
+    if np is not None:
+        return tuple(np.array(col, dtype=np.int64) for col in columns)
+    return tuple(columns)
+
+
 def simulate_position(x: int, y: int, vx: int, vy: int, t: int) -> Tuple[int, int]:
     """
     Позиция робота через t секунд с учётом тороидального поля.
@@ -36,6 +52,33 @@ def simulate_position(x: int, y: int, vx: int, vy: int, t: int) -> Tuple[int, in
     return nx, ny
 
 
+def axis_spread(pos, vel, size: int) -> List[float]:
+    """
+    Разброс (дисперсия) координаты роботов по одной оси для каждого
+    t = 0 .. size-1. По оси x положение повторяется с периодом WIDTH,
+    по y — с периодом HEIGHT, независимо от другой оси.
+    """
+    if np is not None:
+        # Все моменты сразу: матрица size x N, строка t — координаты в момент t
+        times = np.arange(size, dtype=np.int64)[:, None]
+        coords = (pos[None, :] + vel[None, :] * times) % size
+        return coords.var(axis=1).tolist()
+
+    n = len(pos)
+    spreads = []
+    for t in range(size):
+        coords = [(p + v * t) % size for p, v in zip(pos, vel)]
+        mean = sum(coords) / n
+        spreads.append(sum((c - mean) ** 2 for c in coords) / n)
+    return spreads
+
+
+def crt(a: int, m: int, b: int, n: int) -> int:
+    """Наименьшее t >= 0 с t ≡ a (mod m) и t ≡ b (mod n); m и n взаимно просты."""
+    k = (b - a) * pow(m, -1, n) % n
+    return a + m * k
+
+
 def solve_part1(data: str) -> str:
     # Day 14 Part 1:
     # Считаем позиции через 100 секунд и safety factor по квадрантам.
@@ -46,6 +89,19 @@ def solve_part1(data: str) -> str:
     mid_x = WIDTH // 2
     mid_y = HEIGHT // 2
 
+    if np is not None:
+        x, y, vx, vy = to_arrays(robots)
+        nx = (x + vx * t) % WIDTH
+        ny = (y + vy * t) % HEIGHT
+        left, right = nx < mid_x, nx > mid_x
+        upper, lower = ny < mid_y, ny > mid_y
+        # Роботы на разделяющих линиях не попадают ни в одну половину
+        quadrants = [left & upper, right & upper, left & lower, right & lower]
+        safety_factor = 1
+        for quadrant in quadrants:
+            safety_factor *= int(np.count_nonzero(quadrant))
+        return str(safety_factor)
+
     ul = ur = ll = lr = 0  # upper-left, upper-right, lower-left, lower-right
 
     for x, y, vx, vy in robots:
@@ -72,61 +128,26 @@ def solve_part2(data: str) -> str:
     """
     Day 14 Part 2:
     Ищем момент времени, когда роботы образуют "картинку".
-    Вместо минимального bounding box ищем момент, когда
-    наибольшая связная компонента (по 4-соседству) максимальна.
+    На картинке роботы собраны в кучу, поэтому и по x, и по y их разброс
+    резко меньше, чем в остальные моменты. Оси независимы: x повторяется
+    с периодом WIDTH, y — с периодом HEIGHT. Значит, достаточно найти
+    лучший момент tx < WIDTH по x и ty < HEIGHT по y (WIDTH + HEIGHT
+    вычислений вместо WIDTH * HEIGHT) и склеить их китайской теоремой
+    об остатках: t ≡ tx (mod WIDTH), t ≡ ty (mod HEIGHT).
     """
 
     robots = parse(data)
     if not robots:
         return "0"
 
-    period = WIDTH * HEIGHT  # полный период конфигураций (101 * 103)
-
-    best_t = 0
-    best_cluster = -1
-
-    # 4-соседство
-    neighbors = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-
-    for t in range(period):
-        # Считаем позиции всех роботов в момент t
-        positions: Set[Tuple[int, int]] = set()
-        for x, y, vx, vy in robots:
-            nx = (x + vx * t) % WIDTH
-            ny = (y + vy * t) % HEIGHT
-            positions.add((nx, ny))
-
-        # Находим размер наибольшей связной компоненты
-        seen: Set[Tuple[int, int]] = set()
-        max_comp = 0
-
-        for pos in positions:
-            if pos in seen:
-                continue
-
-            # DFS/BFS из этой точки
-            stack = [pos]
-            seen.add(pos)
-            size = 0
-
-            while stack:
-                r, c = stack.pop()
-                size += 1
-                for dr, dc in neighbors:
-                    nr, nc = r + dr, c + dc
-                    if (nr, nc) in positions and (nr, nc) not in seen:
-                        seen.add((nr, nc))
-                        stack.append((nr, nc))
-
-            if size > max_comp:
-                max_comp = size
-
-        # Обновляем лучший момент
-        if max_comp > best_cluster:
-            best_cluster = max_comp
-            best_t = t
-
-    return str(best_t)
+    x, y, vx, vy = to_arrays(robots)
+
+    spread_x = axis_spread(x, vx, WIDTH)
+    spread_y = axis_spread(y, vy, HEIGHT)
+    best_tx = min(range(WIDTH), key=spread_x.__getitem__)
+    best_ty = min(range(HEIGHT), key=spread_y.__getitem__)
+
+    return str(crt(best_tx, WIDTH, best_ty, HEIGHT))
 
 
 if __name__ == "__main__":
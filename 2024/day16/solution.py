@@ -1,162 +1,91 @@
-import heapq
+import sys
+from pathlib import Path
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
 
-DIRS = [(0,1), (1,0), (0,-1), (-1,0)]   # R, D, L, U
+from aoclib.pathfind import FlatGrid, dial  # noqa: E402
+
+
+# Направления в порядке FlatGrid.steps: R, D, L, U
+RIGHT = 0
+TURN_COST = 1000
 
 
 def parse(data: str):
-    grid = [list(line) for line in data.splitlines() if line.strip()]
-    R, C = len(grid), len(grid[0])
-    start = end = None
+    grid = FlatGrid.parse(data)
+    return grid, grid.find("S"), grid.find("E")
+
 
-    for r in range(R):
-        for c in range(C):
-            if grid[r][c] == "S":
-                start = (r, c)
-            elif grid[r][c] == "E":
-                end = (r, c)
+def make_edges(grid: FlatGrid):
+    """
+    Рёбра графа состояний cell * 4 + dir: поворот на 90° за 1000
+    или шаг вперёд за 1.
+    """
+    passable = grid.open
+    steps = grid.steps
 
-    return grid, start, end, R, C
+    def edges(state):
+        cell, d = divmod(state, 4)
+        base = state - d
+        result = [(base + (d + 1) % 4, TURN_COST), (base + (d + 3) % 4, TURN_COST)]
+        nxt = cell + steps[d]
+        if passable[nxt]:
+            result.append((nxt * 4 + d, 1))
+        return result
+
+    return edges
 
 
 def solve_part1(data: str) -> str:
-    grid, start, end, R, C = parse(data)
-
-    # dist[r][c][dir]
-    INF = 10**30
-    dist = [[[INF]*4 for _ in range(C)] for __ in range(R)]
-
-    sr, sc = start
-    er, ec = end
-
-    # стартуем, направлены вправо (0) — это условие задачи
-    pq = []
-    dist[sr][sc][0] = 0
-    heapq.heappush(pq, (0, sr, sc, 0))
-
-    while pq:
-        cost, r, c, d = heapq.heappop(pq)
-        if cost != dist[r][c][d]:
-            continue
-
-        # поворот вправо
-        nd = (d + 1) % 4
-        ncost = cost + 1000
-        if ncost < dist[r][c][nd]:
-            dist[r][c][nd] = ncost
-            heapq.heappush(pq, (ncost, r, c, nd))
-
-        # поворот влево
-        nd = (d - 1) % 4
-        ncost = cost + 1000
-        if ncost < dist[r][c][nd]:
-            dist[r][c][nd] = ncost
-            heapq.heappush(pq, (ncost, r, c, nd))
-
-        # шаг вперёд
-        dr, dc = DIRS[d]
-        nr, nc = r + dr, c + dc
-        if 0 <= nr < R and 0 <= nc < C and grid[nr][nc] != "#":
-            ncost = cost + 1
-            if ncost < dist[nr][nc][d]:
-                dist[nr][nc][d] = ncost
-                heapq.heappush(pq, (ncost, nr, nc, d))
-
-    # Минимум among all directions
-    ans = min(dist[er][ec])
-    return str(ans)
+    grid, start, end = parse(data)
+
+    # стартуем, направлены вправо — это условие задачи
+    dist, found = dial(
+        make_edges(grid), [start * 4 + RIGHT], TURN_COST,
+        size=len(grid) * 4, goal=lambda state: state >> 2 == end,
+    )
+    return str(dist[found])
 
 
 def solve_part2(data: str) -> str:
-    grid, start, end, R, C = parse(data)
-
-    INF = 10**30
-    dist = [[[INF]*4 for _ in range(C)] for __ in range(R)]
-    sr, sc = start
-    er, ec = end
-
-    # ---------- Dijkstra ----------
-    pq = []
-    dist[sr][sc][0] = 0
-    heapq.heappush(pq, (0, sr, sc, 0))
-
-    while pq:
-        cost, r, c, d = heapq.heappop(pq)
-        if cost != dist[r][c][d]:
-            continue
-
-        # turn right
-        nd = (d + 1) % 4
-        ncost = cost + 1000
-        if ncost < dist[r][c][nd]:
-            dist[r][c][nd] = ncost
-            heapq.heappush(pq, (ncost, r, c, nd))
-
-        # turn left
-        nd = (d - 1) % 4
-        ncost = cost + 1000
-        if ncost < dist[r][c][nd]:
-            dist[r][c][nd] = ncost
-            heapq.heappush(pq, (ncost, r, c, nd))
-
-        # forward
-        dr, dc = DIRS[d]
-        nr, nc = r + dr, c + dc
-        if 0 <= nr < R and 0 <= nc < C and grid[nr][nc] != "#":
-            ncost = cost + 1
-            if ncost < dist[nr][nc][d]:
-                dist[nr][nc][d] = ncost
-                heapq.heappush(pq, (ncost, nr, nc, d))
-
-    best = min(dist[er][ec])
-
-    # ---------- строим обратные рёбра минимальных путей ----------
-    from collections import deque
-
-    good = set()  # множество (r,c,dir)
-    q = deque()
-
-    # начинаем из всех направлений в E, где dist = best
-    for d in range(4):
-        if dist[er][ec][d] == best:
-            good.add((er, ec, d))
-            q.append((er, ec, d))
-
-    while q:
-        r, c, d = q.popleft()
-        cost = dist[r][c][d]
-
-        # 1. Пришли сюда поворотом справа?
-        pd = (d - 1) % 4
-        if dist[r][c][pd] == cost - 1000:
-            if (r,c,pd) not in good:
-                good.add((r,c,pd))
-                q.append((r,c,pd))
-
-        # 2. Пришли сюда поворотом слева?
-        pd = (d + 1) % 4
-        if dist[r][c][pd] == cost - 1000:
-            if (r,c,pd) not in good:
-                good.add((r,c,pd))
-                q.append((r,c,pd))
-
-        # 3. Пришли шагом вперёд?
-        dr, dc = DIRS[d]
-        pr, pc = r - dr, c - dc
-        if 0 <= pr < R and 0 <= pc < C and grid[pr][pc] != "#":
-            if dist[pr][pc][d] == cost - 1:
-                if (pr,pc,d) not in good:
-                    good.add((pr,pc,d))
-                    q.append((pr,pc,d))
+    grid, start, end = parse(data)
+    edges = make_edges(grid)
+    size = len(grid) * 4
+
+    dist, _ = dial(edges, [start * 4 + RIGHT], TURN_COST, size=size)
+    best = min(dist[end * 4:end * 4 + 4])
+
+    # ---------- обратный ход по рёбрам минимальных путей ----------
+    steps = grid.steps
+    good = bytearray(size)
+    stack = [state for state in range(end * 4, end * 4 + 4) if dist[state] == best]
+    for state in stack:
+        good[state] = 1
+
+    while stack:
+        state = stack.pop()
+        cost = dist[state]
+        cell, d = divmod(state, 4)
+        base = state - d
+        # пришли сюда поворотом или шагом вперёд из соседней клетки
+        for prev, weight in (
+            (base + (d + 1) % 4, TURN_COST),
+            (base + (d + 3) % 4, TURN_COST),
+            ((cell - steps[d]) * 4 + d, 1),
+        ):
+            if not good[prev] and dist[prev] == cost - weight:
+                good[prev] = 1
+                stack.append(prev)
 
     # ---------- считаем клетки ----------
-    cells = {(r,c) for (r,c,d) in good}
+    cells = {state >> 2 for state, flag in enumerate(good) if flag}
     return str(len(cells))
 
 
 # ========== RUNNER ==========
 if __name__ == "__main__":
-    from pathlib import Path
     here = Path(__file__).resolve().parent
     input_path = here / "input.txt"
     raw = input_path.read_text(encoding="utf-8") if input_path.exists() else ""
@@ -1,6 +1,15 @@
 from __future__ import annotations
+
+import sys
+from pathlib import Path
 from typing import List, Tuple
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.regvm import OUTPUT, Program, RegisterMachine, chronospatial  # noqa: E402
+
 
 def parse_input(data: str) -> Tuple[int, int, int, List[int]]:
     """
@@ -34,91 +43,21 @@ def parse_input(data: str) -> Tuple[int, int, int, List[int]]:
     return A, B, C, program
 
 
-def combo_value(operand: int, A: int, B: int, C: int) -> int:
-    """
-    Комбо-операнд:
-      0..3 -> литералы,
-      4 -> A,
-      5 -> B,
-      6 -> C.
-    (7 не встречается)
+def run_program(A0: int, B0: int, C0: int, prog: Program) -> List[int]:
     """
-    if 0 <= operand <= 3:
-        return operand
-    if operand == 4:
-        return A
-    if operand == 5:
-        return B
-    if operand == 6:
-        return C
-    raise ValueError(f"Invalid combo operand: {operand}")
-
-
-def run_program(A0: int, B0: int, C0: int, program: List[int]) -> List[int]:
+    Запускает программу на общей регистровой машине и возвращает список выводов (out).
     """
-    Запускает виртуальную машину и возвращает список выводов (out).
-    """
-    A = int(A0)
-    B = int(B0)
-    C = int(C0)
-    ip = 0
-    out: List[int] = []
-
-    n = len(program)
-
-    while 0 <= ip < n:
-        opcode = program[ip]
-        if ip + 1 >= n:
-            break
-        operand = program[ip + 1]
-
-        if opcode == 0:  # adv
-            cv = combo_value(operand, A, B, C)
-            denom = 1 << cv
-            A = A // denom
-            ip += 2
-
-        elif opcode == 1:  # bxl
-            B = B ^ operand
-            ip += 2
-
-        elif opcode == 2:  # bst
-            cv = combo_value(operand, A, B, C)
-            B = cv % 8
-            ip += 2
-
-        elif opcode == 3:  # jnz
-            if A != 0:
-                ip = operand
-            else:
-                ip += 2
-
-        elif opcode == 4:  # bxc
-            B = B ^ C
-            ip += 2
-
-        elif opcode == 5:  # out
-            cv = combo_value(operand, A, B, C)
-            out.append(cv % 8)
-            ip += 2
-
-        elif opcode == 6:  # bdv
-            cv = combo_value(operand, A, B, C)
-            denom = 1 << cv
-            B = A // denom
-            ip += 2
-
-        elif opcode == 7:  # cdv
-            cv = combo_value(operand, A, B, C)
-            denom = 1 << cv
-            C = A // denom
-            ip += 2
-
-        else:
-            # Неверный opcode — по условию такого не будет
-            break
-
-    return out
+    vm = RegisterMachine(prog, [A0, B0, C0])
+    vm.run()
+    return vm.outputs
+
+
+def first_output(A0: int, B0: int, C0: int, prog: Program) -> int:
+    """Первое выведенное число (или -1, если вывода нет)."""
+    vm = RegisterMachine(prog, [A0, B0, C0])
+    if vm.run(until_output=True) != OUTPUT:
+        return -1
+    return vm.outputs[0]
 
 
 def solve_part1(data: str) -> str:
@@ -126,7 +65,7 @@ def solve_part1(data: str) -> str:
     if not program:
         return ""
 
-    outputs = run_program(A0, B0, C0, program)
+    outputs = run_program(A0, B0, C0, chronospatial(program))
     return ",".join(str(x) for x in outputs)
 
 
@@ -143,6 +82,7 @@ def find_minimal_A_for_quine(B0: int, C0: int, program: List[int]) -> int:
     if not program:
         return 0
 
+    prog = chronospatial(program)
     reversed_prog = list(reversed(program))
     candidates = [0]
 
@@ -152,12 +92,10 @@ def find_minimal_A_for_quine(B0: int, C0: int, program: List[int]) -> int:
             base = prev << 3  # сдвиг на одну октальную цифру
             for d in range(8):
                 candidate = base | d
-                out = run_program(candidate, B0, C0, program)
-                if not out:
-                    continue
                 # Здесь используем ту же эвристику, что и в большинстве решений:
                 # первая цифра вывода должна совпадать с текущей "хвостовой" цифрой.
-                if out[0] == target:
+                # Дальше первого вывода программу не выполняем.
+                if first_output(candidate, B0, C0, prog) == target:
                     new_candidates.add(candidate)
         if not new_candidates:
             raise RuntimeError("Не удалось найти ни одного кандидата A — что-то пошло не так")
@@ -168,7 +106,7 @@ def find_minimal_A_for_quine(B0: int, C0: int, program: List[int]) -> int:
     for a in candidates:
         if a <= 0:
             continue
-        out = run_program(a, B0, C0, program)
+        out = run_program(a, B0, C0, prog)
         if out == program:
             valid.append(a)
 
@@ -188,8 +126,6 @@ def solve_part2(data: str) -> str:
 
 
 if __name__ == "__main__":
-    from pathlib import Path
-
     here = Path(__file__).resolve().parent
     input_path = here / "input.txt"
     raw = input_path.read_text(encoding="utf-8") if input_path.exists() else ""
@@ -1,8 +1,19 @@
-from collections import deque
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.pathfind import INF, FlatGrid, grid_bfs  # noqa: E402
 
 
 # Размер поля по условию (координаты 0..70)
 N = 71
+FALLEN_PART1 = 1024
+
+Point = Tuple[int, int]
 
 
 def parse(data: str):
@@ -16,65 +27,189 @@ def parse(data: str):
     return pts
 
 
-# 4-соседство
-DIRS = [(1,0), (-1,0), (0,1), (0,-1)]
-
-
 def bfs(blocked) -> int | None:
     """
     BFS от (0,0) до (70,70).
     blocked — множество запрещённых клеток.
     Возвращает длину пути или None, если путь невозможен.
     """
-    if (0,0) in blocked:
+    rows = ["".join("#" if (r, c) in blocked else "." for c in range(N)) for r in range(N)]
+    grid = FlatGrid(rows)
+    start, exit_ = grid.index(0, 0), grid.index(N - 1, N - 1)
+    if not grid.open[start]:
         return None
 
-    q = deque([(0,0,0)])  # r, c, dist
-    seen = {(0,0)}
+    dist = grid_bfs(grid, [start])
+    return dist[exit_] if dist[exit_] != INF else None
+
 
-    while q:
-        r, c, d = q.popleft()
-        if (r, c) == (N-1, N-1):
-            return d
+class DisjointSet:
+    """Система непересекающихся множеств на массивах (сжатие путей + по размеру)."""
 
-        for dr, dc in DIRS:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < N and 0 <= nc < N:
-                if (nr, nc) not in blocked and (nr, nc) not in seen:
-                    seen.add((nr, nc))
-                    q.append((nr, nc, d+1))
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+        self.size = [1] * size
 
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+
+
+def _fall_times(pts: List[Point], n: int) -> List[int]:
+    """
+    Для каждой клетки (индекс x*n + y) — номер байта, который упал в неё
+    первым; len(pts), если клетка так и осталась свободной.
+    """
+    never = len(pts)
+    times = [never] * (n * n)
+    for i, (x, y) in enumerate(pts):
+        cell = x * n + y
+        if times[cell] == never:
+            times[cell] = i
+    return times
+
+
+def _neighbours(cell: int, n: int):
+    x, y = divmod(cell, n)
+    if x > 0:
+        yield cell - n
+    if x < n - 1:
+        yield cell + n
+    if y > 0:
+        yield cell - 1
+    if y < n - 1:
+        yield cell + 1
+
+
+def first_blocking_union_find(pts: List[Point], n: int = N) -> Optional[Point]:
+    """
+    Обратный ход: начинаем с поля, где упали все байты, и "поднимаем"
+    их в обратном порядке, объединяя освобождённую клетку со свободными
+    соседями. Первый байт, после подъёма которого старт и выход оказались
+    в одном множестве, и есть тот, что перекрыл путь. O(n^2 + bytes) * α.
+    """
+    times = _fall_times(pts, n)
+    never = len(pts)
+    start, exit_ = 0, n * n - 1
+    dsu = DisjointSet(n * n)
+
+    # Клетки, в которые не упало ничего, свободны с самого начала
+    for cell, t in enumerate(times):
+        if t == never:
+            for nb in _neighbours(cell, n):
+                if nb > cell and times[nb] == never:
+                    dsu.union(cell, nb)
+
+    lifted = never  # клетки с times >= lifted сейчас свободны
+
+    def connected() -> bool:
+        return (
+            times[start] >= lifted
+            and times[exit_] >= lifted
+            and dsu.find(start) == dsu.find(exit_)
+        )
+
+    if connected():
+        return None  # путь есть даже после всех байтов
+
+    for i in range(len(pts) - 1, -1, -1):
+        x, y = pts[i]
+        cell = x * n + y
+        if times[cell] != i:
+            continue  # повторное падение в уже занятую клетку
+        lifted = i
+        for nb in _neighbours(cell, n):
+            if times[nb] >= lifted:
+                dsu.union(cell, nb)
+        if connected():
+            return pts[i]
     return None
 
 
+def _reachable(times: List[int], fallen: int, n: int) -> bool:
+    """Есть ли путь от старта до выхода, когда упали первые fallen байтов."""
+    if times[0] < fallen or times[n * n - 1] < fallen:
+        return False
+    seen = bytearray(n * n)
+    seen[0] = 1
+    stack = [0]
+    goal = n * n - 1
+    while stack:
+        cell = stack.pop()
+        if cell == goal:
+            return True
+        for nb in _neighbours(cell, n):
+            if not seen[nb] and times[nb] >= fallen:
+                seen[nb] = 1
+                stack.append(nb)
+    return False
+
+
+def first_blocking_bisect(pts: List[Point], n: int = N) -> Optional[Point]:
+    """
+    Запасной способ: бинарный поиск по длине префикса байтов
+    (проходимость монотонна) — O(n^2 * log(bytes)).
+    """
+    times = _fall_times(pts, n)
+    if not _reachable(times, 0, n) or _reachable(times, len(pts), n):
+        return None
+    lo, hi = 0, len(pts)  # при lo байтах путь есть, при hi — нет
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if _reachable(times, mid, n):
+            lo = mid
+        else:
+            hi = mid
+    return pts[hi - 1]
+
+
+# Способы найти первый перекрывающий байт (solve_part2(method=...))
+FIRST_BLOCKING = {
+    "union_find": first_blocking_union_find,
+    "bisect": first_blocking_bisect,
+}
+
+
 def solve_part1(data: str) -> str:
     pts = parse(data)
 
     # первые 1024 байта блокируем
-    blocked = set(pts[:1024])
+    blocked = set(pts[:FALLEN_PART1])
 
     dist = bfs(blocked)
     return str(dist if dist is not None else "0")
 
 
-def solve_part2(data: str) -> str:
+def solve_part2(data: str, method: str = "union_find") -> str:
+    """method — ключ FIRST_BLOCKING: "union_find" (по умолчанию) или "bisect"."""
+    if method not in FIRST_BLOCKING:
+        raise ValueError(
+            f"Неизвестный способ {method!r}, ожидался один из {sorted(FIRST_BLOCKING)}"
+        )
     pts = parse(data)
 
-    blocked = set()
-    for (x, y) in pts:
-        blocked.add((x, y))
-        # Проверяем после каждого добавления
-        if bfs(blocked) is None:
-            # путь стал невозможен
-            return f"{x},{y}"
-
-    # по условию точно будет ответ
-    return "0,0"
+    blocker = FIRST_BLOCKING[method](pts)
+    if blocker is None:
+        # по условию точно будет ответ
+        return "0,0"
+    x, y = blocker
+    return f"{x},{y}"
 
 
 if __name__ == "__main__":
-    from pathlib import Path
-
     here = Path(__file__).resolve().parent
     input_path = here / "input.txt"
 
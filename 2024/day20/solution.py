@@ -1,114 +1,124 @@
-from collections import deque
+import sys
+from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен: без него работает цикл по клеткам
+    np = None
 
-DIRS4 = [(1,0), (-1,0), (0,1), (0,-1)]
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.pathfind import INF, FlatGrid, grid_bfs  # noqa: E402
 
 
 def parse(data: str):
-    grid = [list(line) for line in data.splitlines() if line.strip()]
-    R, C = len(grid), len(grid[0])
-    S = E = None
-    for r in range(R):
-        for c in range(C):
-            if grid[r][c] == "S":
-                S = (r,c)
-            elif grid[r][c] == "E":
-                E = (r,c)
-    return grid, R, C, S, E
-
-
-def bfs_from(start, grid, R, C):
-    dist = [[None]*C for _ in range(R)]
-    rq, cq = start
-    q = deque([(rq,cq)])
-    dist[rq][cq] = 0
-
-    while q:
-        r, c = q.popleft()
-        d = dist[r][c]
-        for dr, dc in DIRS4:
-            nr, nc = r+dr, c+dc
-            if 0 <= nr < R and 0 <= nc < C and grid[nr][nc] != "#" and dist[nr][nc] is None:
-                dist[nr][nc] = d+1
-                q.append((nr,nc))
-    return dist
-
-
-# --------- PART 1 Jump Deltas (exactly manhattan=2) ----------
-def gen_part1_jumps():
-    moves = []
-    for dr in range(-2,3):
-        for dc in range(-2,3):
-            if abs(dr) + abs(dc) == 2:
-                moves.append((dr,dc))
-    return moves
+    grid = FlatGrid.parse(data)
+    return grid, grid.height, grid.width, grid.find("S"), grid.find("E")
 
 
-# --------- PART 2 Jump Deltas (2..20 manhattan) ----------
-def gen_part2_jumps():
+def gen_jumps(radius: int, min_jump: int = 2):
+    """Все прыжки (dr, dc) с min_jump <= |dr| + |dc| <= radius."""
     moves = []
-    for dr in range(-20,21):
-        for dc in range(-20,21):
+    for dr in range(-radius, radius + 1):
+        for dc in range(-radius, radius + 1):
             md = abs(dr) + abs(dc)
-            if 2 <= md <= 20:
+            if min_jump <= md <= radius:
                 moves.append((dr,dc))
     return moves
 
 
-PART1_JUMPS = gen_part1_jumps()
-PART2_JUMPS = gen_part2_jumps()
-
-
-def solve_generic(data: str, jumps, threshold: int) -> str:
-    grid, R, C, S, E = parse(data)
-    if S is None or E is None:
-        return "0"
+PART1_RADIUS = 2   # часть 1: прыжок ровно через одну стену
+PART2_RADIUS = 20  # часть 2: прыжок длиной 2..20
+THRESHOLD = 100    # threshold для реального инпута
 
-    distS = bfs_from(S, grid, R, C)
-    distE = bfs_from(E, grid, R, C)
 
-    normal = distS[E[0]][E[1]]
-    if normal is None:
-        return "0"
+def _count_numpy(distS, distE, grid, R: int, C: int, jumps, limit: int) -> int:
+    """
+    Каждый прыжок (dr, dc) — одно сравнение сдвинутых карт расстояний:
+    distS[r, c] + |dr| + |dc| + distE[r + dr, c + dc] <= limit.
+    """
+    stride = grid.stride
+    # Плоские array('q') с рамкой -> матрицы R x C исходной карты
+    ds = np.frombuffer(distS, dtype=np.int64).reshape(-1, stride)[1:R + 1, 1:C + 1]
+    de = np.frombuffer(distE, dtype=np.int64).reshape(-1, stride)[1:R + 1, 1:C + 1]
+    # INF + INF переполнил бы int64; всё, что больше limit, и так не пройдёт
+    cap = max(limit, 0) + 1
+    ds = np.minimum(ds, cap)
+    de = np.minimum(de, cap)
 
+    count = 0
+    for dr, dc in jumps:
+        r0, r1 = max(0, -dr), R - max(0, dr)
+        c0, c1 = max(0, -dc), C - max(0, dc)
+        if r0 >= r1 or c0 >= c1:
+            continue
+        src = ds[r0:r1, c0:c1]
+        dst = de[r0 + dr:r1 + dr, c0 + dc:c1 + dc]
+        count += int(np.count_nonzero(src + dst <= limit - abs(dr) - abs(dc)))
+    return count
+
+
+def _count_lists(distS, distE, grid, R: int, C: int, jumps, limit: int) -> int:
+    # списки, а не array: в горячем цикле не нужно заново упаковывать числа
+    distS = distS.tolist()
+    distE = distE.tolist()
+
+    # Прыжок (dr, dc) на плоской карте — сдвиг индекса на dr * stride + dc
+    stride = grid.stride
+    moves = [(dr, dc, dr * stride + dc, abs(dr) + abs(dc)) for dr, dc in jumps]
     count = 0
 
     for r in range(R):
+        u = grid.index(r, 0)
         for c in range(C):
-            if distS[r][c] is None:
+            d1 = distS[u + c]
+            if d1 == INF:
                 continue
-            d1 = distS[r][c]
+            # экономия >= threshold  <=>  jump_cost + distE <= rest;
+            # у стен и недостижимых клеток distE == INF, они не пройдут сами
+            rest = limit - d1
 
-            for dr, dc in jumps:
+            for dr, dc, offset, jump_cost in moves:
                 nr, nc = r+dr, c+dc
                 if not (0 <= nr < R and 0 <= nc < C):
                     continue
-                if distE[nr][nc] is None:
-                    continue
-                if grid[nr][nc] == "#":
-                    continue
+                if distE[u + c + offset] + jump_cost <= rest:
+                    count += 1
+    return count
 
-                jump_cost = abs(dr) + abs(dc)
-                total = d1 + jump_cost + distE[nr][nc]
-                saved = normal - total
 
-                if saved >= threshold:
-                    count += 1
+def count_cheats(data: str, radius: int, threshold: int) -> int:
+    """
+    Сколько читов длиной до radius экономят не меньше threshold шагов.
+    Чит из клетки a в клетку b стоит distS[a] + |a - b| + distE[b] шагов
+    вместо обычного distS[E]; пары (a, b) перебираются по сдвигам b - a.
+    """
+    grid, R, C, S, E = parse(data)
+    if S is None or E is None:
+        return 0
+
+    distS = grid_bfs(grid, [S])
+    distE = grid_bfs(grid, [E])
+
+    normal = distS[E]
+    if normal == INF:
+        return 0
 
-    return str(count)
+    count = _count_numpy if np is not None else _count_lists
+    return count(distS, distE, grid, R, C, gen_jumps(radius), normal - threshold)
 
 
 def solve_part1(data: str) -> str:
-    # threshold для реального инпута = 100
-    return solve_generic(data, PART1_JUMPS, 100)
+    return str(count_cheats(data, PART1_RADIUS, THRESHOLD))
 
 
 def solve_part2(data: str) -> str:
-    return solve_generic(data, PART2_JUMPS, 100)
+    return str(count_cheats(data, PART2_RADIUS, THRESHOLD))
 
 
 if __name__ == "__main__":
-    from pathlib import Path
     here = Path(__file__).resolve().parent
     raw = (here/"input.txt").read_text() if (here/"input.txt").exists() else ""
     print("Part 1:", solve_part1(raw))
@@ -1,3 +1,11 @@
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен: без него работает цикл на списках
+    np = None
+
+
 def parse(data: str):
     seeds = []
     for line in data.splitlines():
@@ -8,6 +16,15 @@ def parse(data: str):
 
 
 MASK = 0xFFFFFF  # 2^24 - 1
+STEPS = 2000
+
+# Окно из 4 дельт (каждая в -9..9) кодируется числом в системе по основанию 19
+DELTA_BASE = 19
+WINDOW_KEYS = DELTA_BASE ** 4
+
+# Сколько покупателей обрабатывать одной пачкой в векторном пути:
+# на каждого нужна битовая маска "окно уже встречалось" (~16 КБ, ~64 МБ на пачку)
+BATCH = 4096
 
 
 def next_num(n: int) -> int:
@@ -24,6 +41,29 @@ def next_num(n: int) -> int:
     return n
 
 
+def _next_nums(n):
+    """next_num сразу для массива uint32 (значения < 2^24, сдвиги не теряют нужных бит)."""
+    n = ((n << 6) & MASK) ^ n
+    n = (n >> 5) ^ n
+    return ((n << 11) & MASK) ^ n
+
+
+def _sum_after(seeds: List[int]) -> int:
+    if np is not None:
+        n = np.array(seeds, dtype=np.uint32)
+        for _ in range(STEPS):
+            n = _next_nums(n)
+        return int(n.sum(dtype=np.uint64))
+
+    total = 0
+    for seed in seeds:
+        n = seed
+        for _ in range(STEPS):
+            n = next_num(n)
+        total += n
+    return total
+
+
 def solve_part1(data: str) -> str:
     """
     Part 1:
@@ -32,16 +72,75 @@ def solve_part1(data: str) -> str:
 
     Ответ = сумма этих 2000-х секретов по всем покупателям.
     """
-    seeds = parse(data)
-    total = 0
+    return str(_sum_after(parse(data)))
 
-    for seed in seeds:
-        n = seed
-        for _ in range(2000):
-            n = next_num(n)
-        total += n
 
-    return str(total)
+def _window_totals_numpy(seeds: List[int]):
+    """
+    Векторный путь: все покупатели пачки шагают одновременно.
+    Ключ окна катится как key = (key - старшая дельта) * 19 + новая дельта,
+    а "первое появление окна у покупателя" отмечается в битовой маске пачки
+    (по 19^4 бит на покупателя, с выравниванием до байта). Цены первых
+    появлений копятся по пачке и суммируются одним bincount.
+    """
+    totals = np.zeros(WINDOW_KEYS, dtype=np.int64)
+    stride = (WINDOW_KEYS + 7) // 8 * 8  # бит на покупателя
+    top = DELTA_BASE ** 3
+    for start in range(0, len(seeds), BATCH):
+        n = np.array(seeds[start:start + BATCH], dtype=np.uint32)
+        base = np.arange(len(n), dtype=np.int64) * stride
+        seen = np.zeros(len(n) * stride // 8, dtype=np.uint8)
+        keys, prices = [], []
+
+        n = _next_nums(n)
+        prev = (n % 10).astype(np.int32)
+        key = np.zeros(len(n), dtype=np.int32)
+        deltas = []  # сдвинутые на +9 дельты текущего окна, старшая первой
+        for t in range(1, STEPS):
+            n = _next_nums(n)
+            price = (n % 10).astype(np.int32)
+            delta = price - prev + 9
+            prev = price
+            if t > 4:
+                key -= deltas.pop(0) * top
+            key = key * DELTA_BASE + delta
+            deltas.append(delta)
+            if t < 4:
+                continue
+            idx = base + key
+            byte = idx >> 3
+            bit = np.left_shift(1, idx & 7).astype(np.uint8)
+            cur = seen.take(byte)
+            fresh = (cur & bit) == 0
+            np.put(seen, byte, cur | bit)
+            keys.append(key[fresh])
+            prices.append(price[fresh])
+        totals += np.bincount(
+            np.concatenate(keys), weights=np.concatenate(prices), minlength=WINDOW_KEYS
+        ).astype(np.int64)
+    return totals
+
+
+def _window_totals_python(seeds: List[int]) -> List[int]:
+    """
+    Путь без NumPy: тот же катящийся ключ, а вместо словаря "уже видели"
+    — общий массив с номером последнего покупателя, у которого было окно.
+    """
+    totals = [0] * WINDOW_KEYS
+    last_buyer = [-1] * WINDOW_KEYS
+    for buyer, seed in enumerate(seeds):
+        n = next_num(seed)
+        prev = n % 10
+        key = 0
+        for t in range(1, STEPS):
+            n = next_num(n)
+            price = n % 10
+            key = (key * DELTA_BASE + price - prev + 9) % WINDOW_KEYS
+            prev = price
+            if t >= 4 and last_buyer[key] != buyer:
+                last_buyer[key] = buyer
+                totals[key] += price
+    return totals
 
 
 def solve_part2(data: str) -> str:
@@ -54,38 +153,16 @@ def solve_part2(data: str) -> str:
       - для каждой последовательности из 4 дельт берём первую появившуюся цену,
       - глобально суммируем цены по одинаковым ключам (4 дельты),
       - берём максимальную сумму.
-    """
-    from collections import defaultdict
 
+    Ключ — 4 дельты как число по основанию 19, суммы — массив на 19^4 ячеек.
+    """
     seeds = parse(data)
-    key_sum = defaultdict(int)  # key(4 дельты) -> суммарные бананы
-
-    for seed in seeds:
-        n = seed
-        prices = []
-        for _ in range(2000):
-            n = next_num(n)
-            prices.append(n % 10)
-
-        # diffs[i] = prices[i+1] - prices[i], длина 1999
-        diffs = [prices[i + 1] - prices[i] for i in range(len(prices) - 1)]
-
-        # для этого покупателя запоминаем первую цену для каждого ключа
-        seen_first = {}  # key -> price
-
-        # окно по 4 дельтам: (diffs[i-3], ..., diffs[i])
-        # цена при этом — prices[i+1]
-        for i in range(3, len(diffs)):
-            key = (diffs[i - 3], diffs[i - 2], diffs[i - 1], diffs[i])
-            if key not in seen_first:
-                price_at_first = prices[i + 1]
-                seen_first[key] = price_at_first
-
-        # добавляем в глобальную сумму
-        for key, price in seen_first.items():
-            key_sum[key] += price
-
-    best = max(key_sum.values()) if key_sum else 0
+    if not seeds:
+        return "0"
+    if np is not None:
+        best = int(_window_totals_numpy(seeds).max())
+    else:
+        best = max(_window_totals_python(seeds))
     return str(best)
 
 
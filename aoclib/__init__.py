@@ -0,0 +1,7 @@
+"""
+Общий код для решений Advent of Code из этого репозитория.
+
+Решения в <год>/dayNN/solution.py остаются самостоятельными скриптами;
+сюда выносится только то, что используется сразу несколькими днями
+или служебными скриптами в корне (run_all.py, start.py).
+"""
@@ -0,0 +1,453 @@
+"""
+Общий движок клеточных автоматов на битовых досках (bitboards):
+
+  * 2015/18  — "Жизнь" 100x100, в части 2 углы залипли включёнными
+  * 2016/18  — ряды ловушек: одномерный элементарный автомат (правило 90)
+  * 2017/22  — вирус-носитель: "муравей" с многими состояниями клетки
+  * 2018/18  — лес/лесопилки: три состояния клетки
+  * 2019/24  — жуки: "Жизнь" на 5x5, в части 2 — рекурсивные уровни
+
+Поле h x w хранится одним большим int: клетка (x, y) — бит y*(w+1)+x.
+Столбец w в каждой строке — всегда нулевой "зазор", поэтому сдвиги
+доски на ±1 не переносят клетки через край строки, а лишние биты после
+шага срезаются одной маской. Соседи получаются сдвигами всей доски,
+а их число считается побитно (bit-sliced): counts.planes[i] — i-й бит
+числа соседей сразу у всех клеток. Так один шаг поля 100x100 — это
+пара десятков операций над 10-килобитными числами вместо 80 000
+обращений к спискам.
+
+    grid, (board,) = BitGrid.parse(text, "#")
+    life = Automaton(grid, life_rule(birth={3}, survive={2, 3}))
+    board, = life.run((board,), 100)
+    print(grid.population(board))
+
+Правило — любая функция rule(states, count) -> новые states, где states —
+кортеж досок (по одной на каждое "непустое" состояние клетки),
+а count(board) возвращает Counts с числом соседей из board.
+Клетки из маски stuck не меняются никогда.
+"""
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+try:
+    popcount = int.bit_count  # Python 3.10+
+except AttributeError:  # pragma: no cover - старые версии
+    def popcount(value: int) -> int:
+        return bin(value).count("1")
+
+
+# Окрестности: смещения (dx, dy) соседей
+MOORE = (
+    (-1, -1), (0, -1), (1, -1),
+    (-1, 0), (1, 0),
+    (-1, 1), (0, 1), (1, 1),
+)
+VON_NEUMANN = ((0, -1), (-1, 0), (1, 0), (0, 1))
+
+States = Tuple[int, ...]
+
+
+class Counts:
+    """
+    Число соседей у всех клеток сразу: planes[i] — i-й двоичный разряд.
+    Результаты eq/ge/isin — доски, обрезанные маской поля.
+    """
+
+    __slots__ = ("planes", "mask")
+
+    def __init__(self, mask: int, planes: Iterable[int] = ()) -> None:
+        self.mask = mask
+        self.planes: List[int] = list(planes)
+
+    def add(self, board: int, weight_bit: int = 0) -> None:
+        """Прибавить 2**weight_bit в каждой клетке, где board установлен."""
+        planes = self.planes
+        while len(planes) < weight_bit:
+            planes.append(0)
+        carry = board
+        i = weight_bit
+        while carry:
+            if i == len(planes):
+                planes.append(carry)
+                return
+            plane = planes[i]
+            planes[i] = plane ^ carry
+            carry &= plane
+            i += 1
+
+    def eq(self, n: int) -> int:
+        """Клетки, у которых ровно n соседей."""
+        if n >> len(self.planes):
+            return 0
+        result = self.mask
+        for i, plane in enumerate(self.planes):
+            result &= plane if n >> i & 1 else ~plane
+        return result
+
+    def ge(self, n: int) -> int:
+        """Клетки, у которых не меньше n соседей."""
+        below = 0
+        for k in range(n):
+            below |= self.eq(k)
+        return self.mask & ~below
+
+    def isin(self, values: Iterable[int]) -> int:
+        """Клетки, число соседей которых входит в values."""
+        result = 0
+        for n in values:
+            result |= self.eq(n)
+        return result
+
+
+class BitGrid:
+    """Геометрия поля width x height и перевод между доской и текстом."""
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.stride = width + 1  # +1 — нулевой столбец-зазор
+        row = (1 << width) - 1
+        mask = 0
+        for y in range(height):
+            mask |= row << (y * self.stride)
+        self.mask = mask
+
+    @classmethod
+    def parse(cls, text: str, symbols: str) -> Tuple["BitGrid", States]:
+        """
+        Разбор текстовой карты: по доске на каждый символ из symbols,
+        остальные символы — пустые клетки.
+        """
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        if not lines:
+            raise ValueError("Пустая карта")
+        grid = cls(len(lines[0]), len(lines))
+        boards = [0] * len(symbols)
+        for y, line in enumerate(lines):
+            if len(line) != grid.width:
+                raise ValueError("Строки карты должны быть одинаковой длины")
+            for x, ch in enumerate(line):
+                k = symbols.find(ch)
+                if k >= 0:
+                    boards[k] |= grid.cell(x, y)
+        return grid, tuple(boards)
+
+    def cell(self, x: int, y: int) -> int:
+        return 1 << (y * self.stride + x)
+
+    def is_set(self, board: int, x: int, y: int) -> bool:
+        return bool(board >> (y * self.stride + x) & 1)
+
+    def row(self, y: int) -> int:
+        return ((1 << self.width) - 1) << (y * self.stride)
+
+    def column(self, x: int) -> int:
+        mask = 0
+        for y in range(self.height):
+            mask |= self.cell(x, y)
+        return mask
+
+    def corners(self) -> int:
+        w, h = self.width - 1, self.height - 1
+        return self.cell(0, 0) | self.cell(w, 0) | self.cell(0, h) | self.cell(w, h)
+
+    def neighbour(self, board: int, dx: int, dy: int) -> int:
+        """Доска, где в клетке (x, y) стоит значение board из (x+dx, y+dy)."""
+        shift = dy * self.stride + dx
+        return board >> shift if shift >= 0 else board << -shift
+
+    def counts(self, board: int, neighbourhood=MOORE) -> Counts:
+        counts = Counts(self.mask)
+        for dx, dy in neighbourhood:
+            counts.add(self.neighbour(board, dx, dy))
+        return counts
+
+    def population(self, board: int) -> int:
+        return popcount(board & self.mask)
+
+    def to_rows(self, board: int) -> List[List[bool]]:
+        return [
+            [self.is_set(board, x, y) for x in range(self.width)]
+            for y in range(self.height)
+        ]
+
+    def render(self, states: States, symbols: str, empty: str = ".") -> str:
+        lines = []
+        for y in range(self.height):
+            chars = []
+            for x in range(self.width):
+                ch = empty
+                for board, symbol in zip(states, symbols):
+                    if self.is_set(board, x, y):
+                        ch = symbol
+                        break
+                chars.append(ch)
+            lines.append("".join(chars))
+        return "\n".join(lines)
+
+
+Rule = Callable[[States, Callable[[int], Counts]], States]
+
+
+def life_rule(birth: Iterable[int], survive: Iterable[int]) -> Rule:
+    """Правило "Жизни" B/S: одно состояние, рождение и выживание по числу соседей."""
+    birth = frozenset(birth)
+    survive = frozenset(survive)
+
+    def rule(states: States, count: Callable[[int], Counts]) -> States:
+        alive, = states
+        c = count(alive)
+        return ((c.isin(birth) & ~alive) | (c.isin(survive) & alive),)
+
+    return rule
+
+
+class Automaton:
+    """Автомат на поле BitGrid с подключаемым правилом и залипшими клетками."""
+
+    def __init__(
+        self, grid: BitGrid, rule: Rule, neighbourhood=MOORE, stuck: int = 0
+    ) -> None:
+        self.grid = grid
+        self.rule = rule
+        self.neighbourhood = neighbourhood
+        self.stuck = stuck
+
+    def count(self, board: int) -> Counts:
+        return self.grid.counts(board, self.neighbourhood)
+
+    def step(self, states: States) -> States:
+        mask = self.grid.mask
+        new = self.rule(states, self.count)
+        stuck = self.stuck
+        if stuck:
+            live = mask & ~stuck
+            return tuple((n & live) | (old & stuck) for n, old in zip(new, states))
+        return tuple(n & mask for n in new)
+
+    def run(self, states: States, generations: int) -> States:
+        for _ in range(generations):
+            states = self.step(states)
+        return states
+
+    def iterate(self, states: States) -> Iterator[States]:
+        """Бесконечная последовательность поколений, начиная с исходного."""
+        while True:
+            yield states
+            states = self.step(states)
+
+
+class RecursiveLife:
+    """
+    "Жизнь" на вложенных квадратных полях нечётного размера (2019/24):
+    центральной клетки нет, вместо неё — целое поле уровня z+1,
+    а края поля граничат с клетками вокруг центра уровня z-1.
+    Соседство — фон Неймана (4 соседа).
+    """
+
+    def __init__(self, size: int, birth: Iterable[int], survive: Iterable[int]) -> None:
+        if size % 2 == 0:
+            raise ValueError("Размер рекурсивного поля должен быть нечётным")
+        self.grid = grid = BitGrid(size, size)
+        self.birth = frozenset(birth)
+        self.survive = frozenset(survive)
+        c = size // 2
+        self.centre = grid.cell(c, c)
+        self.mask = grid.mask & ~self.centre
+        # Клетки вокруг центра и края внутреннего поля, к которым они примыкают
+        self._inner_sides = [
+            (grid.cell(c, c - 1), grid.row(0)),
+            (grid.cell(c - 1, c), grid.column(0)),
+            (grid.cell(c + 1, c), grid.column(size - 1)),
+            (grid.cell(c, c + 1), grid.row(size - 1)),
+        ]
+        # Края этого поля и клетки внешнего уровня, с которыми они граничат
+        self._outer_sides = [(edge, side) for side, edge in self._inner_sides]
+
+    def _counts(self, board: int, outer: int, inner: int) -> Counts:
+        grid = self.grid
+        counts = Counts(self.mask)
+        for dx, dy in VON_NEUMANN:
+            counts.add(grid.neighbour(board, dx, dy))
+        if outer:
+            for edge, side in self._outer_sides:
+                if outer & side:
+                    counts.add(edge)
+        if inner:
+            for side, edge in self._inner_sides:
+                n = popcount(inner & edge)
+                bit = 0
+                while n:
+                    if n & 1:
+                        counts.add(side, bit)
+                    n >>= 1
+                    bit += 1
+        return counts
+
+    def step(self, levels: Dict[int, int]) -> Dict[int, int]:
+        """Один шаг; levels — {глубина: доска}, пустые уровни не хранятся."""
+        if not levels:
+            return {}
+        mask = self.mask
+        birth, survive = self.birth, self.survive
+        new_levels: Dict[int, int] = {}
+        for z in range(min(levels) - 1, max(levels) + 2):
+            board = levels.get(z, 0)
+            outer = levels.get(z - 1, 0)
+            inner = levels.get(z + 1, 0)
+            if not (board or outer or inner):
+                continue
+            c = self._counts(board, outer, inner)
+            new = ((c.isin(birth) & ~board) | (c.isin(survive) & board)) & mask
+            if new:
+                new_levels[z] = new
+        return new_levels
+
+    def run(self, levels: Dict[int, int], generations: int) -> Dict[int, int]:
+        for _ in range(generations):
+            levels = self.step(levels)
+        return levels
+
+
+# ---------- одномерные элементарные автоматы ----------
+
+# Линейные правила сводятся к XOR соседей: (левый, центр, правый)
+_XOR_RULES = {
+    60: (True, True, False),
+    90: (True, False, True),
+    102: (False, True, True),
+    150: (True, True, True),
+}
+
+
+def elementary_step(rule: int, width: int) -> Callable[[int], int]:
+    """
+    Функция одного шага элементарного автомата с номером правила rule
+    (нумерация Вольфрама) на ряду из width клеток; за краями — нули.
+    Бит i ряда — клетка i, её левый сосед — бит i-1.
+    """
+    mask = (1 << width) - 1
+    if rule in _XOR_RULES:
+        use_left, use_centre, use_right = _XOR_RULES[rule]
+
+        def step(row: int) -> int:
+            result = row if use_centre else 0
+            if use_left:
+                result ^= row << 1
+            if use_right:
+                result ^= row >> 1
+            return result & mask
+
+        return step
+
+    # Общий случай: сумма произведений по установленным битам правила
+    patterns = [p for p in range(8) if rule >> p & 1]
+
+    def step(row: int) -> int:
+        left = row << 1
+        right = row >> 1
+        result = 0
+        for p in patterns:
+            term = mask
+            term &= left if p & 4 else ~left
+            term &= row if p & 2 else ~row
+            term &= right if p & 1 else ~right
+            result |= term
+        return result & mask
+
+    return step
+
+
+def elementary_rows(row: int, width: int, rule: int, count: int) -> Iterator[int]:
+    """Первые count рядов элементарного автомата, начиная с row."""
+    step = elementary_step(rule, width)
+    for _ in range(count):
+        yield row
+        row = step(row)
+
+
+# ---------- "муравьи" (тьюрмиты) на растущем поле ----------
+
+_EDGE = 255  # клетка-граница: при наступлении на неё поле расширяется
+
+
+class Turmite:
+    """
+    Носитель, бродящий по бесконечному полю с клетками-состояниями 0..k-1
+    (2017/22). На каждом шаге: поворот turns[s] (0 — прямо, 1 — направо,
+    2 — назад, 3 — налево), клетка переходит в next_state[s], шаг вперёд.
+
+    Поле — плоский bytearray с рамкой из _EDGE; наступив на рамку,
+    носитель раздвигает поле вдвое, так что проверки границ в горячем
+    цикле нет.
+    """
+
+    DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))  # вверх, вправо, вниз, влево
+
+    def __init__(
+        self, turns: Sequence[int], next_state: Sequence[int], cells: Dict[Tuple[int, int], int]
+    ) -> None:
+        if len(turns) != len(next_state):
+            raise ValueError("turns и next_state должны быть одной длины")
+        self.turns = tuple(turns)
+        self.next_state = tuple(next_state)
+        self.x = self.y = 0
+        self.direction = 0  # вверх
+        span = max([8] + [max(abs(x), abs(y)) for x, y in cells])
+        self._allocate(2 * span + 3, cells)
+
+    def _allocate(self, size: int, cells: Dict[Tuple[int, int], int]) -> None:
+        self.size = size
+        self.half = size // 2
+        grid = bytearray(size * size)
+        grid[:size] = bytes([_EDGE]) * size
+        grid[-size:] = bytes([_EDGE]) * size
+        for i in range(0, size * size, size):
+            grid[i] = grid[i + size - 1] = _EDGE
+        for (x, y), state in cells.items():
+            grid[(y + self.half) * size + x + self.half] = state
+        self.grid = grid
+
+    def cells(self) -> Dict[Tuple[int, int], int]:
+        size, half, grid = self.size, self.half, self.grid
+        result = {}
+        for i, state in enumerate(grid):
+            if state and state != _EDGE:
+                y, x = divmod(i, size)
+                result[(x - half, y - half)] = state
+        return result
+
+    def run(self, bursts: int, watch: int) -> int:
+        """Сделать bursts шагов; вернуть, сколько клеток перешло в состояние watch."""
+        turns = self.turns
+        # (состояние, направление) -> новое направление; одно обращение к списку
+        new_dir = [(d + turns[s]) & 3 for s in range(len(turns)) for d in range(4)]
+        next_state = self.next_state
+        hits_state = [s == watch for s in next_state]
+        grid = self.grid
+        size = self.size
+        offsets = [dy * size + dx for dx, dy in self.DIRECTIONS]
+        p = (self.y + self.half) * size + self.x + self.half
+        d = self.direction
+        hits = 0
+        for _ in range(bursts):
+            s = grid[p]
+            if s == _EDGE:
+                self._store(p, d)
+                self._allocate(self.size * 2 + 1, self.cells())
+                grid = self.grid
+                size = self.size
+                offsets = [dy * size + dx for dx, dy in self.DIRECTIONS]
+                p = (self.y + self.half) * size + self.x + self.half
+                s = grid[p]
+            d = new_dir[s << 2 | d]
+            grid[p] = next_state[s]
+            if hits_state[s]:
+                hits += 1
+            p += offsets[d]
+        self._store(p, d)
+        return hits
+
+    def _store(self, p: int, d: int) -> None:
+        y, x = divmod(p, self.size)
+        self.x, self.y = x - self.half, y - self.half
+        self.direction = d
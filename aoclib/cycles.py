@@ -0,0 +1,77 @@
+"""
+Перемотка длинных симуляций через обнаружение цикла:
+
+  * 2017/16 — танец программ, 10^9 повторов
+  * 2018/12 — горшки с растениями: узор стабилизируется и едет вправо
+  * 2018/18 — лес и лесопилки, 10^9 минут
+  * 2023/14 — наклоны платформы с камнями, 10^9 циклов
+
+    state = fast_forward(start, step, 1_000_000_000, key=encode)
+
+step(state) -> следующее состояние; key(state) -> компактный хэшируемый
+отпечаток состояния (bytes, int-битсет, строка), по которому ищется повтор.
+Если key не задан, отпечатком служит само состояние.
+
+Поиск цикла — алгоритм Брента: хранится только одно "опорное" состояние
+(его ключ и 64-битный hash()), которое переставляется вперёд на шагах
+1, 2, 4, 8, ... Повтор сначала ловится по совпадению хэшей, а затем
+подтверждается полным сравнением ключей, так что коллизия хэша не даёт
+неверный ответ. Памяти нужно O(1) при любой длине предпериода и периода;
+цена — не больше ~2 лишних периодов шагов по сравнению со словарём
+всех состояний.
+
+Когда ключ повторился, период p известен точно, и оставшиеся шаги
+сокращаются по модулю p. Если состояние повторяется не целиком, а с
+дрейфом (узор тот же, но сдвинут — как в 2018/12), extrapolate(state,
+earlier, cycles) должен вернуть состояние через cycles периодов, зная
+текущее состояние и состояние ровно на период раньше. В этом случае
+step обязан возвращать новый объект, а не менять старый на месте.
+"""
+from typing import Callable, Hashable, Optional, TypeVar
+
+S = TypeVar("S")
+
+
+def fast_forward(
+    state: S,
+    step: Callable[[S], S],
+    steps: int,
+    key: Optional[Callable[[S], Hashable]] = None,
+    extrapolate: Optional[Callable[[S, S, int], S]] = None,
+) -> S:
+    """Состояние после steps применений step к state."""
+    anchor_key = key(state) if key is not None else state
+    anchor_hash = hash(anchor_key)
+    anchor = state
+    anchor_index = 0
+    power = 1
+
+    # Исходное состояние сравнивается всегда: у обратимых шагов
+    # (перестановки) предпериода нет, и цикл ловится ровно за один период
+    start_key, start_hash = anchor_key, anchor_hash
+
+    current = state
+    i = 0
+    while i < steps:
+        current = step(current)
+        i += 1
+        current_key = key(current) if key is not None else current
+        current_hash = hash(current_key)
+        if current_hash == start_hash and current_key == start_key:
+            earlier, period = state, i
+        elif current_hash == anchor_hash and current_key == anchor_key:
+            earlier, period = anchor, i - anchor_index
+        else:
+            if i - anchor_index == power:
+                # Брент: опорная точка прыгает вперёд, окно поиска удваивается
+                anchor_key, anchor_hash = current_key, current_hash
+                anchor, anchor_index = current, i
+                power *= 2
+            continue
+        cycles, rest = divmod(steps - i, period)
+        if cycles and extrapolate is not None:
+            current = extrapolate(current, earlier, cycles)
+        for _ in range(rest):
+            current = step(current)
+        return current
+    return current
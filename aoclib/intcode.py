@@ -0,0 +1,270 @@
+"""
+Общая Intcode-машина для 2019 года (дни 02, 05, 07, 09, 11, 13, 15, 17,
+19, 21, 23, 25).
+
+    comp = Intcode(program, inputs=[1])
+    comp.run()                      # до остановки или до нехватки ввода
+    print(comp.take_outputs())
+
+    comp = Intcode(program)
+    comp.add_input(5)
+    value = comp.run_until_output()   # None — машина остановилась/ждёт ввод
+
+Что сделано ради скорости:
+  * декодирование инструкции (opcode + режимы параметров) берётся из
+    заранее построенной таблицы DECODE по самому слову инструкции — без
+    % и // на каждом шаге; так как ключ — значение ячейки, а не адрес,
+    таблица остаётся верной и для самомодифицирующегося кода;
+  * память — один плоский список; за пределами программы он растёт лениво:
+    обращение за конец даёт IndexError, память расширяется, и
+    инструкция выполняется заново (до записи результата она ничего не меняет);
+  * весь цикл исполнения — одна функция с локальными переменными,
+    ввод/вывод — через collections.deque.
+
+Снимки и ветвление (для поиска по состояниям, дни 15, 19, 25):
+
+    checkpoint = comp.snapshot()          # O(1): память не копируется
+    child = Intcode.from_snapshot(checkpoint)
+    other = comp.fork()                   # O(1) копия работающей машины
+
+Память разделяется по принципу copy-on-write: снимок и все машины,
+созданные из него, ссылаются на один список, а копию своей памяти
+машина делает только при первом запуске после ветвления. Поэтому
+ветки, которые так и не были запущены (отсечённые в BFS/DFS),
+ничего не стоят. Писать в comp.mem напрямую у машины, участвующей
+в ветвлении, можно только после own_memory().
+"""
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+# Состояния, на которых останавливается исполнение
+HALTED = "halted"
+NEED_INPUT = "need_input"
+OUTPUT = "output"
+
+# Сколько параметров у каждого opcode
+_ARITY = {1: 3, 2: 3, 3: 1, 4: 1, 5: 2, 6: 2, 7: 3, 8: 3, 9: 1, 99: 0}
+
+
+def _build_decode_table() -> Dict[int, Tuple[int, int, int, int]]:
+    """Слово инструкции -> (opcode, mode1, mode2, mode3) для всех допустимых слов."""
+    table = {}
+    for opcode, arity in _ARITY.items():
+        for m1 in range(3):
+            for m2 in range(3):
+                for m3 in range(3):
+                    modes = (m1, m2, m3)
+                    # Режимы у несуществующих параметров должны быть нулями
+                    if any(modes[i] for i in range(arity, 3)):
+                        continue
+                    word = opcode + 100 * m1 + 1000 * m2 + 10000 * m3
+                    table[word] = (opcode, m1, m2, m3)
+    return table
+
+
+DECODE = _build_decode_table()
+
+
+def parse_program(data: str) -> List[int]:
+    """Разбор Intcode-программы: числа через запятую (возможны переводы строк)."""
+    cleaned = data.replace("\n", ",")
+    return [int(x) for x in cleaned.split(",") if x.strip()]
+
+
+class IntcodeSnapshot:
+    """Неизменяемый снимок состояния машины (см. Intcode.snapshot)."""
+
+    __slots__ = ("mem", "ip", "rb", "halted", "inputs", "outputs")
+
+    def __init__(self, mem, ip, rb, halted, inputs, outputs) -> None:
+        self.mem: List[int] = mem  # общий список, не изменяется
+        self.ip: int = ip
+        self.rb: int = rb
+        self.halted: bool = halted
+        self.inputs: Tuple[int, ...] = inputs
+        self.outputs: Tuple[int, ...] = outputs
+
+
+class Intcode:
+    """
+    Intcode-машина с относительной базой и очередями ввода/вывода.
+
+    Состояние открыто: mem, ip, rb (relative base), inputs, outputs, halted.
+    """
+
+    def __init__(self, program: Iterable[int], inputs: Iterable[int] = ()) -> None:
+        self.mem: List[int] = list(program)
+        self.ip = 0
+        self.rb = 0
+        self.halted = False
+        self.inputs: Deque[int] = deque(inputs)
+        self.outputs: Deque[int] = deque()
+        # True — список mem разделён со снимком/другой машиной (copy-on-write)
+        self._shared = False
+
+    # ---------- снимки и ветвление ----------
+
+    def snapshot(self) -> IntcodeSnapshot:
+        """Снимок текущего состояния за O(1) (память разделяется)."""
+        self._shared = True
+        return IntcodeSnapshot(
+            self.mem, self.ip, self.rb, self.halted,
+            tuple(self.inputs), tuple(self.outputs),
+        )
+
+    @classmethod
+    def from_snapshot(cls, snap: IntcodeSnapshot) -> "Intcode":
+        """Новая машина в состоянии снимка; память скопируется при первом запуске."""
+        c = cls.__new__(cls)
+        c.mem = snap.mem
+        c.ip = snap.ip
+        c.rb = snap.rb
+        c.halted = snap.halted
+        c.inputs = deque(snap.inputs)
+        c.outputs = deque(snap.outputs)
+        c._shared = True
+        return c
+
+    def restore(self, snap: IntcodeSnapshot) -> None:
+        """Вернуть эту машину в состояние снимка."""
+        self.mem = snap.mem
+        self.ip = snap.ip
+        self.rb = snap.rb
+        self.halted = snap.halted
+        self.inputs = deque(snap.inputs)
+        self.outputs = deque(snap.outputs)
+        self._shared = True
+
+    def fork(self) -> "Intcode":
+        """Независимая копия работающей машины (память — copy-on-write)."""
+        self._shared = True
+        c = Intcode.__new__(Intcode)
+        c.mem = self.mem
+        c.ip = self.ip
+        c.rb = self.rb
+        c.halted = self.halted
+        c.inputs = deque(self.inputs)
+        c.outputs = deque(self.outputs)
+        c._shared = True
+        return c
+
+    clone = fork
+
+    def own_memory(self) -> List[int]:
+        """Получить собственную (неразделённую) копию памяти для прямой записи."""
+        if self._shared:
+            self.mem = self.mem[:]
+            self._shared = False
+        return self.mem
+
+    # ---------- ввод / вывод ----------
+
+    def add_input(self, *values: int) -> None:
+        self.inputs.extend(values)
+
+    def add_ascii(self, text: str) -> None:
+        """ASCII-ввод (дни 17, 21, 25): каждый символ — отдельное число."""
+        self.inputs.extend(map(ord, text))
+
+    def take_outputs(self) -> List[int]:
+        """Забрать и очистить накопленный вывод."""
+        result = list(self.outputs)
+        self.outputs.clear()
+        return result
+
+    def take_ascii(self) -> str:
+        """Забрать вывод как текст (значения >= 128 пропускаются)."""
+        return "".join(chr(v) for v in self.take_outputs() if v < 128)
+
+    # ---------- исполнение ----------
+
+    def run(self) -> str:
+        """Выполнять до остановки (HALTED) или до нехватки ввода (NEED_INPUT)."""
+        return self._execute(False)
+
+    def run_until_input(self) -> str:
+        """
+        То же, что run(): машина работает, пока не попросит ввод при пустой
+        очереди или не остановится. Вывод копится в outputs.
+        """
+        return self._execute(False)
+
+    def run_until_output(self) -> Optional[int]:
+        """
+        Выполнять до первого вывода и вернуть его.
+        None — если машина остановилась или ждёт ввод.
+        """
+        if self.outputs:
+            return self.outputs.popleft()
+        if self._execute(True) == OUTPUT:
+            return self.outputs.popleft()
+        return None
+
+    def _grow(self) -> None:
+        self.mem.extend([0] * max(len(self.mem), 1024))
+
+    def _execute(self, stop_on_output: bool) -> str:
+        if self.halted:
+            return HALTED
+        mem = self.own_memory()
+        inputs = self.inputs
+        outputs = self.outputs
+        decode = DECODE
+        ip = self.ip
+        rb = self.rb
+        while True:
+            try:
+                while True:
+                    op, m1, m2, m3 = decode[mem[ip]]
+                    if op == 1 or op == 2 or op == 7 or op == 8:
+                        p = mem[ip + 1]
+                        a = p if m1 == 1 else mem[p if m1 == 0 else rb + p]
+                        p = mem[ip + 2]
+                        b = p if m2 == 1 else mem[p if m2 == 0 else rb + p]
+                        p = mem[ip + 3]
+                        dst = p if m3 == 0 else rb + p
+                        if op == 1:
+                            mem[dst] = a + b
+                        elif op == 2:
+                            mem[dst] = a * b
+                        elif op == 7:
+                            mem[dst] = 1 if a < b else 0
+                        else:
+                            mem[dst] = 1 if a == b else 0
+                        ip += 4
+                    elif op == 5 or op == 6:
+                        p = mem[ip + 1]
+                        a = p if m1 == 1 else mem[p if m1 == 0 else rb + p]
+                        if (a != 0) == (op == 5):
+                            p = mem[ip + 2]
+                            ip = p if m2 == 1 else mem[p if m2 == 0 else rb + p]
+                        else:
+                            ip += 3
+                    elif op == 3:
+                        if not inputs:
+                            self.ip, self.rb = ip, rb
+                            return NEED_INPUT
+                        p = mem[ip + 1]
+                        # Значение снимаем только после успешной записи
+                        mem[p if m1 == 0 else rb + p] = inputs[0]
+                        inputs.popleft()
+                        ip += 2
+                    elif op == 4:
+                        p = mem[ip + 1]
+                        outputs.append(p if m1 == 1 else mem[p if m1 == 0 else rb + p])
+                        ip += 2
+                        if stop_on_output:
+                            self.ip, self.rb = ip, rb
+                            return OUTPUT
+                    elif op == 9:
+                        p = mem[ip + 1]
+                        rb += p if m1 == 1 else mem[p if m1 == 0 else rb + p]
+                        ip += 2
+                    else:  # 99
+                        self.ip, self.rb = ip, rb
+                        self.halted = True
+                        return HALTED
+            except IndexError:
+                self._grow()
+            except KeyError:
+                raise ValueError(f"Неизвестная инструкция {mem[ip]} на позиции {ip}") from None
@@ -0,0 +1,174 @@
+"""
+Перебор MD5 для "хэш-добычи": 2015/04, 2016/05, 2016/14.
+
+    for nonce, digest in mine("abcdef", zeros=5):
+        print(nonce, digest.hex())   # nonce идут строго по возрастанию
+        break
+
+    for h in hex_stream("abc", rounds=2016):   # растянутые хэши 2016/14
+        ...
+
+Что сделано ради скорости:
+  * сообщение secret + nonce не собирается заново: для каждой тысячи
+    nonce с общим началом (secret + nonce // 1000) один раз считается
+    MD5-префикс, а дальше он копируется (.copy()) и дополняется тремя
+    последними цифрами из готовой таблицы;
+  * "первые k шестнадцатеричных цифр — нули" проверяется одним сравнением
+    сырого digest() с границей (digest < bound), без hexdigest и startswith;
+  * встроенная реализация _md5 заметно быстрее OpenSSL-обёртки hashlib
+    на коротких сообщениях — берём её, если она есть;
+  * диапазон nonce режется на куски по chunk штук, куски считаются в пуле
+    процессов, а результаты отдаются в порядке nonce — так что ответы,
+    зависящие от порядка (пароль 2016/05), остаются точными.
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Deque, Iterator, List, Optional, Tuple, TypeVar
+
+from aoclib.parallel import default_workers
+
+try:
+    from _md5 import md5  # встроенная реализация CPython
+except ImportError:  # pragma: no cover - сборки без _md5
+    from hashlib import md5
+
+DEFAULT_CHUNK = 250_000  # nonce на одну задачу пула
+DEFAULT_STRETCHED_CHUNK = 1_000  # растянутых хэшей на одну задачу пула
+
+T = TypeVar("T")
+
+# Три младшие цифры nonce для всех nonce >= 1000
+_SUFFIXES = [b"%03d" % j for j in range(1000)]
+
+
+def zero_bound(zeros: int) -> bytes:
+    """
+    Граница для проверки ведущих нулей: digest < bound тогда и только тогда,
+    когда первые zeros шестнадцатеричных цифр дайджеста — нули.
+    """
+    if not 1 <= zeros <= 32:
+        raise ValueError(f"Число нулей должно быть от 1 до 32, а не {zeros}")
+    full, half = divmod(zeros, 2)
+    if half:
+        return bytes(full) + b"\x10"
+    return bytes(full - 1) + b"\x01"
+
+
+def digests(secret: bytes, lo: int, hi: int) -> List[bytes]:
+    """MD5 от secret + str(n) для всех n из [lo, hi) — по порядку."""
+    result = []
+    n = lo
+    while n < hi and n < 1000:
+        result.append(md5(secret + b"%d" % n).digest())
+        n += 1
+    while n < hi:
+        high, j = divmod(n, 1000)
+        end = min(hi - high * 1000, 1000)
+        copy = md5(secret + b"%d" % high).copy
+        for suffix in _SUFFIXES[j:end]:
+            m = copy()
+            m.update(suffix)
+            result.append(m.digest())
+        n = high * 1000 + end
+    return result
+
+
+def _scan(secret: bytes, bound: bytes, lo: int, hi: int) -> List[Tuple[int, bytes]]:
+    """Все n из [lo, hi) с md5(secret + n) < bound, по возрастанию n."""
+    found = []
+    n = lo
+    while n < hi and n < 1000:
+        digest = md5(secret + b"%d" % n).digest()
+        if digest < bound:
+            found.append((n, digest))
+        n += 1
+    while n < hi:
+        high, j = divmod(n, 1000)
+        end = min(hi - high * 1000, 1000)
+        copy = md5(secret + b"%d" % high).copy
+        for suffix in _SUFFIXES[j:end]:
+            m = copy()
+            m.update(suffix)
+            digest = m.digest()
+            if digest < bound:
+                found.append((high * 1000 + int(suffix), digest))
+        n = high * 1000 + end
+    return found
+
+
+def stretched_hexes(secret: bytes, rounds: int, lo: int, hi: int) -> List[str]:
+    """
+    Для всех n из [lo, hi): hex MD5 от secret + str(n), затем ещё rounds раз
+    MD5 от предыдущей hex-строки ("растяжка" 2016/14).
+    """
+    result = []
+    for digest in digests(secret, lo, hi):
+        h = digest.hex()
+        for _ in range(rounds):
+            h = md5(h.encode()).hexdigest()
+        result.append(h)
+    return result
+
+
+def _ordered_chunks(
+    func: Callable[..., List[T]], args: tuple, start: int, chunk: int, workers: Optional[int]
+) -> Iterator[T]:
+    """
+    Бесконечный поток func(*args, lo, lo + chunk) для lo = start, start+chunk, ...
+    Куски считаются в пуле процессов, но отдаются строго по порядку.
+    Пул держит впереди не больше 2*workers кусков и закрывается,
+    когда генератор бросают (break / close()).
+    """
+    if workers is None:
+        workers = default_workers()
+
+    lo = start
+    if workers <= 1:
+        while True:
+            yield from func(*args, lo, lo + chunk)
+            lo += chunk
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending: Deque = deque()
+    try:
+        while True:
+            while len(pending) < 2 * workers:
+                pending.append(pool.submit(func, *args, lo, lo + chunk))
+                lo += chunk
+            yield from pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def mine(
+    secret: str,
+    zeros: int,
+    start: int = 0,
+    workers: Optional[int] = None,
+    chunk: int = DEFAULT_CHUNK,
+) -> Iterator[Tuple[int, bytes]]:
+    """
+    Бесконечный поток (nonce, digest) для nonce >= start, у которых
+    md5(secret + str(nonce)) начинается с zeros нулевых hex-цифр.
+    Nonce идут строго по возрастанию.
+
+    workers — число процессов (по умолчанию default_workers() из
+    aoclib.parallel — внутри пула раннера это 1, то есть без пула).
+    """
+    args = (secret.encode("utf-8"), zero_bound(zeros))
+    return _ordered_chunks(_scan, args, start, chunk, workers)
+
+
+def hex_stream(
+    secret: str,
+    rounds: int = 0,
+    start: int = 0,
+    workers: Optional[int] = None,
+    chunk: int = DEFAULT_STRETCHED_CHUNK,
+) -> Iterator[str]:
+    """
+    Бесконечный поток hex-хэшей secret + n (n = start, start+1, ...),
+    каждый растянут ещё на rounds MD5 (см. stretched_hexes).
+    """
+    args = (secret.encode("utf-8"), rounds)
+    return _ordered_chunks(stretched_hexes, args, start, chunk, workers)
@@ -0,0 +1,186 @@
+"""
+Замер стоимости вызова solve_part1/solve_part2 и отчёт по годам/дням/частям.
+
+    with Measurement() as m:
+        result = module.solve_part1(data)
+    print(m.as_dict())   # wall_s, cpu_s, peak_rss_kb, tracemalloc_peak_kb
+
+    update_report(ROOT_DIR / "metrics.json", 2019, 5, 1, m.as_dict())
+
+peak_rss_kb — пик RSS процесса за всю его жизнь (ru_maxrss), поэтому
+замер относится к одной части, только если она запущена в отдельном
+процессе — см. isolated_pool.
+
+Отчёт — либо JSON (словарь с ключами "2019/05/1"), либо CSV
+(по строке на год/день/часть) — выбирается по расширению файла.
+Повторный замер той же части перезаписывает старую запись.
+"""
+import csv
+import json
+import multiprocessing
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import resource  # только Unix
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+
+REPORT_FIELDS = [
+    "year",
+    "day",
+    "part",
+    "status",
+    "wall_s",
+    "cpu_s",
+    "peak_rss_kb",
+    "tracemalloc_peak_kb",
+]
+
+
+def peak_rss_kb() -> Optional[int]:
+    """
+    Пиковый RSS текущего процесса в КБ (None, если модуля resource нет).
+    Это максимум за всю жизнь процесса, а не только за последний вызов.
+    """
+    if resource is None:
+        return None
+    value = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":  # на macOS ru_maxrss в байтах
+        value //= 1024
+    return int(value)
+
+
+def isolated_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Пул процессов, где каждая задача получает свежий процесс
+    (max_tasks_per_child=1), так что peak_rss_kb в нём — пик одной задачи,
+    а не всего, что воркер выполнял раньше.
+
+    max_tasks_per_child есть только с Python 3.11 и несовместим с "fork";
+    берём forkserver (новый процесс дешевле, чем spawn), если он есть.
+    На более старых Python процессы переиспользуются, и RSS — пик воркера.
+    """
+    if sys.version_info < (3, 11):
+        return ProcessPoolExecutor(max_workers=workers)
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context, max_tasks_per_child=1)
+
+
+class Measurement:
+    """
+    Контекстный менеджер: стена, CPU, пиковый RSS и пик tracemalloc.
+
+    tracemalloc заметно замедляет код с большим числом аллокаций, поэтому
+    его можно отключить (trace_memory=False), если важны только времена.
+    Данные сохраняются и при исключении внутри блока.
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.peak_rss_kb: Optional[int] = None
+        self.tracemalloc_peak_kb: Optional[int] = None
+        self._started_tracing = False
+
+    def __enter__(self) -> "Measurement":
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._started_tracing = True
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.cpu_s = time.process_time() - self._cpu0
+        self.wall_s = time.perf_counter() - self._wall0
+        if self.trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            self.tracemalloc_peak_kb = peak // 1024
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        self.peak_rss_kb = peak_rss_kb()
+        return False
+
+    def as_dict(self) -> Dict:
+        return {
+            "wall_s": round(self.wall_s, 6),
+            "cpu_s": round(self.cpu_s, 6),
+            "peak_rss_kb": self.peak_rss_kb,
+            "tracemalloc_peak_kb": self.tracemalloc_peak_kb,
+        }
+
+
+def report_key(year: int, day: int, part: int) -> str:
+    return f"{year}/{day:02d}/{part}"
+
+
+def _parse_key(key: str) -> Tuple[int, int, int]:
+    year, day, part = key.split("/")
+    return int(year), int(day), int(part)
+
+
+def load_report(path: Path) -> Dict[str, Dict]:
+    """Читает отчёт (JSON или CSV) в словарь {"год/день/часть": запись}."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    if path.suffix.lower() == ".csv":
+        report = {}
+        with path.open(encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                record: Dict = {}
+                for field in REPORT_FIELDS:
+                    value = row.get(field, "")
+                    if value == "":
+                        record[field] = None
+                    elif field in ("year", "day", "part", "peak_rss_kb", "tracemalloc_peak_kb"):
+                        record[field] = int(value)
+                    elif field in ("wall_s", "cpu_s"):
+                        record[field] = float(value)
+                    else:
+                        record[field] = value
+                report[report_key(record["year"], record["day"], record["part"])] = record
+        return report
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_report(path: Path, report: Dict[str, Dict]) -> None:
+    """Пишет отчёт, упорядочивая записи по году, дню и части."""
+    path = Path(path)
+    keys = sorted(report, key=_parse_key)
+    if path.suffix.lower() == ".csv":
+        with path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for key in keys:
+                writer.writerow(report[key])
+        return
+    ordered = {key: report[key] for key in keys}
+    path.write_text(json.dumps(ordered, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def make_record(year: int, day: int, part: int, status: str, metrics: Dict) -> Dict:
+    record = {"year": year, "day": day, "part": part, "status": status}
+    record.update(metrics)
+    return record
+
+
+def update_report(
+    path: Path, year: int, day: int, part: int, metrics: Dict, status: str = "ok"
+) -> None:
+    """Добавляет/обновляет одну запись в файле отчёта."""
+    report = load_report(path)
+    report[report_key(year, day, part)] = make_record(year, day, part, status, metrics)
+    save_report(path, report)
@@ -0,0 +1,97 @@
+"""
+Пул процессов для функций, объявленных прямо в solution.py.
+
+Раннеры (run_all.py, bench.py, start.py) грузят solution.py через
+spec_from_file_location и не кладут его в sys.modules, поэтому pickle
+не может передать такую функцию в ProcessPoolExecutor. Здесь в пул
+уходит не сама функция, а пара (файл, имя): воркер один раз загружает
+модуль из файла и дальше вызывает функцию из своей копии.
+
+    def count_loops(tables, trials):      # в solution.py, на уровне модуля
+        ...
+
+    total = sum(map_in_pool(count_loops, [(part,) for part in parts], shared=(tables,)))
+
+Большие общие данные (таблицы, карты) передаются через shared: они
+уходят в каждый процесс один раз, при его запуске, а не с каждой задачей,
+и подставляются первыми аргументами: func(*shared, *args).
+
+Функция должна быть объявлена на уровне модуля, а загрузка модуля —
+не иметь побочных эффектов (код запуска — под if __name__ == "__main__").
+
+Раннеры (run_all.py, bench.py) сами гоняют части в пуле процессов, и
+пул внутри решения на все CPU дал бы воркеры x CPU процессов. Поэтому
+раннер перед запуском пула вызывает limit_nested_workers, а число
+процессов по умолчанию здесь и в md5mine берётся из default_workers.
+"""
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Сколько процессов может взять одна задача раннера (см. limit_nested_workers)
+WORKERS_ENV = "AOC_TASK_WORKERS"
+
+_LOADED: Dict[str, Any] = {}  # файл -> модуль, загруженный в этом процессе
+_SHARED: tuple = ()  # общие аргументы пула, полученные при запуске процесса
+
+
+def default_workers() -> int:
+    """Число CPU или доля CPU на задачу, если мы внутри пула раннера."""
+    value = os.environ.get(WORKERS_ENV)
+    if value:
+        return max(1, int(value))
+    return os.cpu_count() or 1
+
+
+def limit_nested_workers(pool_workers: int) -> None:
+    """
+    Делит CPU между задачами пула раннера: вызывается до создания пула,
+    воркеры наследуют переменную окружения WORKERS_ENV.
+    """
+    share = (os.cpu_count() or 1) // max(1, pool_workers)
+    os.environ[WORKERS_ENV] = str(max(1, share))
+
+
+def _set_shared(shared: tuple) -> None:
+    global _SHARED
+    _SHARED = shared
+
+
+def _call(path: str, name: str, args: tuple) -> Any:
+    module = _LOADED.get(path)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(f"_pool_{len(_LOADED)}", path)
+        module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+        assert spec.loader is not None
+        spec.loader.exec_module(module)  # type: ignore[arg-type]
+        _LOADED[path] = module
+    return getattr(module, name)(*_SHARED, *args)
+
+
+def map_in_pool(
+    func: Callable[..., Any],
+    arg_tuples: Sequence[Tuple],
+    workers: Optional[int] = None,
+    shared: Tuple = (),
+) -> List[Any]:
+    """
+    [func(*shared, *args) for args in arg_tuples], посчитанные в пуле
+    процессов. Порядок результатов совпадает с порядком аргументов;
+    shared пересылается в каждый процесс один раз.
+
+    workers — число процессов (по умолчанию default_workers()); при одном процессе
+    или одной задаче всё считается здесь же, без пула.
+    """
+    if workers is None:
+        workers = default_workers()
+    workers = min(workers, len(arg_tuples))
+    if workers <= 1:
+        return [func(*shared, *args) for args in arg_tuples]
+
+    path = func.__code__.co_filename
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_set_shared, initargs=(shared,)
+    ) as pool:
+        futures = [pool.submit(_call, path, func.__name__, args) for args in arg_tuples]
+        return [future.result() for future in futures]
@@ -0,0 +1,333 @@
+"""
+Поиск кратчайших путей на картах и графах состояний:
+
+  * 2016/13, 2016/24, 2024/18, 2024/20 — BFS по клеточной карте
+  * 2019/18 — ключи и двери: Дейкстра по состояниям (позиции, маска ключей)
+  * 2019/20 — лабиринт с порталами (в части 2 — рекурсивные уровни)
+  * 2018/22 — пещера со сменой снаряжения: A*
+  * 2023/17, 2024/16 — Дейкстра с маленькими целыми весами (очередь-корзины)
+
+Состояние — всегда одно целое число. На клеточной карте это индекс
+в плоском буфере FlatGrid, а "клетка + направление" или "клетка +
+инструмент" кодируются как cell * k + extra. Если задан size, расстояния
+хранятся в плоском array('q') на size элементов, иначе — в словаре
+(для огромных, но разреженных пространств вроде масок ключей).
+Недостижимые состояния имеют расстояние INF.
+
+    grid = FlatGrid.parse(text)
+    dist = grid_bfs(grid, [grid.find("S")])
+    print(dist[grid.find("E")])
+
+    def edges(state):            # -> итерируемое (сосед, вес)
+        ...
+    dist, found = dial(edges, [start], max_weight=1000, size=len(grid) * 4,
+                       goal=lambda s: s // 4 == end)
+
+Все поиски, кроме grid_bfs, получают граф функцией: bfs — neighbours(u)
+-> соседи, остальные — edges(u) -> пары (сосед, вес). Готовый список
+смежности подходит как есть: adjacency.__getitem__. Возвращается пара
+(dist, found): found — первое снятое с очереди состояние, для которого
+goal(state) истинно (оно же самое близкое), или None, если goal не задан
+или цель недостижима.
+"""
+import heapq
+from array import array
+from collections import deque
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+INF = 1 << 62
+
+Edges = Callable[[int], Iterable[Tuple[int, int]]]
+Goal = Optional[Callable[[int], bool]]
+
+
+class _SparseDistances(dict):
+    """Словарь расстояний: отсутствующее состояние — INF."""
+
+    __slots__ = ()
+
+    def __missing__(self, key: int) -> int:
+        return INF
+
+
+def _distances(size: Optional[int]):
+    if size is None:
+        return _SparseDistances()
+    return array("q", [INF]) * size
+
+
+class FlatGrid:
+    """
+    Прямоугольная карта в одной строке cells с рамкой в одну клетку.
+
+    Клетка (r, c) исходной карты имеет индекс (r + 1) * stride + c + 1.
+    Рамка состоит из стены, поэтому сосед u + step всегда лежит внутри
+    буфера и проверять границы не нужно. open[i] == 1 — клетка проходима.
+    steps — смещения к соседям в порядке вправо, вниз, влево, вверх.
+    """
+
+    def __init__(self, rows: Sequence[str], walls: str = "#", open_chars: Optional[str] = None):
+        self.height = len(rows)
+        self.width = max(map(len, rows), default=0)
+        self.stride = self.width + 2
+        border = walls[0]
+        lines = [border * self.stride]
+        lines.extend(border + row.ljust(self.width, border) + border for row in rows)
+        lines.append(border * self.stride)
+        self.cells = "".join(lines)
+        if open_chars is None:
+            self.open = bytearray(ch not in walls for ch in self.cells)
+        else:
+            # Проходимы только перечисленные символы (рамка — никогда)
+            self.open = bytearray(ch in open_chars for ch in self.cells)
+            self.open[: self.stride] = bytes(self.stride)
+            self.open[-self.stride:] = bytes(self.stride)
+            self.open[:: self.stride] = bytes(self.height + 2)
+            self.open[self.stride - 1:: self.stride] = bytes(self.height + 2)
+        self.steps = (1, self.stride, -1, -self.stride)
+
+    @classmethod
+    def parse(cls, text: str, walls: str = "#", open_chars: Optional[str] = None) -> "FlatGrid":
+        """Карта из текста; пустые строки пропускаются."""
+        rows = [line for line in text.splitlines() if line.strip()]
+        return cls(rows, walls, open_chars)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def index(self, r: int, c: int) -> int:
+        return (r + 1) * self.stride + c + 1
+
+    def coords(self, i: int) -> Tuple[int, int]:
+        """Индекс -> (r, c) исходной карты."""
+        r, c = divmod(i, self.stride)
+        return r - 1, c - 1
+
+    def find(self, ch: str) -> Optional[int]:
+        """Индекс первой клетки с символом ch или None."""
+        i = self.cells.find(ch)
+        return i if i >= 0 else None
+
+    def find_all(self, ch: str) -> List[int]:
+        return [i for i, cell in enumerate(self.cells) if cell == ch]
+
+
+def grid_bfs(grid: FlatGrid, sources: Iterable[int], limit: Optional[int] = None) -> array:
+    """
+    BFS по проходимым клеткам карты сразу из всех sources (мульти-источник).
+    limit — не уходить дальше стольких шагов. Возвращает array('q')
+    расстояний по индексам клеток; недостижимые — INF.
+    """
+    passable = grid.open
+    steps = grid.steps
+    dist = array("q", [INF]) * len(passable)
+    frontier = []
+    for s in sources:
+        if dist[s] == INF:
+            dist[s] = 0
+            frontier.append(s)
+    d = 0
+    while frontier and (limit is None or d < limit):
+        d += 1
+        nxt = []
+        for u in frontier:
+            for step in steps:
+                v = u + step
+                if passable[v] and dist[v] == INF:
+                    dist[v] = d
+                    nxt.append(v)
+        frontier = nxt
+    return dist
+
+
+def bfs(
+    neighbours: Callable[[int], Iterable[int]],
+    sources: Iterable[int],
+    size: Optional[int] = None,
+    goal: Goal = None,
+    limit: Optional[int] = None,
+):
+    """BFS по невзвешенному графу, по слоям; limit — максимальная глубина."""
+    dist = _distances(size)
+    frontier = []
+    for s in sources:
+        if dist[s] == INF:
+            dist[s] = 0
+            frontier.append(s)
+    d = 0
+    while frontier:
+        if goal is not None:
+            for u in frontier:
+                if goal(u):
+                    return dist, u
+        if limit is not None and d >= limit:
+            break
+        d += 1
+        nxt = []
+        for u in frontier:
+            for v in neighbours(u):
+                if dist[v] == INF:
+                    dist[v] = d
+                    nxt.append(v)
+        frontier = nxt
+    return dist, None
+
+
+def bfs01(edges: Edges, sources: Iterable[int], size: Optional[int] = None, goal: Goal = None):
+    """0-1 BFS: веса рёбер только 0 и 1, дек вместо кучи."""
+    dist = _distances(size)
+    queue = deque()
+    for s in sources:
+        dist[s] = 0
+        queue.append((0, s))
+    while queue:
+        d, u = queue.popleft()
+        if d != dist[u]:
+            continue
+        if goal is not None and goal(u):
+            return dist, u
+        for v, w in edges(u):
+            nd = d + w
+            if nd < dist[v]:
+                dist[v] = nd
+                if w:
+                    queue.append((nd, v))
+                else:
+                    queue.appendleft((nd, v))
+    return dist, None
+
+
+def dial(
+    edges: Edges,
+    sources: Iterable[int],
+    max_weight: int,
+    size: Optional[int] = None,
+    goal: Goal = None,
+):
+    """
+    Дейкстра с очередью-корзинами (алгоритм Дайла) для целых весов
+    0..max_weight: все расстояния в очереди лежат в окне [d, d + max_weight],
+    так что хватает max_weight + 1 корзин по кругу, и ни одной кучи.
+    """
+    dist = _distances(size)
+    width = max_weight + 1
+    buckets: List[List[int]] = [[] for _ in range(width)]
+    queued = 0
+    for s in sources:
+        if dist[s] != 0:
+            dist[s] = 0
+            buckets[0].append(s)
+            queued += 1
+    d = 0
+    while queued:
+        bucket = buckets[d % width]
+        while bucket:
+            u = bucket.pop()
+            queued -= 1
+            if dist[u] != d:
+                continue  # устаревшая запись: состояние уже снято ближе
+            if goal is not None and goal(u):
+                return dist, u
+            for v, w in edges(u):
+                nd = d + w
+                if nd < dist[v]:
+                    dist[v] = nd
+                    buckets[nd % width].append(v)
+                    queued += 1
+        d += 1
+    return dist, None
+
+
+def dijkstra(edges: Edges, sources: Iterable[int], size: Optional[int] = None, goal: Goal = None):
+    """Обычная Дейкстра на двоичной куче — для произвольных неотрицательных весов."""
+    dist = _distances(size)
+    heap = []
+    for s in sources:
+        dist[s] = 0
+        heap.append((0, s))
+    heapq.heapify(heap)
+    pop, push = heapq.heappop, heapq.heappush
+    while heap:
+        d, u = pop(heap)
+        if d != dist[u]:
+            continue
+        if goal is not None and goal(u):
+            return dist, u
+        for v, w in edges(u):
+            nd = d + w
+            if nd < dist[v]:
+                dist[v] = nd
+                push(heap, (nd, v))
+    return dist, None
+
+
+def astar(
+    edges: Edges,
+    sources: Iterable[int],
+    heuristic: Callable[[int], int],
+    goal: Callable[[int], bool],
+    size: Optional[int] = None,
+    max_weight: Optional[int] = None,
+):
+    """
+    A*: очередь упорядочена по dist + heuristic. Эвристика должна быть
+    допустимой и согласованной (h(u) <= w(u, v) + h(v), а в цели — 0),
+    тогда первое снятое с очереди целевое состояние — кратчайшее.
+
+    Если веса — целые 0..max_weight, а эвристика меняется вдоль ребра
+    не больше, чем на его вес (так ведут себя манхэттенские оценки),
+    оценка dist + h растёт за ребро не больше чем на 2 * max_weight —
+    и вместо кучи работают 2 * max_weight + 1 корзин, как в dial.
+    """
+    if max_weight is not None:
+        return _bucket_astar(edges, sources, heuristic, goal, size, 2 * max_weight + 1)
+    dist = _distances(size)
+    heap = []
+    for s in sources:
+        dist[s] = 0
+        heap.append((heuristic(s), 0, s))
+    heapq.heapify(heap)
+    pop, push = heapq.heappop, heapq.heappush
+    while heap:
+        _, d, u = pop(heap)
+        if d != dist[u]:
+            continue
+        if goal(u):
+            return dist, u
+        for v, w in edges(u):
+            nd = d + w
+            if nd < dist[v]:
+                dist[v] = nd
+                push(heap, (nd + heuristic(v), nd, v))
+    return dist, None
+
+
+def _bucket_astar(edges, sources, heuristic, goal, size, width):
+    """A* на корзинах по оценке f = dist + h; в корзине лежат пары (dist, state)."""
+    dist = _distances(size)
+    buckets: List[List[Tuple[int, int]]] = [[] for _ in range(width)]
+    queued = 0
+    f = None
+    for s in sources:
+        dist[s] = 0
+        h = heuristic(s)
+        f = h if f is None else min(f, h)
+        buckets[h % width].append((0, s))
+        queued += 1
+    while queued:
+        bucket = buckets[f % width]
+        while bucket:
+            d, u = bucket.pop()
+            queued -= 1
+            if d != dist[u]:
+                continue
+            if goal(u):
+                return dist, u
+            for v, w in edges(u):
+                nd = d + w
+                if nd < dist[v]:
+                    dist[v] = nd
+                    buckets[(nd + heuristic(v)) % width].append((nd, v))
+                    queued += 1
+        f += 1
+    return dist, None
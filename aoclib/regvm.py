@@ -0,0 +1,1250 @@
+"""
+Общая регистровая машина для "ассемблерных" задач:
+
+  * 2015/23  — turing lock   (hlf, tpl, inc, jmp, jie, jio)
+  * 2016/12, 23, 25 — assembunny (cpy, inc, dec, jnz, tgl, out)
+  * 2017/18  — duet           (snd, set, add, mul, mod, rcv, jgz)
+  * 2017/23  — coprocessor    (set, sub, mul, jnz)
+  * 2018/16, 19, 21 — elfcode (addr ... eqrr, регистр-указатель #ip)
+  * 2024/17  — chronospatial  (adv, bxl, bst, jnz, bxc, out, bdv, cdv)
+
+Каждый диалект переводится в общее промежуточное представление (IR):
+кортежи (name, dst, x, y), где операнды — ("r", индекс) или ("i", число).
+Дальше IR понижается в целочисленные opcode'ы: (op, a, b, c), все операнды —
+индексы в списке регистров. Непосредственные значения лежат в том же списке
+после настоящих регистров ("регистры-константы"), поэтому у каждой операции
+один вариант без проверок режима на каждом шаге.
+
+Поверх IR работает peephole-оптимизатор, который узнаёт типичные циклы
+и заменяет их суперинструкциями:
+
+  ADDLOOP  inc X / dec Y / jnz Y -2          -> X += k*Y, Y = 0
+  MULLOOP  cpy X Y / ADDLOOP / dec W / jnz W -5 -> Z += k*X*W, Y = W = 0
+  DIVLOOP  elfcode-цикл "Q = R // D" перебором (2018/21)
+  DIVSUM   elfcode-двойной цикл суммы делителей (2018/19)
+
+Суперинструкция ставится только на первую инструкцию блока; остальные
+инструкции блока остаются обычными, так что прыжок в середину цикла
+работает как прежде. Если условие применимости не выполнено (например,
+счётчик цикла <= 0), выполняется обычная инструкция.
+
+Самомодифицирующийся код (assembunny tgl) меняет исходник машины,
+после чего программа перекомпилируется целиком — вместе с поиском
+суперинструкций, поэтому они никогда не "протухают".
+
+    prog = assembunny(data)
+    vm = RegisterMachine(prog, {"a": 12})
+    vm.run()
+    print(vm["a"])
+
+Режим компиляции (RegisterMachine(..., compile_after=N)): программа
+переводится в исходник Python-функции — регистры становятся локальными
+переменными, базовые блоки — ветками if по ip, блок, прыгающий сам на
+себя, — внутренним while. Функция строится через exec и кэшируется
+в Program; после tgl новая Program компилируется заново. Компиляция
+стоит около миллисекунды, поэтому первые N шагов машина интерпретирует
+и компилирует только "долгие" программы (N = 0 — сразу). Скомпилированный
+код шаги не считает, поэтому run(max_steps=...) всегда идёт через
+интерпретатор.
+"""
+import re
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+# ---------- статусы остановки ----------
+
+HALTED = "halted"          # ip вышел за пределы программы
+NEED_INPUT = "need_input"  # rcv при пустой очереди ввода (ip остаётся на rcv)
+OUTPUT = "output"          # был вывод (только при run(until_output=True))
+BREAK = "break"            # достигнута точка останова (инструкция ещё не выполнена)
+RECOVER = "recover"        # duet/sound: rcv X при X != 0
+LIMIT = "limit"            # исчерпан max_steps
+_TOGGLE = "toggle"         # внутренний: скомпилированный код дошёл до tgl
+
+# Порог для compile_after по умолчанию: короче — дешевле интерпретировать
+DEFAULT_COMPILE_AFTER = 10_000
+
+# ---------- opcode'ы ----------
+
+(
+    SET, ADD, SUB, MUL, DIV, MOD, SHR, XOR, AND, OR, GT, EQ,
+    JMP, JNZ, JGZ, JIE, JIO, JABS, JCALC,
+    OUT, RCV, RCVNZ, TGL, NOP, BRK,
+    ADDLOOP, MULLOOP, DIVLOOP, DIVSUM,
+) = range(29)
+
+_BINARY = {
+    "add": ADD, "sub": SUB, "mul": MUL, "div": DIV, "mod": MOD,
+    "shr": SHR, "xor": XOR, "and": AND, "or": OR, "gt": GT, "eq": EQ,
+}
+_JUMPS = {"jnz": JNZ, "jgz": JGZ, "jie": JIE, "jio": JIO}
+
+_FOLD = {
+    "add": lambda x, y: x + y,
+    "sub": lambda x, y: x - y,
+    "mul": lambda x, y: x * y,
+    "div": lambda x, y: x // y,
+    "mod": lambda x, y: x % y,
+    "shr": lambda x, y: x >> y,
+    "xor": lambda x, y: x ^ y,
+    "and": lambda x, y: x & y,
+    "or": lambda x, y: x | y,
+    "gt": lambda x, y: 1 if x > y else 0,
+    "eq": lambda x, y: 1 if x == y else 0,
+}
+
+Operand = Tuple[str, int]
+IR = tuple
+
+
+def R(idx: int) -> Operand:
+    return ("r", idx)
+
+
+def I(value: int) -> Operand:  # noqa: E743 — короткое имя, как R
+    return ("i", value)
+
+
+def _operand(token: str, index: Dict[str, int]) -> Operand:
+    """Токен исходника -> операнд IR: имя регистра или число."""
+    if token in index:
+        return R(index[token])
+    return I(int(token))
+
+
+# =====================================================================
+#   Программа: исходник диалекта + скомпилированный код
+# =====================================================================
+
+
+class Program:
+    """
+    Скомпилированная программа. Не изменяется во время исполнения,
+    поэтому одну Program можно запускать во многих машинах.
+
+    names  — имена настоящих регистров (их индексы 0..len(names)-1);
+    source — исходник диалекта (для tgl — список изменяемых списков);
+    lower  — функция source -> список IR;
+    toggle — правило tgl для одной инструкции исходника (или None).
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        source: list,
+        lower: Callable[[list], List[IR]],
+        toggle: Optional[Callable[[list], None]] = None,
+        optimize: bool = True,
+    ) -> None:
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.source = source
+        self.lower = lower
+        self.toggle = toggle
+        self.optimize = optimize
+
+        self.ir = lower(source)
+        self.consts: List[int] = []
+        const_index: Dict[int, int] = {}
+
+        def reg(op: Operand) -> int:
+            kind, value = op
+            if kind == "r":
+                return value
+            if value not in const_index:
+                const_index[value] = len(self.names) + len(self.consts)
+                self.consts.append(value)
+            return const_index[value]
+
+        self.plain = [_lower_one(ins, reg) for ins in self.ir]
+        self.code = list(self.plain)
+        if optimize:
+            for p in range(len(self.ir)):
+                sup = _match_super(self.ir, p, reg)
+                if sup is not None:
+                    self.code[p] = sup
+        # точки останова -> (сгенерированная функция, множество начал блоков)
+        self._compiled: Dict[frozenset, Tuple[Callable, frozenset]] = {}
+
+    def compiled(self, breakpoints: frozenset = frozenset()) -> Tuple[Callable, frozenset]:
+        """Python-функция для этой программы (см. compile_to_python), с кэшем."""
+        if breakpoints not in self._compiled:
+            self._compiled[breakpoints] = compile_to_python(self, breakpoints)
+        return self._compiled[breakpoints]
+
+    def with_source(self, source: list) -> "Program":
+        """Та же программа с другим исходником (после tgl)."""
+        return Program(self.names, source, self.lower, self.toggle, self.optimize)
+
+
+def _lower_one(ins: IR, reg: Callable[[Operand], int]) -> tuple:
+    """IR -> (op, a, b, c) с индексами регистров."""
+    name, dst, x, y = ins
+    if name == "nop":
+        return (NOP, 0, 0, 0)
+    if name == "set":
+        return (SET, dst, reg(x), 0)
+    if name in _BINARY:
+        if x[0] == "i" and y[0] == "i":
+            # обе части — константы: сворачиваем сразу
+            return (SET, dst, reg(I(_FOLD[name](x[1], y[1]))), 0)
+        return (_BINARY[name], dst, reg(x), reg(y))
+    if name == "jmp":
+        return (JMP, 0, 0, reg(x))
+    if name in _JUMPS:
+        if name == "jnz" and x[0] == "i":
+            # условие — константа: безусловный прыжок или "ничего"
+            return (JMP, 0, 0, reg(y)) if x[1] != 0 else (JMP, 0, 0, reg(I(1)))
+        return (_JUMPS[name], 0, reg(x), reg(y))
+    if name == "jabs":
+        return (JABS, 0, reg(x), reg(y))
+    if name == "jcalc":
+        return (JCALC, 0, x, 0)
+    if name == "out":
+        return (OUT, 0, reg(x), reg(y if y is not None else I(-1)))
+    if name == "rcv":
+        return (RCV, dst, 0, 0)
+    if name == "rcvnz":
+        return (RCVNZ, 0, reg(x), 0)
+    if name == "tgl":
+        return (TGL, 0, reg(x), 0)
+    raise ValueError(f"Неизвестная IR-инструкция: {ins!r}")
+
+
+# =====================================================================
+#   Peephole: поиск суперинструкций в IR
+# =====================================================================
+
+
+def _is_add_const(ins: IR, dst_reg: Optional[int] = None) -> Optional[Tuple[int, int]]:
+    """add D, D, k (k — константа) -> (D, k)."""
+    if ins[0] != "add" or ins[2][0] != "r" or ins[2][1] != ins[1]:
+        return None
+    if ins[3][0] != "i":
+        return None
+    if dst_reg is not None and ins[1] != dst_reg:
+        return None
+    return ins[1], ins[3][1]
+
+
+def _is_jnz(ins: IR, offset: int) -> Optional[int]:
+    """jnz rX, offset -> X."""
+    if ins[0] == "jnz" and ins[2][0] == "r" and ins[3] == I(offset):
+        return ins[2][1]
+    return None
+
+
+def _is_jump(ins: IR) -> Optional[int]:
+    """Безусловный относительный прыжок -> смещение."""
+    if ins[0] == "jmp" and ins[2][0] == "i":
+        return ins[2][1]
+    if ins[0] == "jnz" and ins[2][0] == "i" and ins[2][1] != 0 and ins[3][0] == "i":
+        return ins[3][1]
+    return None
+
+
+def _match_addloop(ir: List[IR], p: int) -> Optional[Tuple[int, int, int]]:
+    """
+    inc X; dec Y; jnz Y -2   (или dec Y; inc X; jnz Y -2)
+    -> (X, Y, k): X += k*Y, Y = 0.
+    """
+    if p + 2 >= len(ir):
+        return None
+    a, b = _is_add_const(ir[p]), _is_add_const(ir[p + 1])
+    y = _is_jnz(ir[p + 2], -2)
+    if a is None or b is None or y is None:
+        return None
+    if b[0] == y and b[1] == -1 and a[0] != y:
+        return a[0], y, a[1]
+    if a[0] == y and a[1] == -1 and b[0] != y:
+        return b[0], y, b[1]
+    return None
+
+
+def _match_super(ir: List[IR], p: int, reg: Callable[[Operand], int]) -> Optional[tuple]:
+    n = len(ir)
+
+    # MULLOOP: cpy X Y; <ADDLOOP Z += k*Y>; dec W; jnz W -5
+    if p + 5 < n and ir[p][0] == "set":
+        inner = _match_addloop(ir, p + 1)
+        w = _is_jnz(ir[p + 5], -5)
+        if inner is not None and w is not None and _is_add_const(ir[p + 4], w) == (w, -1):
+            z, y, k = inner
+            x = ir[p][2]
+            if ir[p][1] == y and len({z, y, w}) == 3 and x not in (R(z), R(y), R(w)):
+                return (MULLOOP, (z, y, w, k), reg(x), 0)
+
+    addloop = _match_addloop(ir, p)
+    if addloop is not None:
+        return (ADDLOOP, addloop, 0, 0)
+
+    divloop = _match_divloop(ir, p)
+    if divloop is not None:
+        return (DIVLOOP,) + divloop
+
+    divsum = _match_divsum(ir, p)
+    if divsum is not None:
+        return (DIVSUM, divsum, 0, 0)
+    return None
+
+
+def _match_divloop(ir: List[IR], p: int) -> Optional[Tuple[tuple, int, int]]:
+    """
+    elfcode-деление перебором (2018/21):
+        p+0  Q = 0
+        p+1  T = Q + 1
+        p+2  T = T * D            (D — константа)
+        p+3  T = T > Rg
+        p+4  ip += T              (jabs T, p+5)
+        p+5  jmp +2
+        p+6  jmp EXIT
+        p+7  Q = Q + 1
+        p+8  jmp p+1
+    -> Q = Rg // D, T = 1, ip = EXIT.
+    """
+    if p + 8 >= len(ir):
+        return None
+    s, t1, t2, t3, j1, j2, j3, inc, back = ir[p:p + 9]
+    if s[0] != "set" or s[2] != I(0):
+        return None
+    q = s[1]
+    if t1[0] != "add" or t1[2] != R(q) or t1[3] != I(1):
+        return None
+    t = t1[1]
+    if t == q or t2[0] != "mul" or t2[1] != t:
+        return None
+    if t2[2] == R(t) and t2[3][0] == "i":
+        d = t2[3][1]
+    elif t2[3] == R(t) and t2[2][0] == "i":
+        d = t2[2][1]
+    else:
+        return None
+    if t3[0] != "gt" or t3[1] != t or t3[2] != R(t) or t3[3][0] != "r":
+        return None
+    rg = t3[3][1]
+    if rg in (q, t) or d <= 0:
+        return None
+    if j1 != ("jabs", None, R(t), I(p + 5)) or _is_jump(j2) != 2:
+        return None
+    exit_off = _is_jump(j3)
+    if exit_off is None or _is_add_const(inc, q) != (q, 1) or _is_jump(back) != -7:
+        return None
+    return (q, t, rg, d), p + 6 + exit_off, 0
+
+
+def _match_divsum(ir: List[IR], p: int) -> Optional[tuple]:
+    """
+    elfcode-сумма делителей (2018/19):
+        p+0  I = 1
+        p+1  J = 1
+        p+2  T = I * J
+        p+3  T = T == N
+        p+4  ip += T
+        p+5  jmp +2
+        p+6  ACC += I
+        p+7  J += 1
+        p+8  T = J > N
+        p+9  ip += T
+        p+10 jmp p+2
+        p+11 I += 1
+        p+12 T = I > N
+        p+13 ip += T
+        p+14 jmp p+1
+    -> ACC += sigma(N), I = J = N + 1, T = 1, ip = p + 15.
+    """
+    if p + 14 >= len(ir):
+        return None
+    c = ir[p:p + 15]
+    if c[0][0] != "set" or c[0][2] != I(1) or c[1][0] != "set" or c[1][2] != I(1):
+        return None
+    i, j = c[0][1], c[1][1]
+    if c[2][0] != "mul" or {c[2][2], c[2][3]} != {R(i), R(j)}:
+        return None
+    t = c[2][1]
+    if c[3][0] != "eq" or c[3][1] != t or R(t) not in (c[3][2], c[3][3]):
+        return None
+    other = c[3][3] if c[3][2] == R(t) else c[3][2]
+    if other[0] != "r":
+        return None
+    n = other[1]
+    if c[4] != ("jabs", None, R(t), I(p + 5)) or _is_jump(c[5]) != 2:
+        return None
+    if c[6][0] != "add" or {c[6][2], c[6][3]} != {R(i), R(c[6][1])}:
+        return None
+    acc = c[6][1]
+    if _is_add_const(c[7], j) != (j, 1):
+        return None
+    if c[8] != ("gt", t, R(j), R(n)) or c[9] != ("jabs", None, R(t), I(p + 10)):
+        return None
+    if _is_jump(c[10]) != -8 or _is_add_const(c[11], i) != (i, 1):
+        return None
+    if c[12] != ("gt", t, R(i), R(n)) or c[13] != ("jabs", None, R(t), I(p + 14)):
+        return None
+    if _is_jump(c[14]) != -13:
+        return None
+    if len({i, j, t, n, acc}) != 5:
+        return None
+    return (i, j, t, n, acc)
+
+
+def divisor_sum(n: int) -> int:
+    """Сумма всех делителей числа n (n >= 1)."""
+    total = 0
+    d = 1
+    while d * d <= n:
+        if n % d == 0:
+            total += d
+            if d * d != n:
+                total += n // d
+        d += 1
+    return total
+
+
+# =====================================================================
+#   Компиляция в Python-функцию
+# =====================================================================
+
+_PY_BINARY = {
+    ADD: "+", SUB: "-", MUL: "*", DIV: "//", MOD: "%",
+    SHR: ">>", XOR: "^", AND: "&", OR: "|",
+}
+_PY_COMPARE = {GT: ">", EQ: "=="}
+_PY_CONDITION = {JNZ: "{} != 0", JGZ: "{} > 0", JIE: "{} % 2 == 0", JIO: "{} == 1"}
+
+
+def _bool_skip(program: Program, i: int) -> Optional[int]:
+    """
+    "ip = T + k" сразу после "T = x > y" / "T = x == y" (elfcode
+    addr T ip ip) прыгает только на k или k + 1. Возвращает k
+    (верно, пока в i нельзя попасть прыжком — это проверяет вызывающий).
+    """
+    op, _, b, c = program.plain[i]
+    nregs = len(program.names)
+    if op != JABS or i == 0 or b >= nregs or c < nregs:
+        return None
+    prev = program.plain[i - 1]
+    if prev[0] in (GT, EQ) and prev[1] == b:
+        return program.consts[c - nregs]
+    return None
+
+
+def _jump_target(program: Program, i: int) -> Tuple[bool, Optional[int]]:
+    """
+    (это прыжок?, адрес прыжка) для инструкции i; адрес None —
+    если он вычисляется только во время исполнения.
+    """
+    op, _, b, c = program.plain[i]
+    nregs = len(program.names)
+    consts = program.consts
+
+    def const(k: int) -> Optional[int]:
+        return consts[k - nregs] if k >= nregs else None
+
+    if op == JMP or op in _PY_CONDITION:
+        off = const(c)
+        return True, None if off is None else i + off
+    if op == JABS:
+        x, y = const(b), const(c)
+        return True, None if x is None or y is None else x + y
+    if op == JCALC:
+        return True, None
+    return False, None
+
+
+def compile_to_python(
+    program: Program, breakpoints: frozenset = frozenset()
+) -> Tuple[Callable, frozenset]:
+    """
+    Переводит программу в Python-функцию
+
+        fn(r, ip, inputs, outputs, until_output) -> (status, ip, tgl_target)
+
+    и возвращает (fn, leaders), где leaders — начала базовых блоков:
+    войти в функцию можно только с ip из leaders (или вне программы).
+    Статус _TOGGLE означает, что ip указывает на tgl с целью tgl_target,
+    а сама инструкция ещё не выполнена.
+
+    Регистры-константы подставляются литералами, суперинструкции — тем же
+    кодом, что и в интерпретаторе, с обычными инструкциями на случай,
+    когда условие применимости не выполнено.
+    """
+    code, plain = program.code, program.plain
+    n = len(plain)
+    nregs = len(program.names)
+    consts = program.consts
+
+    def v(k: int) -> str:
+        return f"r{k}" if k < nregs else repr(consts[k - nregs])
+
+    # ---------- начала блоков ----------
+    leaders = {0}
+    dynamic = False
+    bool_skips = []
+    for i, (op, a, b, c) in enumerate(plain):
+        is_jump, target = _jump_target(program, i)
+        if is_jump:
+            leaders.add(i + 1)
+            if target is not None:
+                leaders.add(target)
+            elif _bool_skip(program, i) is not None:
+                k = _bool_skip(program, i)
+                leaders.update((k, k + 1))
+                bool_skips.append(i)
+            else:
+                dynamic = True
+        elif op in (OUT, RCV, RCVNZ, TGL):
+            leaders.add(i + 1)
+    for p, ins in enumerate(code):
+        op = ins[0]
+        if op >= ADDLOOP:
+            leaders.add(p)
+            leaders.add({ADDLOOP: p + 3, MULLOOP: p + 6, DIVSUM: p + 15}.get(op, ins[2]))
+    # после точки останова машина сама дошагает до начала блока
+    leaders.update(breakpoints)
+    if any(i in leaders for i in bool_skips):
+        # в "ip = T + k" можно попасть прыжком — T уже не обязательно 0/1
+        dynamic = True
+    if dynamic:
+        # прыжок на вычисляемый адрес может попасть куда угодно
+        leaders.update(range(n))
+    starts = sorted(x for x in leaders if 0 <= x < n)
+
+    names = ", ".join(f"r{k}" for k in range(nregs)) + ","
+    writeback = f"r[:{nregs}] = ({names})"
+    namespace: Dict[str, object] = {"_divisor_sum": divisor_sum}
+    lines: List[str] = []
+
+    def emit(depth: int, text: str) -> None:
+        lines.append("    " * depth + text)
+
+    def emit_super(depth: int, p: int) -> None:
+        op, a, b, _ = code[p]
+        if op == ADDLOOP:
+            x, y, k = a
+            emit(depth, f"if r{y} > 0:")
+            emit(depth + 1, f"r{x} += {k} * r{y}; r{y} = 0; ip = {p + 3}; continue")
+        elif op == MULLOOP:
+            z, y, w, k = a
+            emit(depth, f"if {v(b)} > 0 and r{w} > 0:")
+            emit(depth + 1, f"r{z} += {k} * {v(b)} * r{w}; r{y} = 0; r{w} = 0")
+            emit(depth + 1, f"ip = {p + 6}; continue")
+        elif op == DIVLOOP:
+            q, t, rg, d = a
+            emit(depth, f"if r{rg} >= 0:")
+            emit(depth + 1, f"r{q} = r{rg} // {d}; r{t} = 1; ip = {b}; continue")
+        elif op == DIVSUM:
+            i, j, t, nn, acc = a
+            emit(depth, f"if r{nn} >= 1:")
+            emit(depth + 1, f"r{acc} += _divisor_sum(r{nn}); r{i} = r{j} = r{nn} + 1; r{t} = 1")
+            emit(depth + 1, f"ip = {p + 15}; continue")
+
+    def emit_plain(depth: int, i: int, loop_head: Optional[int]) -> bool:
+        """Одна инструкция; True — если после неё управление не переходит на i+1."""
+        op, a, b, c = plain[i]
+        if op == SET:
+            emit(depth, f"r{a} = {v(b)}")
+        elif op in _PY_BINARY:
+            emit(depth, f"r{a} = {v(b)} {_PY_BINARY[op]} {v(c)}")
+        elif op in _PY_COMPARE:
+            emit(depth, f"r{a} = 1 if {v(b)} {_PY_COMPARE[op]} {v(c)} else 0")
+        elif op == NOP:
+            emit(depth, "pass")
+        elif op == OUT:
+            emit(depth, f"outputs.append({v(b)} & {v(c)})")
+            emit(depth, "if until_output:")
+            emit(depth + 1, f"{writeback}; return {OUTPUT!r}, {i + 1}, 0")
+        elif op == RCV:
+            emit(depth, "if not inputs:")
+            emit(depth + 1, f"{writeback}; return {NEED_INPUT!r}, {i}, 0")
+            emit(depth, f"r{a} = inputs.popleft()")
+        elif op == RCVNZ:
+            emit(depth, f"if {v(b)} != 0:")
+            emit(depth + 1, f"{writeback}; return {RECOVER!r}, {i + 1}, 0")
+        elif op == TGL:
+            emit(depth, f"{writeback}; return {_TOGGLE!r}, {i}, {i} + {v(b)}")
+        elif op == JCALC:
+            namespace[f"_jcalc{i}"] = b
+            emit(depth, f"{writeback}; ip = _jcalc{i}(r)")
+            return True
+        elif op == JABS:
+            emit(depth, f"ip = {v(b)} + {v(c)}")
+            return True
+        elif op == JMP:
+            _, target = _jump_target(program, i)
+            emit(depth, f"ip = {target if target is not None else f'{i} + {v(c)}'}")
+            return True
+        elif op in _PY_CONDITION:
+            _, target = _jump_target(program, i)
+            cond = _PY_CONDITION[op].format(v(b))
+            emit(depth, f"if {cond}:")
+            if loop_head is not None and target == loop_head:
+                emit(depth + 1, "continue")
+            elif target is None:
+                emit(depth + 1, f"ip = {i} + {v(c)}; continue")
+            else:
+                emit(depth + 1, f"ip = {target}; continue")
+        else:
+            raise RuntimeError(f"Неизвестный opcode {op} на позиции {i}")
+        return False
+
+    def emit_block(depth: int, start: int, end: int) -> None:
+        if start in breakpoints:
+            # сама инструкция выполняется интерпретатором при следующем run()
+            emit(depth, f"{writeback}; return {BREAK!r}, {start}, 0")
+            return
+        if code[start][0] >= ADDLOOP:
+            emit_super(depth, start)
+        last = end - 1
+        op = plain[last][0]
+        self_loop = op in _PY_CONDITION and _jump_target(program, last)[1] == start
+        if self_loop:
+            # блок прыгает сам на себя — внутренний while без диспетчеризации
+            emit(depth, "while True:")
+            for i in range(start, end):
+                emit_plain(depth + 1, i, start)
+            emit(depth + 1, "break")
+            emit(depth, f"ip = {end}")
+            return
+        for i in range(start, end):
+            if emit_plain(depth, i, None):
+                return
+        emit(depth, f"ip = {end}")
+
+    def emit_tree(depth: int, lo: int, hi: int) -> None:
+        if hi - lo == 1:
+            start = starts[lo]
+            end = starts[lo + 1] if lo + 1 < len(starts) else n
+            emit_block(depth, start, end)
+            return
+        mid = (lo + hi) // 2
+        emit(depth, f"if ip < {starts[mid]}:")
+        emit_tree(depth + 1, lo, mid)
+        emit(depth, "else:")
+        emit_tree(depth + 1, mid, hi)
+
+    emit(0, "def _compiled(r, ip, inputs, outputs, until_output):")
+    emit(1, f"({names}) = r[:{nregs}]")
+    emit(1, "while True:")
+    emit(2, f"if ip < 0 or ip >= {n}:")
+    emit(3, "break")
+    if starts:
+        emit_tree(2, 0, len(starts))
+    emit(1, writeback)
+    emit(1, f"return {HALTED!r}, ip, 0")
+
+    exec(compile("\n".join(lines), "<regvm>", "exec"), namespace)
+    return namespace["_compiled"], frozenset(starts)  # type: ignore[return-value]
+
+
+# =====================================================================
+#   Машина
+# =====================================================================
+
+
+class RegisterMachine:
+    """
+    Состояние исполнения: регистры, ip, очереди ввода/вывода.
+
+    regs содержит настоящие регистры и следом регистры-константы;
+    обращаться к регистрам по имени удобно через vm["a"].
+    compile_after — после стольких шагов интерпретатора перейти на
+    сгенерированную Python-функцию (см. compile_to_python); None — никогда.
+    """
+
+    def __init__(
+        self,
+        program: Program,
+        init: Union[None, Dict[str, int], Sequence[int]] = None,
+        compile_after: Optional[int] = None,
+    ) -> None:
+        self.program = program
+        self.compile_after = compile_after
+        nregs = len(program.names)
+        self.regs: List[int] = [0] * nregs + program.consts
+        if isinstance(init, dict):
+            for name, value in init.items():
+                self.regs[program.index[name]] = value
+        elif init is not None:
+            self.regs[:len(init)] = list(init)
+        self.ip = 0
+        self.steps = 0
+        self.inputs: Deque[int] = deque()
+        self.outputs: List[int] = []
+        self._bp_key: Optional[frozenset] = None
+        self._bp_code: Optional[list] = None
+
+    def __getitem__(self, name: str) -> int:
+        return self.regs[self.program.index[name]]
+
+    def __setitem__(self, name: str, value: int) -> None:
+        self.regs[self.program.index[name]] = value
+
+    # ---------- исполнение ----------
+
+    def run(
+        self,
+        max_steps: Optional[int] = None,
+        breakpoints: Iterable[int] = (),
+        until_output: bool = False,
+    ) -> str:
+        """
+        Выполнять до остановки. Возвращает статус (HALTED, NEED_INPUT, ...).
+
+        breakpoints — номера инструкций, перед которыми нужно остановиться
+        (статус BREAK). Повторный run() с той же точки сначала выполняет
+        инструкцию под точкой останова, а потом идёт дальше.
+        max_steps — ограничение на число шагов (суперинструкция — один шаг).
+        """
+        bps = frozenset(breakpoints)
+        if bps and self.ip in bps:
+            status = self._execute(self.program.plain, 1, until_output)
+            if status != LIMIT:
+                return status
+            if max_steps is not None:
+                max_steps -= 1
+        code = self._patched(bps or None)
+        if self.compile_after is None or max_steps is not None:
+            return self._execute(code, max_steps, until_output)
+        if self.steps < self.compile_after:
+            status = self._execute(code, self.compile_after - self.steps, until_output)
+            if status != LIMIT:
+                return status
+        return self._run_compiled(bps, until_output)
+
+    def _run_compiled(self, bps: frozenset, until_output: bool) -> str:
+        while True:
+            fn, leaders = self.program.compiled(bps)
+            # войти в функцию можно только с начала блока: до него — шагами
+            while self.ip not in leaders and 0 <= self.ip < len(self.program.plain):
+                status = self._execute(self.program.plain, 1, until_output)
+                if status != LIMIT:
+                    return status
+            status, self.ip, target = fn(
+                self.regs, self.ip, self.inputs, self.outputs, until_output
+            )
+            if status != _TOGGLE:
+                return status
+            self.ip += 1
+            if 0 <= target < len(self.program.plain):
+                self._toggle(target)
+
+    def _patched(self, bps: Optional[frozenset]) -> list:
+        """Код программы с BRK на месте точек останова (кэшируется)."""
+        code = self.program.code
+        if not bps:
+            return code
+        if self._bp_key != bps or self._bp_code is None:
+            self._bp_code = list(code)
+            for bp in bps:
+                if 0 <= bp < len(code):
+                    self._bp_code[bp] = (BRK, 0, 0, 0)
+            self._bp_key = bps
+        return self._bp_code
+
+    def step(self) -> str:
+        """Выполнить ровно одну инструкцию исходника (без суперинструкций)."""
+        return self._execute(self.program.plain, 1, False)
+
+    def _toggle(self, target: int) -> None:
+        """tgl: меняем исходник и перекомпилируем программу."""
+        program = self.program
+        if program.toggle is None:
+            raise RuntimeError("tgl не поддерживается этим диалектом")
+        source = [list(ins) for ins in program.source]
+        program.toggle(source[target])
+        self.program = program.with_source(source)
+        nregs = len(program.names)
+        self.regs[nregs:] = self.program.consts
+        self._bp_code = None
+
+    def _execute(self, code: list, max_steps: Optional[int], until_output: bool) -> str:
+        r = self.regs
+        ip = self.ip
+        n = len(code)
+        inputs = self.inputs
+        outputs = self.outputs
+        limit = -1 if max_steps is None else max_steps
+        steps = 0
+        status = HALTED
+
+        while 0 <= ip < n:
+            if steps == limit:
+                status = LIMIT
+                break
+            steps += 1
+            op, a, b, c = code[ip]
+
+            if op == SET:
+                r[a] = r[b]
+                ip += 1
+            elif op == ADD:
+                r[a] = r[b] + r[c]
+                ip += 1
+            elif op == JNZ:
+                ip += r[c] if r[b] != 0 else 1
+            elif op == MUL:
+                r[a] = r[b] * r[c]
+                ip += 1
+            elif op == SUB:
+                r[a] = r[b] - r[c]
+                ip += 1
+            elif op == JMP:
+                ip += r[c]
+            elif op == GT:
+                r[a] = 1 if r[b] > r[c] else 0
+                ip += 1
+            elif op == EQ:
+                r[a] = 1 if r[b] == r[c] else 0
+                ip += 1
+            elif op == JABS:
+                ip = r[b] + r[c]
+            elif op == JGZ:
+                ip += r[c] if r[b] > 0 else 1
+            elif op == MOD:
+                r[a] = r[b] % r[c]
+                ip += 1
+            elif op == DIV:
+                r[a] = r[b] // r[c]
+                ip += 1
+            elif op == SHR:
+                r[a] = r[b] >> r[c]
+                ip += 1
+            elif op == XOR:
+                r[a] = r[b] ^ r[c]
+                ip += 1
+            elif op == AND:
+                r[a] = r[b] & r[c]
+                ip += 1
+            elif op == OR:
+                r[a] = r[b] | r[c]
+                ip += 1
+            elif op == JIE:
+                ip += r[c] if r[b] % 2 == 0 else 1
+            elif op == JIO:
+                ip += r[c] if r[b] == 1 else 1
+            elif op == OUT:
+                outputs.append(r[b] & r[c])
+                ip += 1
+                if until_output:
+                    status = OUTPUT
+                    break
+            elif op == RCV:
+                if not inputs:
+                    steps -= 1
+                    status = NEED_INPUT
+                    break
+                r[a] = inputs.popleft()
+                ip += 1
+            elif op == RCVNZ:
+                ip += 1
+                if r[b] != 0:
+                    status = RECOVER
+                    break
+            elif op == JCALC:
+                ip = b(r)
+            elif op == NOP:
+                ip += 1
+            elif op == BRK:
+                steps -= 1
+                status = BREAK
+                break
+            elif op == TGL:
+                target = ip + r[b]
+                ip += 1
+                if 0 <= target < n:
+                    plain_mode = code is self.program.plain
+                    bps = self._bp_key if code is self._bp_code else None
+                    self._toggle(target)
+                    code = self.program.plain if plain_mode else self._patched(bps)
+                    n = len(code)
+            # ---------- суперинструкции ----------
+            elif op == ADDLOOP:
+                x, y, k = a
+                if r[y] > 0:
+                    r[x] += k * r[y]
+                    r[y] = 0
+                    ip += 3
+                else:
+                    self.ip = ip
+                    self._execute(self.program.plain, 1, False)
+                    ip = self.ip
+            elif op == MULLOOP:
+                z, y, w, k = a
+                v = r[b]
+                if v > 0 and r[w] > 0:
+                    r[z] += k * v * r[w]
+                    r[y] = 0
+                    r[w] = 0
+                    ip += 6
+                else:
+                    self.ip = ip
+                    self._execute(self.program.plain, 1, False)
+                    ip = self.ip
+            elif op == DIVLOOP:
+                q, t, rg, d = a
+                if r[rg] >= 0:
+                    r[q] = r[rg] // d
+                    r[t] = 1
+                    ip = b
+                else:
+                    self.ip = ip
+                    self._execute(self.program.plain, 1, False)
+                    ip = self.ip
+            elif op == DIVSUM:
+                i, j, t, nn, acc = a
+                if r[nn] >= 1:
+                    r[acc] += divisor_sum(r[nn])
+                    r[i] = r[j] = r[nn] + 1
+                    r[t] = 1
+                    ip += 15
+                else:
+                    self.ip = ip
+                    self._execute(self.program.plain, 1, False)
+                    ip = self.ip
+            else:
+                raise RuntimeError(f"Неизвестный opcode {op} на позиции {ip}")
+
+        self.ip = ip
+        self.steps += steps
+        return status
+
+
+# =====================================================================
+#   Диалекты
+# =====================================================================
+
+
+def _lines(data: str) -> List[str]:
+    return [line.strip() for line in data.splitlines() if line.strip()]
+
+
+# ---------- 2015/23: turing lock ----------
+
+
+def turing_lock(data: str) -> Program:
+    """hlf r, tpl r, inc r, jmp off, jie r, off, jio r, off; регистры a, b."""
+    names = ["a", "b"]
+    index = {n: i for i, n in enumerate(names)}
+    source = [line.replace(",", "").split() for line in _lines(data)]
+
+    def lower(src: list) -> List[IR]:
+        ir: List[IR] = []
+        for parts in src:
+            op = parts[0]
+            if op == "hlf":
+                r = index[parts[1]]
+                ir.append(("div", r, R(r), I(2)))
+            elif op == "tpl":
+                r = index[parts[1]]
+                ir.append(("mul", r, R(r), I(3)))
+            elif op == "inc":
+                r = index[parts[1]]
+                ir.append(("add", r, R(r), I(1)))
+            elif op == "jmp":
+                ir.append(("jmp", None, I(int(parts[1])), None))
+            elif op in ("jie", "jio"):
+                ir.append((op, None, R(index[parts[1]]), I(int(parts[2]))))
+            else:
+                raise ValueError(f"Unknown instruction: {' '.join(parts)}")
+        return ir
+
+    return Program(names, source, lower)
+
+
+# ---------- 2016: assembunny ----------
+
+ASSEMBUNNY_REGISTERS = ["a", "b", "c", "d"]
+
+
+def assembunny(data: str, optimize: bool = True) -> Program:
+    """cpy, inc, dec, jnz, tgl, out; регистры a-d."""
+    index = {n: i for i, n in enumerate(ASSEMBUNNY_REGISTERS)}
+    source = []
+    for line in _lines(data):
+        parts = line.split()
+        op = parts[0]
+        if op in ("inc", "dec", "tgl", "out"):
+            if len(parts) != 2:
+                raise ValueError(f"Неверная {op}-инструкция: {line!r}")
+            source.append([op, parts[1], None])
+        elif op in ("cpy", "jnz"):
+            if len(parts) != 3:
+                raise ValueError(f"Неверная {op}-инструкция: {line!r}")
+            source.append([op, parts[1], parts[2]])
+        else:
+            raise ValueError(f"Неизвестная инструкция: {line!r}")
+
+    def lower(src: list) -> List[IR]:
+        ir: List[IR] = []
+        for op, x, y in src:
+            # после tgl могут появиться бессмысленные инструкции — их пропускаем
+            if op == "cpy":
+                if y in index:
+                    ir.append(("set", index[y], _operand(x, index), None))
+                else:
+                    ir.append(("nop", None, None, None))
+            elif op in ("inc", "dec"):
+                if x in index:
+                    r = index[x]
+                    ir.append(("add", r, R(r), I(1 if op == "inc" else -1)))
+                else:
+                    ir.append(("nop", None, None, None))
+            elif op == "jnz":
+                ir.append(("jnz", None, _operand(x, index), _operand(y, index)))
+            elif op == "tgl":
+                ir.append(("tgl", None, _operand(x, index), None))
+            elif op == "out":
+                ir.append(("out", None, _operand(x, index), None))
+            else:
+                raise RuntimeError(f"Неизвестная операция: {op!r}")
+        return ir
+
+    return Program(ASSEMBUNNY_REGISTERS, source, lower, toggle_assembunny, optimize)
+
+
+def toggle_assembunny(instr: list) -> None:
+    """Правило tgl для одной инструкции [op, x, y] (in place)."""
+    op, x, y = instr
+    if y is None:
+        instr[0] = "dec" if op == "inc" else "inc"
+    else:
+        instr[0] = "cpy" if op == "jnz" else "jnz"
+
+
+# ---------- 2017/18: duet, 2017/23: coprocessor ----------
+
+
+def _letter_registers(lines: List[List[str]]) -> List[str]:
+    regs = set()
+    for parts in lines:
+        for token in parts[1:]:
+            if token.isalpha():
+                regs.add(token)
+    return sorted(regs)
+
+
+def duet(data: str, sound: bool = False) -> Program:
+    """
+    snd, set, add, mul, mod, rcv, jgz.
+
+    sound=True — трактовка Part 1: snd "играет звук" (значение уходит в
+    outputs), rcv X останавливает машину со статусом RECOVER, если X != 0.
+    sound=False — Part 2: snd отправляет значение (outputs), rcv X берёт
+    значение из inputs или останавливается с NEED_INPUT.
+    """
+    source = [line.split() for line in _lines(data)]
+    if not source:
+        raise ValueError("Пустая программа")
+    names = _letter_registers(source)
+    index = {n: i for i, n in enumerate(names)}
+
+    def lower(src: list) -> List[IR]:
+        ir: List[IR] = []
+        for parts in src:
+            op, args = parts[0], parts[1:]
+            if op == "snd":
+                ir.append(("out", None, _operand(args[0], index), None))
+            elif op == "set":
+                ir.append(("set", index[args[0]], _operand(args[1], index), None))
+            elif op in ("add", "mul", "mod"):
+                r = index[args[0]]
+                ir.append((op, r, R(r), _operand(args[1], index)))
+            elif op == "rcv":
+                if sound:
+                    ir.append(("rcvnz", None, _operand(args[0], index), None))
+                else:
+                    ir.append(("rcv", index[args[0]], None, None))
+            elif op == "jgz":
+                ir.append(("jgz", None, _operand(args[0], index), _operand(args[1], index)))
+            else:
+                raise ValueError(f"Неизвестная инструкция: {op!r}")
+        return ir
+
+    return Program(names, source, lower)
+
+
+def coprocessor(data: str, optimize: bool = True) -> Program:
+    """set, sub, mul, jnz; регистры a-h (2017/23)."""
+    source = [line.split() for line in _lines(data)]
+    if not source:
+        raise ValueError("Пустая программа")
+    names = sorted(set("abcdefgh") | set(_letter_registers(source)))
+    index = {n: i for i, n in enumerate(names)}
+
+    def lower(src: list) -> List[IR]:
+        ir: List[IR] = []
+        for op, x, y in src:
+            if op == "set":
+                ir.append(("set", index[x], _operand(y, index), None))
+            elif op == "sub":
+                r, val = index[x], _operand(y, index)
+                # sub X -k == add X k: одна форма для peephole
+                if val[0] == "i":
+                    ir.append(("add", r, R(r), I(-val[1])))
+                else:
+                    ir.append(("sub", r, R(r), val))
+            elif op == "mul":
+                r = index[x]
+                ir.append(("mul", r, R(r), _operand(y, index)))
+            elif op == "jnz":
+                ir.append(("jnz", None, _operand(x, index), _operand(y, index)))
+            else:
+                raise ValueError(f"Неизвестная инструкция: {op!r}")
+        return ir
+
+    return Program(names, source, lower, optimize=optimize)
+
+
+# ---------- 2018: elfcode ----------
+
+ELFCODE_OPS: Dict[str, Callable[[List[int], int, int, int], None]] = {
+    "addr": lambda r, a, b, c: r.__setitem__(c, r[a] + r[b]),
+    "addi": lambda r, a, b, c: r.__setitem__(c, r[a] + b),
+    "mulr": lambda r, a, b, c: r.__setitem__(c, r[a] * r[b]),
+    "muli": lambda r, a, b, c: r.__setitem__(c, r[a] * b),
+    "banr": lambda r, a, b, c: r.__setitem__(c, r[a] & r[b]),
+    "bani": lambda r, a, b, c: r.__setitem__(c, r[a] & b),
+    "borr": lambda r, a, b, c: r.__setitem__(c, r[a] | r[b]),
+    "bori": lambda r, a, b, c: r.__setitem__(c, r[a] | b),
+    "setr": lambda r, a, b, c: r.__setitem__(c, r[a]),
+    "seti": lambda r, a, b, c: r.__setitem__(c, a),
+    "gtir": lambda r, a, b, c: r.__setitem__(c, 1 if a > r[b] else 0),
+    "gtri": lambda r, a, b, c: r.__setitem__(c, 1 if r[a] > b else 0),
+    "gtrr": lambda r, a, b, c: r.__setitem__(c, 1 if r[a] > r[b] else 0),
+    "eqir": lambda r, a, b, c: r.__setitem__(c, 1 if a == r[b] else 0),
+    "eqri": lambda r, a, b, c: r.__setitem__(c, 1 if r[a] == b else 0),
+    "eqrr": lambda r, a, b, c: r.__setitem__(c, 1 if r[a] == r[b] else 0),
+}
+
+# имя -> (IR-операция, режим A, режим B); "r" — регистр, "i" — число
+_ELFCODE_FORMS = {
+    "addr": ("add", "r", "r"), "addi": ("add", "r", "i"),
+    "mulr": ("mul", "r", "r"), "muli": ("mul", "r", "i"),
+    "banr": ("and", "r", "r"), "bani": ("and", "r", "i"),
+    "borr": ("or", "r", "r"), "bori": ("or", "r", "i"),
+    "setr": ("set", "r", None), "seti": ("set", "i", None),
+    "gtir": ("gt", "i", "r"), "gtri": ("gt", "r", "i"), "gtrr": ("gt", "r", "r"),
+    "eqir": ("eq", "i", "r"), "eqri": ("eq", "r", "i"), "eqrr": ("eq", "r", "r"),
+}
+
+ElfInstr = Tuple[str, int, int, int]
+
+
+def parse_elfcode(data: str) -> Tuple[Optional[int], List[ElfInstr]]:
+    """'#ip X' (необязательно) + строки 'op a b c' -> (ip_reg, program)."""
+    ip_reg: Optional[int] = None
+    prog: List[ElfInstr] = []
+    for line in _lines(data):
+        m = re.match(r"#ip\s+(\d+)", line)
+        if m:
+            ip_reg = int(m.group(1))
+            continue
+        parts = line.split()
+        a, b, c = map(int, parts[1:4])
+        prog.append((parts[0], a, b, c))
+    return ip_reg, prog
+
+
+def elfcode(ip_reg: Optional[int], prog: Sequence[ElfInstr], optimize: bool = True) -> Program:
+    """
+    Elfcode с (необязательным) регистром-указателем ip_reg.
+
+    Перед каждой инструкцией в ip_reg записан её номер, поэтому чтение
+    ip_reg на этапе компиляции заменяется константой. Запись в ip_reg —
+    это прыжок: константный результат даёт jmp, "ip = R + k" — jabs,
+    остальное считается замыканием (jcalc). Значение самого ip_reg
+    во время исполнения не поддерживается.
+    """
+    names = [str(i) for i in range(6)]
+    source = list(prog)
+
+    def lower(src: list) -> List[IR]:
+        ir: List[IR] = []
+        for p, (opname, a, b, c) in enumerate(src):
+            if opname not in _ELFCODE_FORMS:
+                raise ValueError(f"Неизвестная операция: {opname!r}")
+            name, ma, mb = _ELFCODE_FORMS[opname]
+
+            def arg(mode: Optional[str], v: int) -> Optional[Operand]:
+                if mode is None:
+                    return None
+                if mode == "i":
+                    return I(v)
+                return I(p) if v == ip_reg else R(v)
+
+            x, y = arg(ma, a), arg(mb, b)
+            if c != ip_reg:
+                ir.append((name, c, x, y))
+                continue
+
+            # запись в регистр-указатель: новый ip = результат + 1
+            if name == "set":
+                if x[0] == "i":
+                    ir.append(("jmp", None, I(x[1] + 1 - p), None))
+                else:
+                    ir.append(("jabs", None, x, I(1)))
+            elif x[0] == "i" and y[0] == "i":
+                ir.append(("jmp", None, I(_FOLD[name](x[1], y[1]) + 1 - p), None))
+            elif name == "add" and x[0] != y[0]:
+                reg_op, const = (x, y[1]) if x[0] == "r" else (y, x[1])
+                ir.append(("jabs", None, reg_op, I(const + 1)))
+            else:
+                fn = ELFCODE_OPS[opname]
+
+                def jump(r: List[int], fn=fn, a=a, b=b, p=p) -> int:
+                    tmp = r[:6]
+                    tmp[ip_reg] = p
+                    fn(tmp, a, b, ip_reg)
+                    return tmp[ip_reg] + 1
+
+                ir.append(("jcalc", None, jump, None))
+        return ir
+
+    return Program(names, source, lower, optimize=optimize)
+
+
+# ---------- 2024/17: chronospatial computer ----------
+
+
+def chronospatial(program: Sequence[int]) -> Program:
+    """
+    Трёхбитный компьютер 2024/17. Пара (opcode, operand) — одна инструкция,
+    jnz с абсолютным адресом переводится в относительный прыжок.
+    """
+    names = ["A", "B", "C"]
+    A, B, C = R(0), R(1), R(2)
+    source = [(program[k], program[k + 1]) for k in range(0, len(program) - 1, 2)]
+
+    def combo(operand: int) -> Operand:
+        if 0 <= operand <= 3:
+            return I(operand)
+        if 4 <= operand <= 6:
+            return R(operand - 4)
+        raise ValueError(f"Invalid combo operand: {operand}")
+
+    def lower(src: list) -> List[IR]:
+        ir: List[IR] = []
+        for k, (opcode, operand) in enumerate(src):
+            if opcode == 0:    # adv
+                ir.append(("shr", 0, A, combo(operand)))
+            elif opcode == 1:  # bxl
+                ir.append(("xor", 1, B, I(operand)))
+            elif opcode == 2:  # bst
+                ir.append(("and", 1, combo(operand), I(7)))
+            elif opcode == 3:  # jnz
+                if operand % 2:
+                    raise ValueError("jnz на нечётный адрес не поддерживается")
+                ir.append(("jnz", None, A, I(operand // 2 - k)))
+            elif opcode == 4:  # bxc
+                ir.append(("xor", 1, B, C))
+            elif opcode == 5:  # out
+                ir.append(("out", None, combo(operand), I(7)))
+            elif opcode == 6:  # bdv
+                ir.append(("shr", 1, A, combo(operand)))
+            elif opcode == 7:  # cdv
+                ir.append(("shr", 2, A, combo(operand)))
+            else:
+                raise ValueError(f"Неизвестный opcode: {opcode}")
+        return ir
+
+    return Program(names, source, lower)
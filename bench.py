@@ -0,0 +1,235 @@
+# bench.py
+"""
+Бенчмарк всех solve_part1/solve_part2 с сохранённым базовым замером.
+
+Для каждой найденной <год>/dayNN/solution.py каждая часть запускается
+на закоммиченном input.txt: сначала --warmup прогонов без учёта,
+затем --repeat замеров. Перед каждым прогоном solution.py грузится заново,
+чтобы модульные кэши (lru_cache и т.п.) не делали повторы "бесплатными".
+
+    python bench.py --save-baseline                # записать bench_baseline.json
+    python bench.py                                # сравнить с базой
+    python bench.py --year 2019 --threshold 0.10   # падать при замедлении > 10%
+
+Код выхода 1, если медиана какой-то части выросла больше чем на
+--threshold (и больше чем на --min-delta секунд), если изменился ответ
+или если часть упала/не уложилась в таймаут.
+"""
+import argparse
+import contextlib
+import io
+import json
+import signal
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from aoclib.parallel import limit_nested_workers
+from run_all import (
+    TaskTimeout,
+    _on_alarm,
+    discover_days,
+    iter_tasks,
+    load_solution_module,
+    parse_selector,
+)
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BASE_DIR / "bench_baseline.json"
+
+SLOWEST_COUNT = 20
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль по методу ближайшего ранга (работает и на 1-2 замерах)."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil(n * q / 100)
+    return ordered[int(rank) - 1]
+
+
+def bench_task(
+    year: int, day: int, part: int, day_dir: str, repeat: int, warmup: int, timeout: float
+) -> Dict:
+    """
+    Выполняется в процессе пула: warmup + repeat прогонов одной части.
+    Таймаут (SIGALRM) действует на все прогоны задачи вместе.
+    """
+    record: Dict = {"year": year, "day": day, "part": part}
+    day_path = Path(day_dir)
+    input_path = day_path / "input.txt"
+    data = input_path.read_text(encoding="utf-8") if input_path.exists() else ""
+    func_name = f"solve_part{part}"
+
+    use_alarm = timeout > 0 and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    times: List[float] = []
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(warmup + repeat):
+                func = getattr(load_solution_module(day_path), func_name, None)
+                if func is None:
+                    record["status"] = "missing"
+                    return record
+                start = time.perf_counter()
+                answer = func(data)
+                elapsed = time.perf_counter() - start
+                if i >= warmup:
+                    times.append(elapsed)
+        record["status"] = "ok"
+        record["answer"] = str(answer)
+        record["times"] = [round(t, 6) for t in times]
+        record["median"] = round(statistics.median(times), 6)
+        record["p95"] = round(percentile(times, 95), 6)
+    except TaskTimeout:
+        record["status"] = "timeout"
+    except BaseException as e:  # noqa: BLE001
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return record
+
+
+def result_key(record: Dict) -> str:
+    return f"{record['year']}/{record['day']:02d}/{record['part']}"
+
+
+def compare(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float, min_delta: float
+) -> List[str]:
+    """Возвращает список найденных регрессий (по строке на каждую)."""
+    problems = []
+    for key, rec in sorted(results.items()):
+        if rec["status"] != "ok":
+            problems.append(f"{key}: {rec['status']} {rec.get('error', '')}".rstrip())
+            continue
+        base = baseline.get(key)
+        if not base or base.get("status") != "ok":
+            continue
+        if base.get("answer") != rec["answer"]:
+            problems.append(f"{key}: ответ изменился {base.get('answer')!r} -> {rec['answer']!r}")
+        old, new = base["median"], rec["median"]
+        if new > old * (1 + threshold) and new - old > min_delta:
+            problems.append(
+                f"{key}: медиана {old:.4f} -> {new:.4f} с (+{(new / old - 1) * 100:.0f}%)"
+                if old > 0
+                else f"{key}: медиана {old:.4f} -> {new:.4f} с"
+            )
+    return problems
+
+
+def print_parts(results: Dict[str, Dict], baseline: Dict[str, Dict]) -> None:
+    print(f"{'день/часть':<12} {'median, с':>10} {'p95, с':>10} {'база, с':>10}")
+    for key, rec in sorted(results.items()):
+        if rec["status"] != "ok":
+            print(f"{key:<12} {rec['status']:>10}")
+            continue
+        base = baseline.get(key, {}).get("median")
+        base_str = f"{base:.4f}" if base is not None else "-"
+        print(f"{key:<12} {rec['median']:>10.4f} {rec['p95']:>10.4f} {base_str:>10}")
+
+
+def print_slowest(results: Dict[str, Dict], count: int = SLOWEST_COUNT) -> None:
+    """Сводка самых медленных дней: сумма медиан обеих частей."""
+    per_day: Dict[str, List[float]] = {}
+    for rec in results.values():
+        if rec["status"] != "ok":
+            continue
+        day_key = f"{rec['year']}/{rec['day']:02d}"
+        per_day.setdefault(day_key, [0.0, 0.0])
+        per_day[day_key][rec["part"] - 1] = rec["median"]
+    ranked = sorted(per_day.items(), key=lambda kv: sum(kv[1]), reverse=True)[:count]
+    print(f"\nСамые медленные дни (top {count}):")
+    print(f"{'#':>3} {'день':<8} {'part1, с':>10} {'part2, с':>10} {'всего, с':>10}")
+    for i, (day_key, (p1, p2)) in enumerate(ranked, 1):
+        print(f"{i:>3} {day_key:<8} {p1:>10.4f} {p2:>10.4f} {p1 + p2:>10.4f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк решений Advent of Code.")
+    parser.add_argument("--year", nargs="*", help="годы: 2015 2017-2019 ...")
+    parser.add_argument("--day", nargs="*", help="дни: 1 3-5 ...")
+    parser.add_argument("--part", nargs="*", type=int, choices=(1, 2), default=[1, 2])
+    parser.add_argument("--repeat", type=int, default=5, help="число замеров (по умолчанию 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="прогонов на прогрев (по умолчанию 1)")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="процессов пула; больше 1 ускоряет прогон, но зашумляет замеры",
+    )
+    parser.add_argument("--timeout", type=float, default=600.0, help="таймаут на часть, с")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="файл базового замера")
+    parser.add_argument(
+        "--save-baseline", action="store_true",
+        help="записать результаты как новую базу (обновляются только замеренные части)",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.25,
+        help="допустимое относительное замедление медианы (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--min-delta", type=float, default=0.01,
+        help="замедления меньше стольких секунд считаются шумом",
+    )
+    args = parser.parse_args(argv)
+
+    selected = discover_days(parse_selector(args.year), parse_selector(args.day))
+    if not selected:
+        print("Не найдено ни одного решения по заданным фильтрам.", file=sys.stderr)
+        return 1
+
+    baseline_path = Path(args.baseline)
+    baseline: Dict[str, Dict] = {}
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+
+    results: Dict[str, Dict] = {}
+    # Решения с собственным пулом берут только свою долю CPU
+    limit_nested_workers(args.workers)
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = [
+            pool.submit(
+                bench_task, year, day, part, day_dir,
+                max(1, args.repeat), max(0, args.warmup), args.timeout,
+            )
+            for year, day, part, day_dir in iter_tasks(selected, sorted(set(args.part)))
+        ]
+        for future in futures:
+            record = future.result()
+            results[result_key(record)] = record
+            print(f"{result_key(record)}: {record['status']}", file=sys.stderr)
+
+    print_parts(results, baseline)
+    print_slowest(results)
+
+    if args.save_baseline:
+        baseline.update(results)
+        baseline_path.write_text(
+            json.dumps(dict(sorted(baseline.items())), ensure_ascii=False, indent=2) + "\n",
+            encoding="utf-8",
+        )
+        print(f"\nБаза сохранена: {baseline_path}")
+        return 0
+
+    if not baseline:
+        print(f"\nБаза {baseline_path} не найдена — запустите с --save-baseline.")
+        return 0
+
+    problems = compare(results, baseline, args.threshold, args.min_delta)
+    if problems:
+        print(f"\nРегрессии ({len(problems)}):")
+        for line in problems:
+            print("  " + line)
+        return 1
+    print("\nРегрессий не найдено.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -43,6 +43,12 @@ import requests  # pip install requests
 
 BASE_DIR = Path(__file__).resolve().parent  # папка года, например 2025
 ROOT_DIR = BASE_DIR.parent                  # корень проекта (там .env)
+METRICS_PATH = ROOT_DIR / "metrics.json"    # отчёт о стоимости решений
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from aoclib.metrics import Measurement, isolated_pool, update_report  # noqa: E402
 
 
 def detect_year() -> int:
@@ -209,6 +215,55 @@ def load_solution_module(day_dir: Path):
     return module
 
 
+def measure_part(day_dir: str, part: int, data: str):
+    """
+    Выполняется в отдельном процессе (см. isolated_pool): грузит
+    solution.py и запускает solve_partN под замером, так что peak RSS
+    относится только к этой части. Возвращает (результат, статус, замер).
+    """
+    module = load_solution_module(Path(day_dir))
+    func = getattr(module, f"solve_part{part}")
+    status = "ok"
+    with Measurement() as m:
+        try:
+            res = func(data)
+        except Exception as e:
+            res = f"Ошибка выполнения: {e}"
+            status = "error"
+    return str(res), status, m.as_dict()
+
+
+def run_part(module, year: int, day: int, part: int, data: str) -> None:
+    """
+    Запускает solve_partN с замером времени/памяти в отдельном процессе,
+    печатает результат и дописывает замер в METRICS_PATH.
+    """
+    func = getattr(module, f"solve_part{part}", None)
+    if func is None:
+        print(f"Part {part}: функция solve_part{part} не найдена.")
+        return
+
+    day_dir = str(Path(module.__file__).resolve().parent)
+    try:
+        with isolated_pool(1) as pool:
+            res, status, metrics = pool.submit(measure_part, day_dir, part, data).result()
+    except Exception as e:
+        print(f"Part {part}: Ошибка выполнения: {e}")
+        return
+    print(f"Part {part}:", res)
+
+    rss = metrics["peak_rss_kb"]
+    print(
+        f"  wall {metrics['wall_s']:.3f} с, cpu {metrics['cpu_s']:.3f} с, "
+        f"tracemalloc peak {metrics['tracemalloc_peak_kb']} КБ, "
+        f"peak RSS {rss if rss is not None else '?'} КБ"
+    )
+    try:
+        update_report(METRICS_PATH, year, day, part, metrics, status)
+    except OSError as e:
+        print(f"[WARN] Не удалось записать {METRICS_PATH}: {e}")
+
+
 def main():
     print("=== AdventToCode: запуск года ===")
     year = detect_year()
@@ -290,25 +345,8 @@ def main():
     print("Результаты решения:")
     print("-" * 40)
 
-    # Part 1
-    if hasattr(module, "solve_part1"):
-        try:
-            res1 = module.solve_part1(data)
-        except Exception as e:
-            res1 = f"Ошибка выполнения: {e}"
-        print("Part 1:", res1)
-    else:
-        print("Part 1: функция solve_part1 не найдена.")
-
-    # Part 2
-    if hasattr(module, "solve_part2"):
-        try:
-            res2 = module.solve_part2(data)
-        except Exception as e:
-            res2 = f"Ошибка выполнения: {e}"
-        print("Part 2:", res2)
-    else:
-        print("Part 2: функция solve_part2 не найдена.")
+    for part in (1, 2):
+        run_part(module, year, day, part, data)
 
 
 if __name__ == "__main__":
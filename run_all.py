@@ -0,0 +1,236 @@
+# run_all.py
+"""
+Неинтерактивный пакетный запуск решений по всем годам и дням.
+
+В отличие от <год>/start.py ничего не скачивает и ничего не спрашивает:
+находит <год>/dayNN/solution.py, запускает solve_part1/solve_part2
+на закоммиченном input.txt в пуле процессов и построчно печатает
+результаты в формате JSON lines.
+
+Примеры:
+    python run_all.py                          # все годы, все дни, обе части
+    python run_all.py --year 2019 --day 1-5    # 2019, дни 1..5
+    python run_all.py --year 2015 2023-2024 --part 2 --workers 4 --timeout 60
+    python run_all.py --output results.jsonl --report metrics.csv
+
+Каждая запись содержит ответ, статус и замер вызова solve_partN
+(wall_s, cpu_s, peak_rss_kb, tracemalloc_peak_kb) — см. aoclib/metrics.py.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+from concurrent.futures import as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from aoclib.metrics import Measurement, isolated_pool, make_record, report_key, save_report
+from aoclib.parallel import limit_nested_workers
+
+BASE_DIR = Path(__file__).resolve().parent
+
+DEFAULT_TIMEOUT = 300.0  # секунд на одну часть одного дня
+
+
+class TaskTimeout(Exception):
+    pass
+
+
+def parse_selector(values: Optional[List[str]]) -> Optional[set]:
+    """
+    Разбор селекторов вида ["2015", "2017-2019", "3,5"] в множество чисел.
+    None означает "без ограничений".
+    """
+    if not values:
+        return None
+    result = set()
+    for value in values:
+        for chunk in value.split(","):
+            chunk = chunk.strip()
+            if not chunk:
+                continue
+            if "-" in chunk:
+                lo, hi = chunk.split("-", 1)
+                result.update(range(int(lo), int(hi) + 1))
+            else:
+                result.add(int(chunk))
+    return result
+
+
+def discover_days(years: Optional[set], days: Optional[set]) -> List[Tuple[int, int, Path]]:
+    """
+    Ищет папки вида <год>/dayNN с solution.py.
+    Возвращает список (year, day, day_dir), отсортированный по году и дню.
+    """
+    found = []
+    for year_dir in sorted(BASE_DIR.iterdir()):
+        if not year_dir.is_dir() or not year_dir.name.isdigit():
+            continue
+        year = int(year_dir.name)
+        if years is not None and year not in years:
+            continue
+        for day_dir in sorted(year_dir.glob("day[0-9][0-9]")):
+            day = int(day_dir.name[3:])
+            if days is not None and day not in days:
+                continue
+            if (day_dir / "solution.py").exists():
+                found.append((year, day, day_dir))
+    return found
+
+
+def load_solution_module(day_dir: Path):
+    """То же, что и в start.py: грузим solution.py как отдельный модуль."""
+    import importlib.util
+
+    solution_path = day_dir / "solution.py"
+    spec = importlib.util.spec_from_file_location("solution", solution_path)
+    module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+    assert spec.loader is not None
+    spec.loader.exec_module(module)  # type: ignore[arg-type]
+    return module
+
+
+def _on_alarm(signum, frame):
+    raise TaskTimeout()
+
+
+def run_task(
+    year: int, day: int, part: int, day_dir: str, timeout: float, trace_memory: bool = True
+) -> Dict:
+    """
+    Выполняется в процессе пула: грузит solution.py и запускает одну часть.
+
+    Таймаут реализован через SIGALRM внутри воркера — так зависшее решение
+    прерывается, а процесс пула остаётся пригодным для следующих задач.
+    На платформах без SIGALRM (Windows) таймаут не применяется.
+    Замеряется только сам вызов solve_partN, без загрузки модуля и input.txt.
+    """
+    record: Dict = {"year": year, "day": day, "part": part}
+    day_path = Path(day_dir)
+    func_name = f"solve_part{part}"
+
+    use_alarm = timeout > 0 and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    start = time.perf_counter()
+    measurement = Measurement(trace_memory=trace_memory)
+    try:
+        # Решения иногда печатают отладку — не даём ей попасть в JSON-поток
+        with contextlib.redirect_stdout(io.StringIO()):
+            module = load_solution_module(day_path)
+            func = getattr(module, func_name, None)
+            if func is None:
+                record["status"] = "missing"
+                record["error"] = f"функция {func_name} не найдена"
+            else:
+                input_path = day_path / "input.txt"
+                if input_path.exists():
+                    data = input_path.read_text(encoding="utf-8")
+                else:
+                    data = ""
+                with measurement:
+                    answer = func(data)
+                record["answer"] = str(answer)
+                record["status"] = "ok"
+    except TaskTimeout:
+        record["status"] = "timeout"
+        record["error"] = f"превышен таймаут {timeout:g} с"
+    except BaseException as e:  # noqa: BLE001 — решение не должно уронить пул
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+        record["traceback"] = traceback.format_exc(limit=5)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    record["seconds"] = round(time.perf_counter() - start, 6)
+    record.update(measurement.as_dict())
+    return record
+
+
+def iter_tasks(selected: Iterable[Tuple[int, int, Path]], parts: Iterable[int]):
+    for year, day, day_dir in selected:
+        for part in parts:
+            yield year, day, part, str(day_dir)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Пакетный запуск решений Advent of Code (JSON lines на выходе)."
+    )
+    parser.add_argument("--year", nargs="*", help="годы: 2015 2017-2019 ...")
+    parser.add_argument("--day", nargs="*", help="дни: 1 3-5 ...")
+    parser.add_argument(
+        "--part", nargs="*", type=int, choices=(1, 2), default=[1, 2],
+        help="части (по умолчанию обе)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="размер пула процессов (по умолчанию число CPU)",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=DEFAULT_TIMEOUT,
+        help="таймаут одной части в секундах (0 — без таймаута)",
+    )
+    parser.add_argument("--output", help="файл для JSON lines (по умолчанию stdout)")
+    parser.add_argument(
+        "--report", help="сводный отчёт по замерам: *.json или *.csv (ключ год/день/часть)"
+    )
+    parser.add_argument(
+        "--no-tracemalloc", action="store_true",
+        help="не включать tracemalloc (он замедляет решения с большим числом аллокаций)",
+    )
+    args = parser.parse_args(argv)
+
+    selected = discover_days(parse_selector(args.year), parse_selector(args.day))
+    if not selected:
+        print("Не найдено ни одного решения по заданным фильтрам.", file=sys.stderr)
+        return 1
+
+    tasks = list(iter_tasks(selected, sorted(set(args.part))))
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+
+    counts: Dict[str, int] = {}
+    report: Dict[str, Dict] = {}
+    started = time.perf_counter()
+    try:
+        # Каждая часть — в своём процессе, иначе peak_rss_kb достаётся от
+        # того, что этот воркер выполнял раньше
+        # Решения с собственным пулом берут только свою долю CPU
+        limit_nested_workers(args.workers)
+        with isolated_pool(max(1, args.workers)) as pool:
+            futures = [
+                pool.submit(
+                    run_task, year, day, part, day_dir, args.timeout, not args.no_tracemalloc
+                )
+                for year, day, part, day_dir in tasks
+            ]
+            for future in as_completed(futures):
+                record = future.result()
+                counts[record["status"]] = counts.get(record["status"], 0) + 1
+                report[report_key(record["year"], record["day"], record["part"])] = make_record(
+                    record["year"], record["day"], record["part"], record["status"],
+                    {k: record[k] for k in ("wall_s", "cpu_s", "peak_rss_kb", "tracemalloc_peak_kb")},
+                )
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if args.report and report:
+            save_report(Path(args.report), report)
+
+    elapsed = time.perf_counter() - started
+    summary = ", ".join(f"{k}={v}" for k, v in sorted(counts.items()))
+    print(f"Задач: {len(tasks)} ({summary}) за {elapsed:.1f} с", file=sys.stderr)
+    return 0 if counts.get("ok", 0) == len(tasks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())